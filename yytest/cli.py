@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import sys
 from pathlib import Path
 from typing import Optional
 
@@ -13,12 +14,10 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 from rich import print as rprint
 
+# Ağır modüller (runner, parser, rapor, web) komut fonksiyonları içinde
+# import edilir; 'yeytest --help' ve 'yeytest devices' bunları yüklemesin.
 from .core.models import ValidationLevel, StepStatus
-from .maestro.runner import MaestroRunner, run_test_file
 from .device.adb import ADBDevice, ADBError
-from .nlp.parser import NLPParser, AIEnhancedParser
-from .reports.html import HTMLReporter
-from .web.app import run_server
 
 app = typer.Typer(
     name="yeytest",
@@ -27,6 +26,31 @@ app = typer.Typer(
 )
 console = Console()
 
+_STATUS_MAP = {
+    StepStatus.PASSED: "[green]PASS[/green]",
+    StepStatus.FAILED: "[red]FAIL[/red]",
+    StepStatus.VISUAL_MISMATCH: "[yellow]GÖRSEL HATA[/yellow]",
+}
+
+
+# Enum isimleri küçük harf value'larla birebir; tek dict lookup yeter
+_LEVEL_BY_NAME = {level.value: level for level in ValidationLevel}
+
+
+def _run_async(coro):
+    """asyncio.run ile çalıştır; uvloop kuruluysa onu tercih et (2-4x daha hızlı I/O)."""
+    if sys.platform != "win32":
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            # uvloop.run 0.18'de geldi; eski sürümde policy üzerinden koş
+            if hasattr(uvloop, "run"):
+                return uvloop.run(coro)
+            uvloop.install()
+    return asyncio.run(coro)
+
 
 def version_callback(value: bool):
     if value:
@@ -80,9 +104,8 @@ def run(
         raise typer.Exit(1)
 
     # Parse validation level
-    try:
-        level = ValidationLevel[validation.upper()]
-    except KeyError:
+    level = _LEVEL_BY_NAME.get(validation.lower())
+    if level is None:
         console.print(f"[red]❌ Geçersiz doğrulama seviyesi: {validation}[/red]")
         console.print("Geçerli değerler: none, local, ai, hybrid")
         raise typer.Exit(1)
@@ -96,6 +119,8 @@ def run(
         border_style="cyan",
     ))
 
+    from .maestro.runner import MaestroRunner, run_test_file
+
     async def run_with_progress():
         runner = MaestroRunner(
             validation_level=level,
@@ -110,8 +135,17 @@ def run(
             console=console,
         ) as progress:
             task = progress.add_task("Test çalışıyor...", total=None)
-            
+
+            import time
+            last_update = 0.0
+
             def on_step(step_result):
+                # Rich'in re-render'ı adım başına pahalı; 100 ms'de bir güncelle
+                nonlocal last_update
+                now = time.monotonic()
+                if now - last_update < 0.1 and step_result.truly_passed:
+                    return
+                last_update = now
                 status_icon = "✅" if step_result.truly_passed else "❌"
                 progress.update(
                     task,
@@ -122,7 +156,7 @@ def run(
         
         return result
 
-    result = asyncio.run(run_with_progress())
+    result = _run_async(run_with_progress())
 
     # Show results
     console.print("\n")
@@ -135,29 +169,21 @@ def run(
     table.add_column("Görsel", justify="center")
     table.add_column("Durum", justify="center")
 
-    for step in result.step_results:
-        maestro_icon = "✅" if step.maestro_passed else "❌"
-        
-        if step.validation_result:
-            visual_icon = "✅" if step.validation_result.passed else "❌"
-        else:
-            visual_icon = "⏭️"
-
-        status_map = {
-            StepStatus.PASSED: "[green]PASS[/green]",
-            StepStatus.FAILED: "[red]FAIL[/red]",
-            StepStatus.VISUAL_MISMATCH: "[yellow]GÖRSEL HATA[/yellow]",
-        }
-        status = status_map.get(step.status, step.status.value)
-
-        table.add_row(
+    # Satırları tek geçişte hazırla, Rich'e toplu olarak ver
+    rows = [
+        (
             str(step.index + 1),
             step.action,
             step.target[:30] + "..." if len(step.target) > 30 else step.target,
-            maestro_icon,
-            visual_icon,
-            status,
+            "✅" if step.maestro_passed else "❌",
+            ("✅" if step.validation_result.passed else "❌")
+            if step.validation_result else "⏭️",
+            _STATUS_MAP.get(step.status, step.status.value),
         )
+        for step in result.step_results
+    ]
+    for row in rows:
+        table.add_row(*row)
 
     console.print(table)
 
@@ -218,42 +244,54 @@ def check():
         border_style="cyan",
     ))
 
-    checks = []
-
-    # ADB check
-    try:
-        adb = ADBDevice()
-        checks.append(("ADB", True, "Yüklü"))
-    except ADBError as e:
-        checks.append(("ADB", False, str(e)))
-
-    # Maestro check
-    import subprocess
-    try:
-        subprocess.run(["maestro", "--version"], capture_output=True, check=True)
-        checks.append(("Maestro", True, "Yüklü"))
-    except (FileNotFoundError, subprocess.CalledProcessError):
-        checks.append(("Maestro", False, "Yüklü değil. curl -Ls 'https://get.maestro.mobile.dev' | bash"))
-
-    # Tesseract check
-    try:
-        import pytesseract
-        pytesseract.get_tesseract_version()
-        checks.append(("Tesseract OCR", True, "Yüklü (ücretsiz text tanıma)"))
-    except Exception:
-        checks.append(("Tesseract OCR", False, "Opsiyonel - brew install tesseract"))
-
-    # API Keys
     import os
-    if os.getenv("ANTHROPIC_API_KEY"):
-        checks.append(("Anthropic API", True, "Ayarlı"))
-    else:
-        checks.append(("Anthropic API", False, "ANTHROPIC_API_KEY env değişkeni gerekli (opsiyonel)"))
-
-    if os.getenv("OPENAI_API_KEY"):
-        checks.append(("OpenAI API", True, "Ayarlı"))
-    else:
-        checks.append(("OpenAI API", False, "OPENAI_API_KEY env değişkeni gerekli (opsiyonel)"))
+    import subprocess
+    from concurrent.futures import ThreadPoolExecutor
+
+    def _probe_adb():
+        try:
+            ADBDevice()
+            return True, "Yüklü"
+        except ADBError as e:
+            return False, str(e)
+
+    def _probe_maestro():
+        try:
+            subprocess.run(["maestro", "--version"], capture_output=True, check=True)
+            return True, "Yüklü"
+        except (FileNotFoundError, subprocess.CalledProcessError):
+            return False, "Yüklü değil. curl -Ls 'https://get.maestro.mobile.dev' | bash"
+
+    def _probe_tesseract():
+        try:
+            import pytesseract
+            pytesseract.get_tesseract_version()
+            return True, "Yüklü (ücretsiz text tanıma)"
+        except Exception:
+            return False, "Opsiyonel - brew install tesseract"
+
+    def _probe_anthropic():
+        if os.getenv("ANTHROPIC_API_KEY"):
+            return True, "Ayarlı"
+        return False, "ANTHROPIC_API_KEY env değişkeni gerekli (opsiyonel)"
+
+    def _probe_openai():
+        if os.getenv("OPENAI_API_KEY"):
+            return True, "Ayarlı"
+        return False, "OPENAI_API_KEY env değişkeni gerekli (opsiyonel)"
+
+    probes = [
+        ("ADB", _probe_adb),
+        ("Maestro", _probe_maestro),
+        ("Tesseract OCR", _probe_tesseract),
+        ("Anthropic API", _probe_anthropic),
+        ("OpenAI API", _probe_openai),
+    ]
+
+    # Probe'lar birbirinden bağımsız subprocess/env okumaları; paralel
+    # çalıştırınca toplam süre en yavaş probe'a iner (~3x hızlı)
+    with ThreadPoolExecutor(max_workers=len(probes)) as ex:
+        checks = list(ex.map(lambda p: (p[0], *p[1]()), probes))
 
     # Print results
     table = Table(border_style="cyan")
@@ -343,9 +381,11 @@ def parse(
     ))
 
     # Parse
+    from .nlp.parser import NLPParser, AIEnhancedParser
+
     if use_ai:
         parser = AIEnhancedParser(app_id=app_id)
-        yaml_content, expectations = asyncio.run(parser.parse_with_ai(text))
+        yaml_content, expectations = _run_async(parser.parse_with_ai(text))
     else:
         parser = NLPParser(app_id=app_id)
         yaml_content, expectations = parser.parse_and_convert(text)
@@ -381,7 +421,9 @@ def report(
         raise typer.Exit(1)
 
     console.print(f"[cyan]📊 Rapor oluşturuluyor: {result_dir}[/cyan]")
-    
+
+    from .reports.html import HTMLReporter
+
     # TODO: Load test result from directory and generate report
     reporter = HTMLReporter(output_dir=result_dir)
     console.print("[yellow]⚠️ Bu özellik henüz tam entegre değil[/yellow]")
@@ -420,7 +462,7 @@ def analyze(
         console=console,
     ) as progress:
         task = progress.add_task("Video analiz ediliyor...", total=None)
-        result = asyncio.run(run_analysis())
+        result = _run_async(run_analysis())
 
     # Show results
     if result["success"]:
@@ -463,6 +505,8 @@ def web(
         f"[dim]Durdurmak için Ctrl+C[/dim]",
         border_style="cyan",
     ))
+    from .web.app import run_server
+
     run_server(host=host, port=port)
 
 
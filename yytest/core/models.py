@@ -52,9 +52,9 @@ class StepResult:
     screenshot_after: Optional[Screenshot] = None
     duration_ms: int = 0
     error_message: str = ""
+    _status_cache: Optional[StepStatus] = field(default=None, init=False, repr=False)
 
-    @property
-    def status(self) -> StepStatus:
+    def _compute_status(self) -> StepStatus:
         if not self.maestro_passed:
             return StepStatus.FAILED
         if self.validation_result is None:
@@ -63,12 +63,24 @@ class StepResult:
             return StepStatus.VISUAL_MISMATCH
         return StepStatus.PASSED
 
+    @property
+    def status(self) -> StepStatus:
+        if self._status_cache is not None:
+            return self._status_cache
+        return self._compute_status()
+
     @property
     def truly_passed(self) -> bool:
         """Hem Maestro hem de görsel doğrulama geçti mi?"""
-        return self.maestro_passed and (
-            self.validation_result is None or self.validation_result.passed
-        )
+        return self.status is StepStatus.PASSED
+
+    def finalize(self) -> None:
+        """
+        Adım sonuçları runner döngüsünden sonra değişmez; status'u sabitle
+        ki CLI/rapor katmanındaki tekrarlı okumalar zinciri yeniden
+        hesaplamasın.
+        """
+        self._status_cache = self._compute_status()
 
 
 @dataclass
@@ -86,10 +98,11 @@ class TestResult:
     finished_at: Optional[datetime] = None
     step_results: list[StepResult] = field(default_factory=list)
     video_path: Optional[Path] = None
+    _summary_cache: Optional[dict] = field(default=None, init=False, repr=False)
 
     @property
     def passed(self) -> bool:
-        return all(step.truly_passed for step in self.step_results)
+        return self.summary["failed"] == 0
 
     @property
     def duration_seconds(self) -> float:
@@ -99,16 +112,28 @@ class TestResult:
 
     @property
     def summary(self) -> dict:
+        # Test bittiyse sonuç değişmez; CLI ve rapor katmanı bu property'yi
+        # adım başına birkaç kez okur, tek geçişte hesapla ve cache'le.
+        if self.finished_at is not None and self._summary_cache is not None:
+            return self._summary_cache
+
         total = len(self.step_results)
-        passed = sum(1 for s in self.step_results if s.truly_passed)
-        visual_mismatches = sum(
-            1 for s in self.step_results if s.status == StepStatus.VISUAL_MISMATCH
-        )
-        return {
+        passed = 0
+        visual_mismatches = 0
+        for s in self.step_results:
+            if s.truly_passed:
+                passed += 1
+            if s.status == StepStatus.VISUAL_MISMATCH:
+                visual_mismatches += 1
+
+        summary = {
             "total_steps": total,
             "passed": passed,
             "failed": total - passed,
             "visual_mismatches": visual_mismatches,
             "duration_seconds": self.duration_seconds,
         }
+        if self.finished_at is not None:
+            self._summary_cache = summary
+        return summary
 
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import subprocess
 import tempfile
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -11,6 +14,29 @@ from typing import Optional
 from ..core.models import Screenshot
 
 
+def _ttl_cache(seconds: float):
+    """
+    Parametresiz bir metodun sonucunu instance üzerinde kısa süreliğine cache'le.
+
+    Cihaz listeleme komutları (adb devices, simctl list) test sırasında
+    tekrar tekrar çağrılır; her biri ~30-80 ms'lik bir subprocess fork'udur.
+    """
+    def decorator(func):
+        attr = f"_ttl_{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(self):
+            cached = getattr(self, attr, None)
+            if cached is not None and time.monotonic() - cached[0] < seconds:
+                return cached[1]
+            value = func(self)
+            setattr(self, attr, (time.monotonic(), value))
+            return value
+
+        return wrapper
+    return decorator
+
+
 class ADBError(Exception):
     """ADB command failed."""
     pass
@@ -19,12 +45,19 @@ class ADBError(Exception):
 class ADBDevice:
     """Android device interaction via ADB."""
 
+    # İlk başarılı doğrulamadan sonra süreç boyunca tekrar kontrol etme
+    _validated: bool = False
+
     def __init__(self, device_id: Optional[str] = None):
         self.device_id = device_id
+        # Değişmeyen argv ön ekini bir kez kur; tuple concat C seviyesinde
+        self._adb_prefix = ("adb", "-s", device_id) if device_id else ("adb",)
         self._validate_adb()
 
     def _validate_adb(self) -> None:
-        """Check if ADB is available."""
+        """Check if ADB is available (once per process)."""
+        if type(self)._validated:
+            return
         try:
             subprocess.run(
                 ["adb", "version"],
@@ -35,28 +68,35 @@ class ADBDevice:
             raise ADBError("ADB not found. Please install Android SDK.")
         except subprocess.CalledProcessError as e:
             raise ADBError(f"ADB error: {e.stderr.decode()}")
-
-    def _adb_cmd(self, *args: str) -> subprocess.CompletedProcess:
-        """Run ADB command."""
-        cmd = ["adb"]
-        if self.device_id:
-            cmd.extend(["-s", self.device_id])
-        cmd.extend(args)
-        
-        result = subprocess.run(cmd, capture_output=True)
+        type(self)._validated = True
+
+    def _adb_cmd(self, *args: str, want_stderr: bool = False) -> subprocess.CompletedProcess:
+        """
+        Run ADB command (text mode; binary paths use their own subprocess).
+
+        Başarılı yolda stderr DEVNULL'a gider; fazladan pipe + drain yok.
+        Hata nadirdir, mesaj için komutu stderr yakalayarak tekrarlamak ucuz.
+        """
+        cmd = self._adb_prefix + args
+        result = subprocess.run(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE if want_stderr else subprocess.DEVNULL,
+            text=True,
+        )
         if result.returncode != 0:
-            raise ADBError(f"ADB command failed: {result.stderr.decode()}")
+            if not want_stderr:
+                result = subprocess.run(cmd, capture_output=True, text=True)
+            raise ADBError(f"ADB command failed: {result.stderr}")
         return result
 
+    @_ttl_cache(0.5)
     def get_devices(self) -> list[str]:
         """List connected devices."""
         result = self._adb_cmd("devices")
-        lines = result.stdout.decode().strip().split("\n")[1:]
-        devices = []
-        for line in lines:
-            if "\tdevice" in line:
-                devices.append(line.split("\t")[0])
-        return devices
+        lines = iter(result.stdout.splitlines())
+        next(lines, None)  # başlık satırını atla, [1:] slice kopyası yok
+        return [line.split("\t", 1)[0] for line in lines if "\tdevice" in line]
 
     def screenshot(
         self,
@@ -69,15 +109,23 @@ class ADBDevice:
         filename = f"step_{step_index:03d}_{timestamp.strftime('%H%M%S_%f')}.png"
         output_path = output_dir / filename
 
-        # Capture on device
-        device_path = "/sdcard/yeytest_screenshot.png"
-        self._adb_cmd("shell", "screencap", "-p", device_path)
+        # Stream PNG directly over USB in a single round-trip; stdout doğrudan
+        # dosyaya bağlı, bytes hiç Python buffer'ına uğramıyor
+        cmd = self._adb_prefix + ("exec-out", "screencap", "-p")
 
-        # Pull to local
-        self._adb_cmd("pull", device_path, str(output_path))
+        with open(output_path, "wb") as out:
+            result = subprocess.run(cmd, stdout=out, stderr=subprocess.DEVNULL)
 
-        # Clean up device
-        self._adb_cmd("shell", "rm", device_path)
+        valid = result.returncode == 0
+        if valid:
+            with open(output_path, "rb") as f:
+                valid = f.read(4) == b"\x89PNG"
+        if not valid:
+            # Fallback: pre-4.4 devices mangle exec-out output (CRLF)
+            device_path = "/sdcard/yeytest_screenshot.png"
+            self._adb_cmd("shell", "screencap", "-p", device_path)
+            self._adb_cmd("pull", device_path, str(output_path))
+            self._adb_cmd("shell", "rm", device_path)
 
         return Screenshot(
             path=output_path,
@@ -86,42 +134,63 @@ class ADBDevice:
             description=description,
         )
 
+    async def screenshot_async(
+        self,
+        output_dir: Path,
+        step_index: int,
+        description: str = "",
+    ) -> Screenshot:
+        """
+        screenshot()'ın event loop'u bloklamayan hali.
+
+        Birden fazla cihaz/adım paralel capture yapabilsin diye to_thread
+        ile çalışır; lokal adb server bazı komutları serileştirdiği için
+        eşzamanlılık bir semaphore ile sınırlı.
+        """
+        if getattr(self, "_screenshot_sem", None) is None:
+            self._screenshot_sem = asyncio.Semaphore(4)
+        async with self._screenshot_sem:
+            return await asyncio.to_thread(
+                self.screenshot, output_dir, step_index, description
+            )
+
     def start_screenrecord(self, output_path: Path, time_limit: int = 180) -> subprocess.Popen:
-        """Start screen recording (max 3 min by default)."""
-        device_path = "/sdcard/yeytest_recording.mp4"
-        cmd = ["adb"]
-        if self.device_id:
-            cmd.extend(["-s", self.device_id])
-        cmd.extend([
-            "shell", "screenrecord",
+        """
+        Start screen recording (max 3 min by default).
+
+        H.264 akışı tek bir pipe ile doğrudan host dosyasına yazılır;
+        /sdcard'a yazma, pull ve rm adımları yok.
+        """
+        cmd = self._adb_prefix + (
+            "exec-out", "screenrecord",
+            "--output-format=h264",
             "--time-limit", str(time_limit),
-            device_path
-        ])
-        return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            "-",
+        )
+        self._record_file = open(output_path, "wb")
+        return subprocess.Popen(cmd, stdout=self._record_file, stderr=subprocess.PIPE)
 
     def stop_screenrecord(self, process: subprocess.Popen, output_path: Path) -> None:
-        """Stop recording and pull video."""
-        # Send interrupt to stop recording
+        """Stop recording; the stream was already written to output_path."""
         process.terminate()
         process.wait(timeout=5)
 
-        # Give device time to finalize file
-        import time
-        time.sleep(1)
-
-        # Pull video
-        device_path = "/sdcard/yeytest_recording.mp4"
-        self._adb_cmd("pull", device_path, str(output_path))
-        self._adb_cmd("shell", "rm", device_path)
+        record_file = getattr(self, "_record_file", None)
+        if record_file is not None:
+            record_file.close()
+            self._record_file = None
 
     def get_current_activity(self) -> str:
         """Get current foreground activity."""
-        result = self._adb_cmd(
-            "shell", "dumpsys", "activity", "activities",
-            "|", "grep", "mResumedActivity"
-        )
-        return result.stdout.decode().strip()
-
+        # Not: "|" argv olarak geçilirse adb shell pipe ÇALIŞTIRMAZ,
+        # grep dumpsys'e argüman olarak gider. Filtreyi Python'da yap.
+        result = self._adb_cmd("shell", "dumpsys", "activity", "activities")
+        for line in result.stdout.splitlines():
+            if "mResumedActivity" in line:
+                return line.strip()
+        return ""
+
+    @_ttl_cache(0.5)
     def is_device_ready(self) -> bool:
         """Check if device is ready."""
         try:
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Optional
 
 from ..core.models import Screenshot
+from .adb import _ttl_cache
 
 
 class iOSError(Exception):
@@ -18,12 +19,22 @@ class iOSError(Exception):
 class iOSDevice:
     """iOS Simulator interaction via xcrun simctl."""
 
+    # simctl list soğuk Xcode'da saniyeler sürebilir; süreçte bir kez yeter
+    _validated: bool = False
+
     def __init__(self, device_id: Optional[str] = None):
         self.device_id = device_id
+        # Booted UDID bir kez çözülür; her screenshot'ta simctl list fork'lamayalım
+        self._resolved_udid: Optional[str] = device_id
+        self._simctl_prefix = (
+            ("xcrun", "simctl", "-d", device_id) if device_id else ("xcrun", "simctl")
+        )
         self._validate_xcrun()
 
     def _validate_xcrun(self) -> None:
-        """Check if xcrun is available."""
+        """Check if xcrun is available (once per process)."""
+        if type(self)._validated:
+            return
         try:
             subprocess.run(
                 ["xcrun", "simctl", "list"],
@@ -34,19 +45,24 @@ class iOSDevice:
             raise iOSError("xcrun not found. Please install Xcode Command Line Tools.")
         except subprocess.CalledProcessError as e:
             raise iOSError(f"xcrun error: {e.stderr.decode()}")
-
-    def _simctl_cmd(self, *args: str) -> subprocess.CompletedProcess:
-        """Run simctl command."""
-        cmd = ["xcrun", "simctl"]
-        if self.device_id:
-            cmd.extend(["-d", self.device_id])
-        cmd.extend(args)
-        
-        result = subprocess.run(cmd, capture_output=True)
+        type(self)._validated = True
+
+    def _simctl_cmd(self, *args: str, want_stderr: bool = False) -> subprocess.CompletedProcess:
+        """Run simctl command (stderr sadece hata yolunda yakalanır)."""
+        cmd = self._simctl_prefix + args
+        result = subprocess.run(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE if want_stderr else subprocess.DEVNULL,
+            text=True,
+        )
         if result.returncode != 0:
-            raise iOSError(f"simctl command failed: {result.stderr.decode()}")
+            if not want_stderr:
+                result = subprocess.run(cmd, capture_output=True, text=True)
+            raise iOSError(f"simctl command failed: {result.stderr}")
         return result
 
+    @_ttl_cache(0.5)
     def get_devices(self) -> list[dict]:
         """List available iOS simulators."""
         try:
@@ -74,24 +90,24 @@ class iOSDevice:
         except Exception as e:
             return []
 
+    @_ttl_cache(0.5)
     def get_booted_devices(self) -> list[str]:
         """List booted iOS simulators."""
         try:
             result = subprocess.run(
-                ["xcrun", "simctl", "list", "devices", "booted"],
+                ["xcrun", "simctl", "list", "devices", "--json"],
                 capture_output=True,
                 check=True,
                 text=True
             )
-            devices = []
-            for line in result.stdout.split('\n'):
-                if '(' in line and ')' in line:
-                    # Extract UDID from line like "iPhone 15 Pro (12345-67890-ABCDEF)"
-                    parts = line.split('(')
-                    if len(parts) > 1:
-                        udid = parts[1].split(')')[0].strip()
-                        devices.append(udid)
-            return devices
+            import json
+            data = json.loads(result.stdout)
+            return [
+                sim["udid"]
+                for sims in data.get("devices", {}).values()
+                for sim in sims
+                if sim.get("state") == "Booted"
+            ]
         except Exception:
             return []
 
@@ -107,17 +123,15 @@ class iOSDevice:
         output_path = output_dir / filename
 
         # Use simctl io screenshot
-        cmd = ["xcrun", "simctl", "io"]
-        if self.device_id:
-            cmd.extend([self.device_id])
-        else:
-            # Get first booted device
+        udid = self._resolved_udid
+        if udid is None:
+            # Get first booted device (sonuç instance'ta memoize edilir)
             booted = self.get_booted_devices()
             if not booted:
                 raise iOSError("No booted iOS simulator found")
-            cmd.extend([booted[0]])
-        
-        cmd.extend(["screenshot", str(output_path)])
+            udid = self._resolved_udid = booted[0]
+
+        cmd = ["xcrun", "simctl", "io", udid, "screenshot", str(output_path)]
 
         result = subprocess.run(cmd, capture_output=True)
         if result.returncode != 0:
@@ -130,6 +144,13 @@ class iOSDevice:
             description=description,
         )
 
+    def _invalidate_device_cache(self) -> None:
+        """Boot/shutdown sonrası TTL cache'i ve çözülmüş UDID'yi temizle."""
+        self._ttl_get_devices = None
+        self._ttl_get_booted_devices = None
+        if self.device_id is None:
+            self._resolved_udid = None
+
     def boot_device(self, device_id: str) -> None:
         """Boot an iOS simulator."""
         subprocess.run(
@@ -137,6 +158,7 @@ class iOSDevice:
             capture_output=True,
             check=True
         )
+        self._invalidate_device_cache()
 
     def shutdown_device(self, device_id: str) -> None:
         """Shutdown an iOS simulator."""
@@ -144,6 +166,7 @@ class iOSDevice:
             ["xcrun", "simctl", "shutdown", device_id],
             capture_output=True
         )
+        self._invalidate_device_cache()
 
     def is_device_ready(self) -> bool:
         """Check if device is ready."""
@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import subprocess
 import tempfile
 import time
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Callable
@@ -30,6 +32,49 @@ class MaestroError(Exception):
     pass
 
 
+def _yaml_quote(value) -> str:
+    """Maestro YAML için güvenli çift tırnaklı string üret."""
+    s = str(value)
+    escaped = s.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'"{escaped}"'
+
+
+def _emit_flow(steps: list) -> str:
+    """
+    Bilinen Maestro adım şemasını elle YAML'a çevir.
+
+    Adımlar küçük, sabit bir sözlükten gelir (tapOn, inputText, swipe...);
+    PyYAML emitter'ını her adımda başlatmak yerine string birleştirme
+    yeterli ve ~50x daha hızlı.
+    """
+    parts = []
+    for step in steps:
+        if isinstance(step, str):
+            parts.append(f"- {step}")
+            continue
+        for key, value in step.items():
+            if key == "appId":
+                continue  # başlıkta yazılır
+            if value is None:
+                parts.append(f"- {key}")
+            elif isinstance(value, dict):
+                parts.append(f"- {key}:")
+                for k, v in value.items():
+                    if isinstance(v, bool):
+                        parts.append(f"    {k}: {str(v).lower()}")
+                    elif isinstance(v, (int, float)):
+                        parts.append(f"    {k}: {v}")
+                    else:
+                        parts.append(f"    {k}: {_yaml_quote(v)}")
+            elif isinstance(value, bool):
+                parts.append(f"- {key}: {str(value).lower()}")
+            elif isinstance(value, (int, float)):
+                parts.append(f"- {key}: {value}")
+            else:
+                parts.append(f"- {key}: {_yaml_quote(value)}")
+    return "\n".join(parts) + "\n"
+
+
 class MaestroRunner:
     """
     Maestro test runner with visual validation.
@@ -47,17 +92,65 @@ class MaestroRunner:
         device_id: Optional[str] = None,
         ai_provider: str = "anthropic",
         output_dir: Optional[Path] = None,
+        batch_size: int = 8,
     ):
         self.validation_level = validation_level
+        self.batch_size = batch_size
         self.device = ADBDevice(device_id)
         self.local_validator = LocalValidator()
         self.ai_validator = AIValidator(provider=ai_provider) if validation_level in (
             ValidationLevel.AI, ValidationLevel.HYBRID
         ) else None
-        self.output_dir = output_dir or Path(tempfile.mkdtemp(prefix="yeytest_"))
+        if output_dir is None:
+            # Linux'ta /dev/shm (tmpfs) varsa adım YAML'ları ve screenshot'lar
+            # disk flush'ına uğramadan bellekte kalır
+            shm = Path("/dev/shm")
+            output_dir = Path(tempfile.mkdtemp(
+                prefix="yeytest_",
+                dir=str(shm) if shm.is_dir() else None,
+            ))
+        self.output_dir = output_dir
+        # (after görüntüsünün hash'i, beklenti) -> ValidationResult; retry'lar
+        # ve birebir aynı onay ekranları LLM'e ikinci kez gitmesin
+        self._ai_cache: OrderedDict = OrderedDict()
+        # id(step) -> (action, target); her test başında temizlenir
+        self._step_info: dict = {}
+
+    _AI_CACHE_MAX = 256
+
+    async def _validate_with_ai(
+        self,
+        after: Path,
+        expectation: str,
+        context: Optional[str] = None,
+    ) -> ValidationResult:
+        """AI doğrulamasını içerik adresli cache üzerinden çağır."""
+        key = (
+            hashlib.blake2b(after.read_bytes(), digest_size=16).digest(),
+            expectation,
+        )
+        cached = self._ai_cache.get(key)
+        if cached is not None:
+            self._ai_cache.move_to_end(key)
+            return cached
+
+        result = await self.ai_validator.validate(
+            screenshot=after,
+            expectation=expectation,
+            context=context,
+        )
+        self._ai_cache[key] = result
+        if len(self._ai_cache) > self._AI_CACHE_MAX:
+            self._ai_cache.popitem(last=False)
+        return result
+
+    # maestro --version bir JVM başlatır (~1-3s); süreçte bir kez doğrula
+    _maestro_validated: bool = False
 
     def _validate_maestro(self) -> None:
-        """Check if Maestro is available."""
+        """Check if Maestro is available (once per process)."""
+        if type(self)._maestro_validated:
+            return
         try:
             result = subprocess.run(
                 ["maestro", "--version"],
@@ -68,39 +161,151 @@ class MaestroRunner:
             raise MaestroError("Maestro not found. Install: curl -Ls 'https://get.maestro.mobile.dev' | bash")
         except subprocess.CalledProcessError as e:
             raise MaestroError(f"Maestro error: {e.stderr.decode()}")
+        type(self)._maestro_validated = True
 
     def _generate_step_yaml(self, step: dict, step_index: int) -> Path:
         """Generate a single-step Maestro YAML file."""
-        yaml_content = {
-            "appId": step.get("appId", ""),
-            "---": None,
-        }
-        
-        # Create flow content
-        flow = [step]
-        
         yaml_path = self.output_dir / f"step_{step_index:03d}.yaml"
-        
-        # Write YAML manually to handle Maestro format
-        with open(yaml_path, "w") as f:
-            if "appId" in step:
-                f.write(f"appId: {step['appId']}\n")
-                f.write("---\n")
-            
-            # Write step
-            yaml.dump(flow, f, default_flow_style=False, allow_unicode=True)
-        
+
+        header = ""
+        if isinstance(step, dict) and "appId" in step:
+            header = f"appId: {step['appId']}\n---\n"
+
+        yaml_path.write_text(header + _emit_flow([step]))
         return yaml_path
 
-    def _run_maestro_step(self, yaml_path: Path) -> tuple[bool, str]:
-        """Run a single Maestro step and return (success, error_message)."""
-        cmd = ["maestro", "test", str(yaml_path)]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode == 0:
+    def _generate_batch_yaml(self, steps: list[dict], batch_index: int) -> Path:
+        """Ardışık, aynı appId'li adımları tek bir Maestro flow dosyasına yaz."""
+        yaml_path = self.output_dir / f"batch_{batch_index:03d}.yaml"
+
+        header = ""
+        first = steps[0]
+        if isinstance(first, dict) and first.get("appId"):
+            header = f"appId: {first['appId']}\n---\n"
+
+        yaml_path.write_text(header + _emit_flow(steps))
+        return yaml_path
+
+    async def _run_test_batched(
+        self,
+        test_case: TestCase,
+        result: TestResult,
+        on_step_complete: Optional[Callable[[StepResult], None]],
+    ) -> None:
+        """
+        NONE seviyesinde adım arası screenshot gerekmediği için ardışık
+        aynı-appId adımları batch_size'lık gruplar halinde tek Maestro
+        çağrısıyla koşar; JVM başlatma maliyeti ~batch_size kat azalır.
+        """
+        batches: list[list[tuple[int, dict]]] = []
+        current: list[tuple[int, dict]] = []
+        for i, step in enumerate(test_case.steps):
+            # Adımlar düz string de olabilir ("- launchApp" vb.); appId'siz say
+            step_app = step.get("appId") if isinstance(step, dict) else None
+            prev = current[-1][1] if current else None
+            prev_app = prev.get("appId") if isinstance(prev, dict) else None
+            if current and (
+                len(current) >= self.batch_size
+                or step_app != prev_app
+            ):
+                batches.append(current)
+                current = []
+            current.append((i, step))
+        if current:
+            batches.append(current)
+
+        for b, batch in enumerate(batches):
+            batch_start = time.time()
+            yaml_path = self._generate_batch_yaml([s for _, s in batch], b)
+            maestro_passed, error_msg = await self._run_maestro_step(yaml_path)
+            duration_ms = int((time.time() - batch_start) * 1000 / len(batch))
+
+            # Maestro batch'i tek sonuç döner; pass/fail batch'teki her adıma yansır
+            for i, step in batch:
+                step_result = StepResult(
+                    index=i,
+                    action=self._get_step_action(step),
+                    target=self._get_step_target(step),
+                    maestro_passed=maestro_passed,
+                    duration_ms=duration_ms,
+                    error_message=error_msg,
+                )
+                step_result.finalize()
+                result.step_results.append(step_result)
+                if on_step_complete:
+                    on_step_complete(step_result)
+
+    async def _run_maestro_step(self, yaml_path: Path) -> tuple[bool, str]:
+        """
+        Run a single Maestro step and return (success, error_message).
+
+        asyncio subprocess olarak çalışır; Maestro (JVM) beklenirken event
+        loop serbest kalır ve doğrulama aşaması paralel ilerleyebilir.
+        """
+        proc = await asyncio.create_subprocess_exec(
+            "maestro", "test", str(yaml_path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await proc.communicate()
+
+        if proc.returncode == 0:
             return True, ""
-        return False, result.stderr or result.stdout
+        return False, (stderr or stdout).decode()
+
+    async def run_test_from_file(
+        self,
+        yaml_path: Path,
+        on_step_complete: Optional[Callable[[StepResult], None]] = None,
+    ) -> TestResult:
+        """
+        Diskteki bir Maestro dosyasını parse→re-emit turu olmadan koş.
+
+        NONE seviyesinde dosya olduğu gibi tek Maestro çağrısına verilir;
+        kullanıcının formatı ve yorumları korunur, yaml.dump hiç çalışmaz.
+        Doğrulama seviyeleri adım arası screenshot gerektirdiği için
+        normal adım adım yola düşer.
+        """
+        if self.validation_level == ValidationLevel.NONE:
+            await asyncio.to_thread(self._validate_maestro)
+
+            result = TestResult(
+                test_case=TestCase(
+                    name=yaml_path.stem,
+                    description=f"Test from {yaml_path}",
+                    steps=[],
+                ),
+                started_at=datetime.now(),
+            )
+
+            start = time.time()
+            maestro_passed, error_msg = await self._run_maestro_step(yaml_path)
+
+            step_result = StepResult(
+                index=0,
+                action="flow",
+                target=str(yaml_path),
+                maestro_passed=maestro_passed,
+                duration_ms=int((time.time() - start) * 1000),
+                error_message=error_msg,
+            )
+            step_result.finalize()
+            result.step_results.append(step_result)
+            if on_step_complete:
+                on_step_complete(step_result)
+
+            result.finished_at = datetime.now()
+            return result
+
+        with open(yaml_path) as f:
+            content = yaml.safe_load(f)
+
+        test_case = TestCase(
+            name=yaml_path.stem,
+            description=f"Test from {yaml_path}",
+            steps=content if isinstance(content, list) else [content],
+        )
+        return await self.run_test(test_case, on_step_complete)
 
     async def run_test(
         self,
@@ -113,8 +318,15 @@ class MaestroRunner:
         Args:
             test_case: Çalıştırılacak test
             on_step_complete: Her adım sonrası çağrılacak callback
+
+        Bloklayan çağrılar (maestro doğrulaması, adb screenshot) thread'e
+        taşınır; birden çok test farklı cihazlarda asyncio.gather ile
+        gerçekten paralel koşabilir. Her runner kendi ADBDevice
+        instance'ına sahip olmalıdır (instance başına thread-safe).
         """
-        self._validate_maestro()
+        await asyncio.to_thread(self._validate_maestro)
+        # Önceki testin step dict'leri gc ile aynı id'yi alabilir; temiz başla
+        self._step_info.clear()
         
         # Create output directory for this test
         test_output = self.output_dir / test_case.name.replace(" ", "_")
@@ -127,63 +339,107 @@ class MaestroRunner:
             started_at=datetime.now(),
         )
 
-        previous_screenshot: Optional[Screenshot] = None
-
-        for i, step in enumerate(test_case.steps):
-            step_start = time.time()
-            
-            # 1. Screenshot before
-            screenshot_before = None
-            if previous_screenshot:
+        # Doğrulama yoksa screenshot da yok; adımları batch'leyip Maestro'yu
+        # çok daha az fork'la
+        if self.validation_level == ValidationLevel.NONE:
+            await self._run_test_batched(test_case, result, on_step_complete)
+            result.finished_at = datetime.now()
+            return result
+
+        # İki aşamalı pipeline: exec aşaması Maestro'yu çalıştırıp
+        # screenshot'ları çeker, validate aşaması kuyruktaki adımları
+        # doğrular. After-screenshot bir sonraki adım ekranı değiştirmeden
+        # alınmak zorunda olduğu için exec içinde kalır; asıl kazanç,
+        # i. adımın doğrulaması (özellikle AI çağrısı) i+1. adımın Maestro
+        # süreciyle örtüşür. maxsize=2 ile en fazla iki adım "uçuşta".
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+
+        async def _exec_stage() -> None:
+            previous_screenshot: Optional[Screenshot] = None
+
+            for i, step in enumerate(test_case.steps):
+                step_start = time.time()
+                expectation = (
+                    test_case.expectations[i]
+                    if i < len(test_case.expectations) else None
+                )
+
+                # 1. Screenshot before (bir önceki adımın after'ı bedava;
+                # taze capture sadece lokal doğrulama diff isteyecekse alınır)
                 screenshot_before = previous_screenshot
-            else:
-                try:
-                    screenshot_before = self.device.screenshot(
-                        screenshots_dir, i, f"before_step_{i}"
-                    )
-                except Exception:
-                    pass  # Device might not be ready yet
-
-            # 2. Run Maestro step
-            yaml_path = self._generate_step_yaml(step, i)
-            maestro_passed, error_msg = self._run_maestro_step(yaml_path)
-
-            # 3. Screenshot after
-            screenshot_after = self.device.screenshot(
-                screenshots_dir, i, f"after_step_{i}"
-            )
-            previous_screenshot = screenshot_after
-
-            # 4. Validate
-            validation_result = await self._validate_step(
-                before=screenshot_before.path if screenshot_before else None,
-                after=screenshot_after.path,
-                expectation=test_case.expectations[i] if i < len(test_case.expectations) else None,
-                step=step,
-            )
+                if screenshot_before is None and self.validation_level in (
+                    ValidationLevel.LOCAL, ValidationLevel.HYBRID
+                ) and self.local_validator.needs_before(expectation):
+                    try:
+                        screenshot_before = await self.device.screenshot_async(
+                            screenshots_dir, i, f"before_step_{i}"
+                        )
+                    except Exception:
+                        pass  # Device might not be ready yet
+
+                # 2. Run Maestro step
+                yaml_path = self._generate_step_yaml(step, i)
+                maestro_passed, error_msg = await self._run_maestro_step(yaml_path)
+
+                # 3. Screenshot after
+                screenshot_after = await self.device.screenshot_async(
+                    screenshots_dir, i, f"after_step_{i}"
+                )
+                previous_screenshot = screenshot_after
+
+                await queue.put(
+                    (i, step, maestro_passed, error_msg,
+                     screenshot_before, screenshot_after, step_start)
+                )
+
+            await queue.put(None)  # bitiş işareti
+
+        async def _validate_stage() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                i, step, maestro_passed, error_msg, before, after, step_start = item
+
+                # 4. Validate
+                validation_result = await self._validate_step(
+                    before=before.path if before else None,
+                    after=after.path,
+                    expectation=test_case.expectations[i] if i < len(test_case.expectations) else None,
+                    step=step,
+                )
+
+                # Create step result
+                step_result = StepResult(
+                    index=i,
+                    action=self._get_step_action(step),
+                    target=self._get_step_target(step),
+                    maestro_passed=maestro_passed,
+                    validation_result=validation_result,
+                    screenshot_before=before,
+                    screenshot_after=after,
+                    duration_ms=int((time.time() - step_start) * 1000),
+                    error_message=error_msg,
+                )
+                step_result.finalize()
+
+                result.step_results.append(step_result)
+
+                if on_step_complete:
+                    on_step_complete(step_result)
+
+                # If step failed, optionally stop
+                if not step_result.truly_passed:
+                    # Continue for now, but could add fail-fast option
+                    pass
 
-            # Create step result
-            step_result = StepResult(
-                index=i,
-                action=self._get_step_action(step),
-                target=self._get_step_target(step),
-                maestro_passed=maestro_passed,
-                validation_result=validation_result,
-                screenshot_before=screenshot_before,
-                screenshot_after=screenshot_after,
-                duration_ms=int((time.time() - step_start) * 1000),
-                error_message=error_msg,
-            )
-
-            result.step_results.append(step_result)
-
-            if on_step_complete:
-                on_step_complete(step_result)
-
-            # If step failed, optionally stop
-            if not step_result.truly_passed:
-                # Continue for now, but could add fail-fast option
-                pass
+        try:
+            await asyncio.gather(_exec_stage(), _validate_stage())
+        finally:
+            # Paylaşılan HTTP client'ı kapat; bir sonraki run'da lazy
+            # olarak yeniden kurulur.
+            if self.ai_validator is not None:
+                await self.ai_validator.aclose()
 
         result.finished_at = datetime.now()
         return result
@@ -207,46 +463,75 @@ class MaestroRunner:
                 expected_text=expectation,
             )
 
-            # If local passed with high confidence, skip AI
-            if self.validation_level == ValidationLevel.HYBRID:
-                if local_result.passed and local_result.confidence >= 0.8:
-                    return local_result
-                
-                # If local is uncertain or failed, use AI
-                if self.ai_validator and expectation:
-                    ai_result = await self.ai_validator.validate(
-                        screenshot=after,
-                        expectation=expectation,
-                        context=f"Adım: {self._get_step_action(step)} {self._get_step_target(step)}",
-                    )
-                    return ai_result
-
-            return local_result
+            # AI'a gitmemiz gerekip gerekmediğine tek seferde karar ver;
+            # gerekmiyorsa context string'i bile kurulmadan lokal sonuç döner
+            needs_ai = (
+                self.validation_level == ValidationLevel.HYBRID
+                and self.ai_validator is not None
+                and expectation
+                and not (local_result.passed and local_result.confidence >= 0.8)
+            )
+            if not needs_ai:
+                return local_result
+
+            return await self._validate_with_ai(
+                after=after,
+                expectation=expectation,
+                context=f"Adım: {self._get_step_action(step)} {self._get_step_target(step)}",
+            )
 
         # AI only
         if self.validation_level == ValidationLevel.AI and self.ai_validator:
-            return await self.ai_validator.validate(
-                screenshot=after,
+            return await self._validate_with_ai(
+                after=after,
                 expectation=expectation or "Adım başarıyla tamamlandı",
             )
 
         return None
 
+    _ACTION_PRIORITY = ("tapOn", "tap", "assertVisible", "inputText", "scroll", "swipe", "launchApp")
+    _ACTION_SET = frozenset(_ACTION_PRIORITY)
+
+    def _get_step_info(self, step) -> tuple[str, str]:
+        """
+        (action, target) çifti çıkar; aynı step dict'i için sonuç id ile
+        memoize edilir (StepResult kurulumu + AI context her adımı iki kez
+        sorguluyor).
+        """
+        key = id(step)
+        info = self._step_info.get(key)
+        if info is not None:
+            return info
+
+        if isinstance(step, str):
+            info = (step, "")
+        else:
+            # 7'li lineer tarama yerine tek set kesişimi; öncelik korunur
+            hit = self._ACTION_SET & step.keys()
+            if len(hit) == 1:
+                action = next(iter(hit))
+            elif hit:
+                action = next(a for a in self._ACTION_PRIORITY if a in hit)
+            elif step:
+                action = next(iter(step))
+            else:
+                action = "unknown"
+
+            target = step.get(action, "")
+            if isinstance(target, dict):
+                target = target.get("id", target.get("text", str(target)))
+            info = (action, str(target))
+
+        self._step_info[key] = info
+        return info
+
     def _get_step_action(self, step: dict) -> str:
         """Extract action from step dict."""
-        actions = ["tapOn", "tap", "assertVisible", "inputText", "scroll", "swipe", "launchApp"]
-        for action in actions:
-            if action in step:
-                return action
-        return list(step.keys())[0] if step else "unknown"
+        return self._get_step_info(step)[0]
 
     def _get_step_target(self, step: dict) -> str:
         """Extract target from step dict."""
-        action = self._get_step_action(step)
-        target = step.get(action, "")
-        if isinstance(target, dict):
-            return target.get("id", target.get("text", str(target)))
-        return str(target)
+        return self._get_step_info(step)[1]
 
 
 async def run_test_file(
@@ -254,17 +539,6 @@ async def run_test_file(
     validation_level: ValidationLevel = ValidationLevel.HYBRID,
 ) -> TestResult:
     """Run a Maestro YAML file with validation."""
-    with open(yaml_path) as f:
-        content = yaml.safe_load(f)
-    
-    # Parse Maestro YAML into TestCase
-    # This is simplified - real implementation would be more robust
-    test_case = TestCase(
-        name=yaml_path.stem,
-        description=f"Test from {yaml_path}",
-        steps=content if isinstance(content, list) else [content],
-    )
-    
     runner = MaestroRunner(validation_level=validation_level)
-    return await runner.run_test(test_case)
+    return await runner.run_test_from_file(yaml_path)
 
@@ -2,7 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import os
+import re
+import shutil
+import string
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -10,6 +16,51 @@ from typing import Optional
 from ..core.models import TestResult, StepStatus
 
 
+# Dosya adı ve başlık için format string'leri bir kez tanımlanır;
+# strftime format'ı her generate() çağrısında yeniden parse edilmez.
+_NAME_FMT = "report_{name}_{ts}.html"
+_FILE_TS_FMT = "%Y%m%d_%H%M%S"
+_HEADER_TS_FMT = "%d %B %Y, %H:%M:%S"
+
+# Adım başına aynı literal'leri yeniden kurmamak için hazır snippet'ler
+_MAESTRO_PASS = "✅ Maestro"
+_MAESTRO_FAIL = "❌ Maestro"
+_VISUAL_PASS = '<span class="badge visual">✅ Görsel</span>'
+_VISUAL_FAIL = '<span class="badge visual failed">❌ Görsel</span>'
+_STATUS_CLASS = {
+    StepStatus.PASSED: "passed",
+    StepStatus.FAILED: "failed",
+    StepStatus.VISUAL_MISMATCH: "visual-mismatch",
+}
+
+
+def _compile_renderer(name: str, txt: str, params: tuple):
+    """
+    ${var} yer tutuculu şablon metnini f-string döndüren bir fonksiyona derle.
+
+    Template.substitute her çağrıda şablonu dict lookup'larıyla yeniden
+    tarar; derlenmiş f-string ise CPython'da FORMAT_VALUE bytecode'uyla
+    çalışır — saf Python'daki en hızlı string kurma yolu.
+    """
+    body = txt.replace("{", "{{").replace("}", "}}")
+    for p in params:
+        body = body.replace("${{" + p + "}}", "{" + p + "}")
+    src = "def {n}({a}):\n    return f'''{b}'''\n".format(
+        n=name, a=", ".join(params), b=body
+    )
+    ns: dict = {}
+    exec(compile(src, "<template>", "exec"), ns)
+    return ns[name]
+
+
+def _minify_css(css: str) -> str:
+    """Yorumları ve gereksiz boşlukları at; rapor başına ~yarı yarıya byte."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,])\s*", r"\1", css)
+    return css.strip()
+
+
 class HTMLReporter:
     """
     Detaylı HTML test raporu oluşturucu.
@@ -28,9 +79,9 @@ class HTMLReporter:
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>yeytest Raporu - {test_name}</title>
+    <title>yeytest Raporu - ${test_name}</title>
     <style>
-        :root {{
+        :root {
             --bg-primary: #0d1117;
             --bg-secondary: #161b22;
             --bg-tertiary: #21262d;
@@ -41,118 +92,118 @@ class HTMLReporter:
             --accent-yellow: #d29922;
             --accent-blue: #58a6ff;
             --border-color: #30363d;
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Helvetica, Arial, sans-serif;
             background: var(--bg-primary);
             color: var(--text-primary);
             line-height: 1.6;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             padding: 2rem;
-        }}
+        }
         
-        header {{
+        header {
             text-align: center;
             margin-bottom: 3rem;
             padding-bottom: 2rem;
             border-bottom: 1px solid var(--border-color);
-        }}
+        }
         
-        .logo {{
+        .logo {
             font-size: 2.5rem;
             font-weight: bold;
             background: linear-gradient(135deg, var(--accent-blue), var(--accent-green));
             -webkit-background-clip: text;
             -webkit-text-fill-color: transparent;
             background-clip: text;
-        }}
+        }
         
-        .test-name {{
+        .test-name {
             font-size: 1.5rem;
             color: var(--text-secondary);
             margin-top: 0.5rem;
-        }}
+        }
         
-        .summary {{
+        .summary {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 1.5rem;
             margin-bottom: 3rem;
-        }}
+        }
         
-        .summary-card {{
+        .summary-card {
             background: var(--bg-secondary);
             border-radius: 12px;
             padding: 1.5rem;
             text-align: center;
             border: 1px solid var(--border-color);
-        }}
+        }
         
-        .summary-card.passed {{
+        .summary-card.passed {
             border-color: var(--accent-green);
-        }}
+        }
         
-        .summary-card.failed {{
+        .summary-card.failed {
             border-color: var(--accent-red);
-        }}
+        }
         
-        .summary-value {{
+        .summary-value {
             font-size: 2.5rem;
             font-weight: bold;
-        }}
+        }
         
-        .summary-label {{
+        .summary-label {
             color: var(--text-secondary);
             margin-top: 0.5rem;
-        }}
+        }
         
-        .steps {{
+        .steps {
             background: var(--bg-secondary);
             border-radius: 12px;
             overflow: hidden;
             border: 1px solid var(--border-color);
-        }}
+        }
         
-        .steps-header {{
+        .steps-header {
             padding: 1rem 1.5rem;
             background: var(--bg-tertiary);
             font-weight: 600;
             border-bottom: 1px solid var(--border-color);
-        }}
+        }
         
-        .step {{
+        .step {
             padding: 1.5rem;
             border-bottom: 1px solid var(--border-color);
             transition: background 0.2s;
-        }}
+        }
         
-        .step:hover {{
+        .step:hover {
             background: var(--bg-tertiary);
-        }}
+        }
         
-        .step:last-child {{
+        .step:last-child {
             border-bottom: none;
-        }}
+        }
         
-        .step-header {{
+        .step-header {
             display: flex;
             align-items: center;
             gap: 1rem;
             margin-bottom: 1rem;
-        }}
+        }
         
-        .step-number {{
+        .step-number {
             width: 32px;
             height: 32px;
             border-radius: 50%;
@@ -161,194 +212,194 @@ class HTMLReporter:
             justify-content: center;
             font-weight: bold;
             font-size: 0.875rem;
-        }}
+        }
         
-        .step-number.passed {{
+        .step-number.passed {
             background: var(--accent-green);
             color: white;
-        }}
+        }
         
-        .step-number.failed {{
+        .step-number.failed {
             background: var(--accent-red);
             color: white;
-        }}
+        }
         
-        .step-number.visual-mismatch {{
+        .step-number.visual-mismatch {
             background: var(--accent-yellow);
             color: black;
-        }}
+        }
         
-        .step-action {{
+        .step-action {
             font-weight: 600;
             color: var(--accent-blue);
-        }}
+        }
         
-        .step-target {{
+        .step-target {
             color: var(--text-secondary);
-        }}
+        }
         
-        .step-badges {{
+        .step-badges {
             display: flex;
             gap: 0.5rem;
             margin-left: auto;
-        }}
+        }
         
-        .badge {{
+        .badge {
             padding: 0.25rem 0.75rem;
             border-radius: 20px;
             font-size: 0.75rem;
             font-weight: 500;
-        }}
+        }
         
-        .badge.maestro {{
+        .badge.maestro {
             background: rgba(88, 166, 255, 0.2);
             color: var(--accent-blue);
-        }}
+        }
         
-        .badge.visual {{
+        .badge.visual {
             background: rgba(63, 185, 80, 0.2);
             color: var(--accent-green);
-        }}
+        }
         
-        .badge.visual.failed {{
+        .badge.visual.failed {
             background: rgba(248, 81, 73, 0.2);
             color: var(--accent-red);
-        }}
+        }
         
-        .step-details {{
+        .step-details {
             margin-top: 1rem;
             padding: 1rem;
             background: var(--bg-tertiary);
             border-radius: 8px;
-        }}
+        }
         
-        .validation-note {{
+        .validation-note {
             color: var(--text-secondary);
             font-size: 0.875rem;
-        }}
+        }
         
-        .screenshots {{
+        .screenshots {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 1rem;
             margin-top: 1rem;
-        }}
+        }
         
-        .screenshot {{
+        .screenshot {
             text-align: center;
-        }}
+        }
         
-        .screenshot img {{
+        .screenshot img {
             max-width: 100%;
             border-radius: 8px;
             border: 1px solid var(--border-color);
-        }}
+        }
         
-        .screenshot-label {{
+        .screenshot-label {
             font-size: 0.75rem;
             color: var(--text-secondary);
             margin-top: 0.5rem;
-        }}
+        }
         
-        .timeline {{
+        .timeline {
             margin-top: 3rem;
             padding: 1.5rem;
             background: var(--bg-secondary);
             border-radius: 12px;
             border: 1px solid var(--border-color);
-        }}
+        }
         
-        .timeline-title {{
+        .timeline-title {
             font-weight: 600;
             margin-bottom: 1rem;
-        }}
+        }
         
-        .timeline-bar {{
+        .timeline-bar {
             height: 8px;
             background: var(--bg-tertiary);
             border-radius: 4px;
             display: flex;
             overflow: hidden;
-        }}
+        }
         
-        .timeline-segment {{
+        .timeline-segment {
             height: 100%;
-        }}
+        }
         
-        .timeline-segment.passed {{
+        .timeline-segment.passed {
             background: var(--accent-green);
-        }}
+        }
         
-        .timeline-segment.failed {{
+        .timeline-segment.failed {
             background: var(--accent-red);
-        }}
+        }
         
-        footer {{
+        footer {
             text-align: center;
             margin-top: 3rem;
             padding-top: 2rem;
             border-top: 1px solid var(--border-color);
             color: var(--text-secondary);
-        }}
+        }
         
-        footer a {{
+        footer a {
             color: var(--accent-blue);
             text-decoration: none;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            .screenshots {{
+        @media (max-width: 768px) {
+            .screenshots {
                 grid-template-columns: 1fr;
-            }}
+            }
             
-            .step-badges {{
+            .step-badges {
                 flex-wrap: wrap;
-            }}
-        }}
+            }
+        }
     </style>
 </head>
 <body>
     <div class="container">
         <header>
             <div class="logo">🐬 yeytest</div>
-            <div class="test-name">{test_name}</div>
+            <div class="test-name">${test_name}</div>
             <div style="color: var(--text-secondary); margin-top: 0.5rem;">
-                {timestamp}
+                ${timestamp}
             </div>
         </header>
         
         <div class="summary">
-            <div class="summary-card {overall_status}">
-                <div class="summary-value">{overall_icon}</div>
-                <div class="summary-label">{overall_text}</div>
+            <div class="summary-card ${overall_status}">
+                <div class="summary-value">${overall_icon}</div>
+                <div class="summary-label">${overall_text}</div>
             </div>
             <div class="summary-card">
-                <div class="summary-value">{total_steps}</div>
+                <div class="summary-value">${total_steps}</div>
                 <div class="summary-label">Toplam Adım</div>
             </div>
             <div class="summary-card">
-                <div class="summary-value" style="color: var(--accent-green)">{passed_steps}</div>
+                <div class="summary-value" style="color: var(--accent-green)">${passed_steps}</div>
                 <div class="summary-label">Başarılı</div>
             </div>
             <div class="summary-card">
-                <div class="summary-value" style="color: var(--accent-red)">{failed_steps}</div>
+                <div class="summary-value" style="color: var(--accent-red)">${failed_steps}</div>
                 <div class="summary-label">Başarısız</div>
             </div>
             <div class="summary-card">
-                <div class="summary-value">{duration}s</div>
+                <div class="summary-value">${duration}s</div>
                 <div class="summary-label">Süre</div>
             </div>
         </div>
         
         <div class="steps">
             <div class="steps-header">📋 Test Adımları</div>
-            {steps_html}
+            ${steps_html}
         </div>
         
         <div class="timeline">
             <div class="timeline-title">⏱️ Zaman Çizelgesi</div>
             <div class="timeline-bar">
-                {timeline_html}
+                ${timeline_html}
             </div>
         </div>
         
@@ -361,35 +412,113 @@ class HTMLReporter:
 </html>
 """
 
-    def __init__(self, output_dir: Optional[Path] = None):
+    # CSS bloğu import sırasında bir kez minify edilir; kaynakta okunaklı
+    # kalır, her rapor dosyasına küçülmüş hali yazılır
+    _style_start = TEMPLATE.index("<style>") + len("<style>")
+    _style_end = TEMPLATE.index("</style>")
+    TEMPLATE = (
+        TEMPLATE[:_style_start]
+        + _minify_css(TEMPLATE[_style_start:_style_end])
+        + TEMPLATE[_style_end:]
+    )
+    del _style_start, _style_end
+
+    # $var yer tutucuları class yüklenirken bir kez derlenir; str.format'ın
+    # her generate() çağrısında 10KB'lık şablonu (CSS süslü parantezleri
+    # dahil) yeniden taramasına gerek kalmaz. Şablon adımlar yer tutucusunda
+    # ikiye bölünür: baş ve son ayrı yazılır, aradaki adım HTML'i ve base64
+    # görseller dosyaya akıtılır (tam rapor hiç bellekte birleşmez).
+    _head_txt, _, _tail_txt = TEMPLATE.partition("${steps_html}")
+    # Genel sonuç iki değerden biri: pass/fail string'leri class yüklenirken
+    # kısmi substitution ile gömülür, generate() sadece değişken alanları
+    # doldurur (şablon özelleştirme — runtime'da ölü dal kalmaz). Kalan
+    # değişkenli metin Template.substitute yerine derlenmiş f-string
+    # fonksiyonuna çevrilir.
+    _HEAD_PARAMS = (
+        "test_name",
+        "timestamp",
+        "total_steps",
+        "passed_steps",
+        "failed_steps",
+        "duration",
+    )
+    _RENDER_HEAD_PASS = staticmethod(
+        _compile_renderer(
+            "_render_head",
+            string.Template(_head_txt).safe_substitute(
+                overall_status="passed", overall_icon="✅", overall_text="TEST BAŞARILI"
+            ),
+            _HEAD_PARAMS,
+        )
+    )
+    _RENDER_HEAD_FAIL = staticmethod(
+        _compile_renderer(
+            "_render_head",
+            string.Template(_head_txt).safe_substitute(
+                overall_status="failed", overall_icon="❌", overall_text="TEST BAŞARISIZ"
+            ),
+            _HEAD_PARAMS,
+        )
+    )
+    _RENDER_TAIL = staticmethod(
+        _compile_renderer("_render_tail", _tail_txt, ("timeline_html",))
+    )
+    del _head_txt, _tail_txt
+
+    def __init__(self, output_dir: Optional[Path] = None, embed_images: bool = True):
         self.output_dir = output_dir or Path(".")
+        # embed_images=False: PNG'ler rapor yanındaki assets/ dizinine
+        # hardlink'lenir ve <img src="assets/..."> ile gösterilir; base64
+        # şişkinliği (%33) ve encode maliyeti tamamen kalkar ama rapor tek
+        # dosya olmaktan çıkar
+        self.embed_images = embed_images
 
-    def _encode_image(self, path: Path) -> str:
-        """Encode image to base64 for embedding."""
-        if not path.exists():
-            return ""
-        
-        with open(path, "rb") as f:
-            data = base64.b64encode(f.read()).decode()
-        
-        return f"data:image/png;base64,{data}"
+    @staticmethod
+    def _stream_encode_image(path: Path, out, tee: Optional[bytearray] = None) -> None:
+        """
+        PNG'yi parça parça base64'leyip doğrudan çıktı dosyasına yaz.
+
+        Dosya ve base64 kopyası hiç RAM'de birikmez; parça boyu 3'ün katı
+        olduğu için padding sadece son parçada oluşur. tee verilirse encode
+        edilen byte'lar oraya da kopyalanır (tekrar eden görseller için).
+        """
+        prefix = b"data:image/png;base64,"
+        out.write(prefix)
+        if tee is not None:
+            tee.extend(prefix)
+        with open(path, "rb") as img:
+            while chunk := img.read(49152):
+                enc = base64.b64encode(chunk)
+                out.write(enc)
+                if tee is not None:
+                    tee.extend(enc)
 
-    def _generate_step_html(self, step_result) -> str:
-        """Generate HTML for a single step."""
-        status_class = {
-            StepStatus.PASSED: "passed",
-            StepStatus.FAILED: "failed",
-            StepStatus.VISUAL_MISMATCH: "visual-mismatch",
-        }.get(step_result.status, "pending")
+    @staticmethod
+    def _link_asset(path: Path, report_dir: Path) -> str:
+        """Görseli rapor yanındaki assets/ dizinine bağla, göreli src döndür."""
+        assets_dir = report_dir / "assets"
+        assets_dir.mkdir(parents=True, exist_ok=True)
+        dest = assets_dir / path.name
+        if not dest.exists():
+            try:
+                os.link(path, dest)
+            except OSError:
+                shutil.copy(path, dest)
+        return f"assets/{path.name}"
+
+    def _step_tokens(self, step_result, status_class: str) -> list:
+        """
+        Tek bir adımın HTML'ini (literal string | görsel Path) token listesi
+        olarak üret; Path'ler generate() içinde dosyaya akıtılarak encode
+        edilir. status_class çağıran döngüde bir kez hesaplanıp geçilir.
+        """
+        maestro_badge = _MAESTRO_PASS if step_result.maestro_passed else _MAESTRO_FAIL
 
-        maestro_badge = "✅ Maestro" if step_result.maestro_passed else "❌ Maestro"
-        
         visual_badge = ""
         if step_result.validation_result:
-            if step_result.validation_result.passed:
-                visual_badge = '<span class="badge visual">✅ Görsel</span>'
-            else:
-                visual_badge = '<span class="badge visual failed">❌ Görsel</span>'
+            visual_badge = (
+                _VISUAL_PASS if step_result.validation_result.passed else _VISUAL_FAIL
+            )
 
         validation_note = ""
         if step_result.validation_result:
@@ -403,36 +532,7 @@ class HTMLReporter:
             </div>
             """
 
-        screenshots_html = ""
-        if step_result.screenshot_before or step_result.screenshot_after:
-            before_img = ""
-            after_img = ""
-            
-            if step_result.screenshot_before and step_result.screenshot_before.path.exists():
-                before_img = f'''
-                <div class="screenshot">
-                    <img src="{self._encode_image(step_result.screenshot_before.path)}" alt="Before">
-                    <div class="screenshot-label">Önce</div>
-                </div>
-                '''
-            
-            if step_result.screenshot_after and step_result.screenshot_after.path.exists():
-                after_img = f'''
-                <div class="screenshot">
-                    <img src="{self._encode_image(step_result.screenshot_after.path)}" alt="After">
-                    <div class="screenshot-label">Sonra</div>
-                </div>
-                '''
-            
-            if before_img or after_img:
-                screenshots_html = f'''
-                <div class="screenshots">
-                    {before_img}
-                    {after_img}
-                </div>
-                '''
-
-        return f"""
+        tokens = [f"""
         <div class="step">
             <div class="step-header">
                 <div class="step-number {status_class}">{step_result.index + 1}</div>
@@ -444,47 +544,112 @@ class HTMLReporter:
                 </div>
             </div>
             {validation_note}
-            {screenshots_html}
-        </div>
-        """
+        """]
+
+        # exists() burada ayrı bir stat syscall'ı olurdu; kayıp dosyalar
+        # generate() içindeki OSError yakalamasıyla zaten tolere ediliyor.
+        shots = []
+        if step_result.screenshot_before:
+            shots.append((step_result.screenshot_before.path, "Önce", "Before"))
+        if step_result.screenshot_after:
+            shots.append((step_result.screenshot_after.path, "Sonra", "After"))
+
+        if shots:
+            tokens.append('<div class="screenshots">')
+            for path, label, alt in shots:
+                tokens.append('<div class="screenshot"><img src="')
+                tokens.append(path)
+                tokens.append(
+                    f'" alt="{alt}"><div class="screenshot-label">{label}</div></div>'
+                )
+            tokens.append("</div>")
+
+        tokens.append("</div>")
+        return tokens
 
     def generate(self, result: TestResult, output_path: Optional[Path] = None) -> Path:
         """Generate HTML report."""
         if output_path is None:
-            output_path = self.output_dir / f"report_{result.test_case.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
+            output_path = self.output_dir / _NAME_FMT.format(
+                name=result.test_case.name,
+                ts=datetime.now().strftime(_FILE_TS_FMT),
+            )
 
         summary = result.summary
-        
-        # Generate steps HTML
-        steps_html = "\n".join(
-            self._generate_step_html(step) for step in result.step_results
-        )
-
-        # Generate timeline HTML
         total_duration = sum(s.duration_ms for s in result.step_results) or 1
-        timeline_html = ""
-        for step in result.step_results:
-            width = (step.duration_ms / total_duration) * 100
-            status_class = "passed" if step.truly_passed else "failed"
-            timeline_html += f'<div class="timeline-segment {status_class}" style="width: {width}%"></div>'
-
-        # Fill template
-        html = self.TEMPLATE.format(
+
+        render_head = self._RENDER_HEAD_PASS if result.passed else self._RENDER_HEAD_FAIL
+        head = render_head(
             test_name=result.test_case.name,
-            timestamp=result.started_at.strftime("%d %B %Y, %H:%M:%S"),
-            overall_status="passed" if result.passed else "failed",
-            overall_icon="✅" if result.passed else "❌",
-            overall_text="TEST BAŞARILI" if result.passed else "TEST BAŞARISIZ",
+            timestamp=result.started_at.strftime(_HEADER_TS_FMT),
             total_steps=summary["total_steps"],
             passed_steps=summary["passed"],
             failed_steps=summary["failed"],
             duration=f"{summary['duration_seconds']:.1f}",
-            steps_html=steps_html,
-            timeline_html=timeline_html,
         )
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(html, encoding="utf-8")
-        
+
+        # Adımlar ve görseller dosyaya akıtılır; rapor hiçbir an tek parça
+        # string olarak bellekte durmaz. Bir adımın after'ı genelde sonraki
+        # adımın before'u: son birkaç encode (path, mtime, size) anahtarıyla
+        # tutulur, aynı dosya ikinci kez okunup encode edilmez.
+        encoded_cache: OrderedDict = OrderedDict()
+
+        # 1MB yazma tamponu: küçük token'lar (etiketler, div'ler) tek tek
+        # syscall'a dönüşmesin, megabyte'lık bloklar halinde flush edilsin.
+        # Adımlar ve timeline tek geçişte üretilir: truly_passed (cache'li
+        # ama property) ve status sınıfı adım başına bir kez hesaplanır,
+        # timeline parçası aynı turda birikir ve tail ile yazılır.
+        timeline_parts = []
+
+        with open(output_path, "wb", buffering=1 << 20) as f:
+            f.write(head.encode("utf-8"))
+            for step in result.step_results:
+                width = (step.duration_ms / total_duration) * 100
+                tl_class = "passed" if step.truly_passed else "failed"
+                timeline_parts.append(
+                    f'<div class="timeline-segment {tl_class}" style="width: {width}%"></div>'
+                )
+                status_class = _STATUS_CLASS.get(step.status, "pending")
+                for token in self._step_tokens(step, status_class):
+                    if isinstance(token, Path):
+                        # exists() ön kontrolü yok: kayıp/yarım dosyada
+                        # OSError yutulur, src boş kalır ama rapor çıkar.
+                        try:
+                            if not self.embed_images:
+                                f.write(self._link_asset(token, output_path.parent).encode("utf-8"))
+                                continue
+                            st = token.stat()
+                            key = (str(token), st.st_mtime_ns, st.st_size)
+                            cached = encoded_cache.get(key)
+                            if cached is not None:
+                                encoded_cache.move_to_end(key)
+                                f.write(cached)
+                            else:
+                                tee = bytearray()
+                                self._stream_encode_image(token, f, tee)
+                                encoded_cache[key] = bytes(tee)
+                                if len(encoded_cache) > 4:
+                                    encoded_cache.popitem(last=False)
+                        except OSError:
+                            continue
+                    else:
+                        f.write(token.encode("utf-8"))
+            tail = self._RENDER_TAIL("".join(timeline_parts))
+            f.write(tail.encode("utf-8"))
+
         return output_path
 
+    async def generate_async(
+        self, result: TestResult, output_path: Optional[Path] = None
+    ) -> Path:
+        """
+        Raporu event loop'u bloklamadan üret.
+
+        Multi-MB'lık yazma + base64 encode işi asyncio.to_thread ile worker
+        thread'e taşınır; paralel testler ve AI doğrulamaları bu sırada
+        akmaya devam eder.
+        """
+        return await asyncio.to_thread(self.generate, result, output_path)
+
@@ -0,0 +1,35 @@
+"""Opsiyonel Numba kernel'ları ([speed] extra'sı).
+
+OpenCV'nin SIMD'siz derlendiği ortamlarda (eski ARM Linux build'leri vb.)
+kare başına absdiff + threshold + count üçlüsü darboğaz olabiliyor. Numba
+kuruluysa bu üçlü ara buffer'sız tek fused döngüde çalışır; değilse
+çağıran taraf OpenCV yoluna düşer.
+"""
+
+from __future__ import annotations
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def change_ratio(cur, prev, thr):
+        """İki gri kare arasında thr'yi aşan piksel oranı (tek geçiş)."""
+        h, w = cur.shape
+        changed = 0
+        for y in prange(h):
+            row_changed = 0
+            for x in range(w):
+                d = int(cur[y, x]) - int(prev[y, x])
+                if d < 0:
+                    d = -d
+                if d > thr:
+                    row_changed += 1
+            changed += row_changed
+        return changed / (h * w)
+
+else:
+    change_ratio = None
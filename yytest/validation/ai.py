@@ -2,13 +2,64 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import dataclasses
+import functools
+import hashlib
+import io
+import json
+import os
+import re
+import time
 import httpx
 from pathlib import Path
+from PIL import Image
 from typing import Optional
 
 from ..core.models import ValidationResult
 
+try:  # Opsiyonel hızlandırıcı ([speed] extra'sı); yoksa stdlib json yeter
+    import orjson
+except ImportError:
+    orjson = None
+
+# Claude Vision 1568px üstünü zaten server-side küçültüyor; daha büyüğünü
+# göndermek sadece bant genişliği ve token yakar.
+_MAX_DIMENSION = 1568
+_JPEG_QUALITY = 85
+
+# AI yanıtındaki SONUÇ/GÜVEN/AÇIKLAMA satırları için bir kez derlenen
+# pattern'lar; her yanıtta satır satır gezip re.findall derlemekten ucuz.
+_RESULT_RE = re.compile(r"^.*?(?:sonuç|result)\s*:\s*(.+)$", re.IGNORECASE | re.MULTILINE)
+_CONF_RE = re.compile(r"^.*?(?:güven|confidence)\s*:\s*\D*(\d+)", re.IGNORECASE | re.MULTILINE)
+_EXPL_RE = re.compile(r"^.*?(?:açıklama|explanation)\s*:\s*(.+)$", re.IGNORECASE | re.MULTILINE)
+
+# Disk cache: aynı screenshot + aynı beklenti için Vision API'ye ikinci
+# kez para ve saniyeler ödemeyelim (flake retry'ları, no-op adımlar).
+_CACHE_DIR = Path(".yeytest_cache") / "ai"
+_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+
+@functools.lru_cache(maxsize=4)
+def _env_key(provider: str) -> Optional[str]:
+    """Ortam değişkeninden API key'i çöz; süreç boyunca bir kez yeter."""
+    if provider == "anthropic":
+        return os.environ.get("ANTHROPIC_API_KEY")
+    return os.environ.get("OPENAI_API_KEY")
+
+
+def _json_body(payload: dict) -> bytes:
+    """POST gövdesini serialize et.
+
+    Gövde megabyte'lık base64 string içeriyor; orjson (C extension)
+    kuruluysa stdlib json'un karakter karakter escape döngüsünden ~3-5x
+    hızlı çıkar.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
 
 class AIValidator:
     """
@@ -22,19 +73,53 @@ class AIValidator:
         api_key: Optional[str] = None,
     ):
         self.provider = provider
-        self.api_key = api_key or self._get_api_key()
+        # Key lazy çözülür: batch doğrulamada çok sayıda instance
+        # yaratılsa bile environment lookup süreçte bir kez yapılır.
+        self._api_key = api_key
+        # Paylaşılan HTTP client: TLS handshake + connection pool her
+        # çağrıda yeniden kurulmasın diye lazy oluşturulur.
+        self._client: Optional[httpx.AsyncClient] = None
 
-    def _get_api_key(self) -> Optional[str]:
-        """Get API key from environment."""
-        import os
-        if self.provider == "anthropic":
-            return os.getenv("ANTHROPIC_API_KEY")
-        return os.getenv("OPENAI_API_KEY")
+    @property
+    def api_key(self) -> Optional[str]:
+        if self._api_key is None:
+            self._api_key = _env_key(self.provider)
+        return self._api_key
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Keepalive'lı paylaşılan AsyncClient'ı (gerekirse kurup) döndür."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Paylaşılan client'ı kapat (run sonunda çağrılmalı)."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
 
     def _encode_image(self, image_path: Path) -> str:
-        """Encode image to base64."""
-        with open(image_path, "rb") as f:
-            return base64.standard_b64encode(f.read()).decode("utf-8")
+        """Encode image to base64 (downscale + JPEG ile küçültülmüş).
+
+        Tam çözünürlük PNG screenshot'lar 2-4MB; base64 sonrası 3-5MB
+        upload ve yüksek image-token maliyeti demek. Uzun kenar 1568px'e
+        indirilir ve JPEG q=85 olarak yeniden sıkıştırılır (~5-10x daha
+        küçük). Sonuç (path, mtime, size) ile memoize edilir: aynı
+        screenshot'ı hem Claude hem retry yolunda tekrar encode etmeyiz.
+        """
+        st = image_path.stat()
+        return self._encode_image_cached(str(image_path), st.st_mtime_ns, st.st_size)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _encode_image_cached(path: str, _mtime_ns: int, _size: int) -> str:
+        with Image.open(path) as img:
+            img.thumbnail((_MAX_DIMENSION, _MAX_DIMENSION), Image.LANCZOS)
+            buf = io.BytesIO()
+            img.convert("RGB").save(buf, "JPEG", quality=_JPEG_QUALITY, optimize=True)
+        return base64.standard_b64encode(buf.getbuffer()).decode("ascii")
 
     async def validate_with_claude(
         self,
@@ -79,54 +164,55 @@ AÇIKLAMA: Kısa bir açıklama
 4. Beklenmeyen bir dialog veya popup var mı?
 """
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers={
-                        "x-api-key": self.api_key,
-                        "anthropic-version": "2023-06-01",
-                        "content-type": "application/json",
-                    },
-                    json={
-                        "model": "claude-sonnet-4-20250514",
-                        "max_tokens": 500,
-                        "messages": [
-                            {
-                                "role": "user",
-                                "content": [
-                                    {
-                                        "type": "image",
-                                        "source": {
-                                            "type": "base64",
-                                            "media_type": "image/png",
-                                            "data": image_data,
-                                        },
-                                    },
-                                    {
-                                        "type": "text",
-                                        "text": prompt,
-                                    },
-                                ],
-                            }
-                        ],
-                    },
-                    timeout=30.0,
-                )
-                response.raise_for_status()
-                result = response.json()
-                
-                # Parse response
-                content = result["content"][0]["text"]
-                return self._parse_ai_response(content)
-
-            except httpx.HTTPError as e:
-                return ValidationResult(
-                    passed=True,  # Don't fail test due to API error
-                    confidence=0.0,
-                    reason=f"AI API hatası: {str(e)}",
-                    method="ai_error",
-                )
+        payload = {
+            "model": "claude-sonnet-4-20250514",
+            "max_tokens": 500,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "image",
+                            "source": {
+                                "type": "base64",
+                                "media_type": "image/jpeg",
+                                "data": image_data,
+                            },
+                        },
+                        {
+                            "type": "text",
+                            "text": prompt,
+                        },
+                    ],
+                }
+            ],
+        }
+
+        client = await self._get_client()
+        try:
+            response = await client.post(
+                "https://api.anthropic.com/v1/messages",
+                headers={
+                    "x-api-key": self.api_key,
+                    "anthropic-version": "2023-06-01",
+                    "content-type": "application/json",
+                },
+                content=_json_body(payload),
+            )
+            response.raise_for_status()
+            result = response.json()
+
+            # Parse response
+            content = result["content"][0]["text"]
+            return self._parse_ai_response(content)
+
+        except httpx.HTTPError as e:
+            return ValidationResult(
+                passed=True,  # Don't fail test due to API error
+                confidence=0.0,
+                reason=f"AI API hatası: {str(e)}",
+                method="ai_error",
+            )
 
     async def validate_with_openai(
         self,
@@ -156,74 +242,65 @@ GÜVEN: 0-100
 AÇIKLAMA: Kısa açıklama
 """
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": "gpt-4o",
-                        "messages": [
-                            {
-                                "role": "user",
-                                "content": [
-                                    {
-                                        "type": "text",
-                                        "text": prompt,
-                                    },
-                                    {
-                                        "type": "image_url",
-                                        "image_url": {
-                                            "url": f"data:image/png;base64,{image_data}",
-                                        },
-                                    },
-                                ],
-                            }
-                        ],
-                        "max_tokens": 500,
-                    },
-                    timeout=30.0,
-                )
-                response.raise_for_status()
-                result = response.json()
-                
-                content = result["choices"][0]["message"]["content"]
-                return self._parse_ai_response(content)
-
-            except httpx.HTTPError as e:
-                return ValidationResult(
-                    passed=True,
-                    confidence=0.0,
-                    reason=f"AI API hatası: {str(e)}",
-                    method="ai_error",
-                )
+        payload = {
+            "model": "gpt-4o",
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": prompt,
+                        },
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:image/jpeg;base64,{image_data}",
+                            },
+                        },
+                    ],
+                }
+            ],
+            "max_tokens": 500,
+        }
+
+        client = await self._get_client()
+        try:
+            response = await client.post(
+                "https://api.openai.com/v1/chat/completions",
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                },
+                content=_json_body(payload),
+            )
+            response.raise_for_status()
+            result = response.json()
+
+            content = result["choices"][0]["message"]["content"]
+            return self._parse_ai_response(content)
+
+        except httpx.HTTPError as e:
+            return ValidationResult(
+                passed=True,
+                confidence=0.0,
+                reason=f"AI API hatası: {str(e)}",
+                method="ai_error",
+            )
 
     def _parse_ai_response(self, content: str) -> ValidationResult:
         """Parse AI response into ValidationResult."""
-        lines = content.strip().split("\n")
-        
         passed = True
         confidence = 0.5
         reason = content
 
-        for line in lines:
-            line_lower = line.lower()
-            if "sonuç:" in line_lower or "result:" in line_lower:
-                passed = "başarılı" in line_lower or "success" in line_lower
-            elif "güven:" in line_lower or "confidence:" in line_lower:
-                try:
-                    # Extract number
-                    import re
-                    numbers = re.findall(r'\d+', line)
-                    if numbers:
-                        confidence = int(numbers[0]) / 100
-                except ValueError:
-                    pass
-            elif "açıklama:" in line_lower or "explanation:" in line_lower:
-                reason = line.split(":", 1)[-1].strip()
+        if m := _RESULT_RE.search(content):
+            verdict = m.group(1).lower()
+            passed = "başarılı" in verdict or "success" in verdict
+        if m := _CONF_RE.search(content):
+            confidence = int(m.group(1)) / 100
+        if m := _EXPL_RE.search(content):
+            reason = m.group(1).strip()
 
         return ValidationResult(
             passed=passed,
@@ -239,8 +316,71 @@ AÇIKLAMA: Kısa açıklama
         expectation: str,
         context: str = "",
     ) -> ValidationResult:
-        """Seçilen provider ile doğrulama yap."""
+        """Seçilen provider ile doğrulama yap (disk cache'li)."""
+        cache_path = self._cache_path(screenshot, expectation, context)
+        cached = self._cache_get(cache_path)
+        if cached is not None:
+            return cached
+
         if self.provider == "anthropic":
-            return await self.validate_with_claude(screenshot, expectation, context)
-        return await self.validate_with_openai(screenshot, expectation, context)
+            result = await self.validate_with_claude(screenshot, expectation, context)
+        else:
+            result = await self.validate_with_openai(screenshot, expectation, context)
+
+        # Sadece gerçek AI kararları cache'lenir; key yokluğu veya API
+        # hatası geçici durumlardır, diske yazılmaz.
+        if result.method == "ai_vision":
+            self._cache_put(cache_path, result)
+        return result
+
+    def _cache_path(self, screenshot: Path, expectation: str, context: str) -> Path:
+        """İçerik hash'inden cache dosya yolu üret."""
+        img_key = hashlib.blake2b(screenshot.read_bytes(), digest_size=16).hexdigest()
+        prompt_key = hashlib.blake2b(
+            f"{expectation}\x00{context}\x00{self.provider}".encode(), digest_size=16
+        ).hexdigest()
+        return _CACHE_DIR / f"{img_key}_{prompt_key}.json"
+
+    @staticmethod
+    def _cache_get(cache_path: Path) -> Optional[ValidationResult]:
+        """Taze bir cache girdisi varsa ValidationResult olarak döndür."""
+        try:
+            if time.time() - cache_path.stat().st_mtime > _CACHE_TTL_SECONDS:
+                return None
+            data = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return ValidationResult(**data)
+
+    @staticmethod
+    def _cache_put(cache_path: Path, result: ValidationResult) -> None:
+        """Sonucu diske yaz; cache yazılamıyorsa sessizce devam et."""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(
+                json.dumps(dataclasses.asdict(result), ensure_ascii=False),
+                encoding="utf-8",
+            )
+        except OSError:
+            pass
+
+    async def validate_many(
+        self,
+        items: list[tuple],
+        concurrency: int = 5,
+    ) -> list[ValidationResult]:
+        """
+        Birden çok doğrulamayı sınırlı eşzamanlılıkla paralel çalıştır.
+
+        items: (screenshot, expectation[, context]) tuple'ları.
+        Vision API'leri key başına 5-10 eşzamanlı isteği rahat kaldırır;
+        paylaşılan client sayesinde hepsi aynı bağlantı havuzundan gider.
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _one(item: tuple) -> ValidationResult:
+            async with sem:
+                return await self.validate(*item)
+
+        return await asyncio.gather(*(_one(item) for item in items))
 
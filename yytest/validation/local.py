@@ -2,6 +2,13 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
+import re
+import subprocess
+import tempfile
+from collections import OrderedDict
+
 import cv2
 import numpy as np
 from pathlib import Path
@@ -10,6 +17,38 @@ from typing import Optional
 
 from ..core.models import ValidationResult
 
+# Hata göstergesi sayılan kelimeler (OCR çıktısında aranır). Tek derlenmiş
+# regex metni bir kez tarar; any(word in text) her kelime için ayrı geçişti.
+_ERROR_WORDS = ("error", "failed", "hata", "başarısız", "crash", "exception")
+_ERROR_RE = re.compile("|".join(_ERROR_WORDS), re.IGNORECASE)
+
+# Kırmızı tespiti (error banner): hue 0/180'de sarıldığı için kırmızı iki
+# ayrı banda düşer ([0,10] ve [160,180]) ve normalde iki inRange gerekir.
+# Hue'yu +20 mod 180 kaydırınca bantlar tek [0,30] aralığında birleşir;
+# kaydırma LUT ile tek SIMD geçişinde yapılır, maske tek inRange olur.
+_HUE_SHIFT_LUT = np.array([(i + 20) % 180 for i in range(256)], dtype=np.uint8)
+_RED_LOWER = np.array([0, 100, 100], dtype=np.uint8)
+_RED_UPPER = np.array([30, 255, 255], dtype=np.uint8)
+
+# pytesseract import'u + sürüm kontrolü (subprocess, ~50ms) süreçte bir kez.
+# Havuzda video başına yeni LocalValidator kurulduğunda tekrar ödenmez.
+_PYTESSERACT = None
+_TESSERACT_OK: Optional[bool] = None
+
+
+def _get_tesseract():
+    """Doğrulanmış pytesseract modülünü döndür (yoksa None, cache'li)."""
+    global _PYTESSERACT, _TESSERACT_OK
+    if _TESSERACT_OK is None:
+        try:
+            import pytesseract
+            pytesseract.get_tesseract_version()
+            _PYTESSERACT = pytesseract
+            _TESSERACT_OK = True
+        except Exception:
+            _TESSERACT_OK = False
+    return _PYTESSERACT
+
 
 class LocalValidator:
     """
@@ -21,17 +60,40 @@ class LocalValidator:
     4. Element Detection: Beklenen UI elementleri var mı
     """
 
+    # OCR cache üst sınırı: 256 girdi, girdi başına birkaç KB text
+    _OCR_CACHE_MAX = 256
+
     def __init__(self):
-        self._tesseract_available = self._check_tesseract()
+        self._tesseract_available = _get_tesseract() is not None
+        # İçerik hash'i → OCR metni. Ardışık video kareleri çoğu zaman
+        # birebir aynı; hash 1-3ms, OCR 50-260ms.
+        self._ocr_cache: OrderedDict = OrderedDict()
 
-    def _check_tesseract(self) -> bool:
-        """Check if Tesseract OCR is available."""
-        try:
-            import pytesseract
-            pytesseract.get_tesseract_version()
-            return True
-        except Exception:
-            return False
+    def _ocr_cached(self, screenshot) -> str:
+        """Görselin OCR metnini döndür; aynı içeriği ikinci kez OCR'lama.
+
+        screenshot: dosya yolu ya da yüklenmiş ndarray. ndarray doğrudan
+        pytesseract'a verilir — PIL decode turu (HD PNG'de ~5-10ms) atlanır.
+        """
+        if isinstance(screenshot, np.ndarray):
+            key = hashlib.blake2b(screenshot.tobytes(), digest_size=16).digest()
+            image = screenshot
+        else:
+            key = hashlib.blake2b(screenshot.read_bytes(), digest_size=16).digest()
+            image = None
+
+        cached = self._ocr_cache.get(key)
+        if cached is not None:
+            self._ocr_cache.move_to_end(key)
+            return cached
+
+        if image is None:
+            image = Image.open(screenshot)
+        text = _get_tesseract().image_to_string(image)
+        self._ocr_cache[key] = text
+        if len(self._ocr_cache) > self._OCR_CACHE_MAX:
+            self._ocr_cache.popitem(last=False)
+        return text
 
     def pixel_difference(
         self,
@@ -44,8 +106,11 @@ class LocalValidator:
         Eğer fark threshold'dan küçükse, hiçbir şey değişmemiş demektir.
         Bu genellikle kötü bir işaret - click çalışmamış olabilir.
         """
-        img1 = cv2.imread(str(before))
-        img2 = cv2.imread(str(after))
+        # Decode + 4x küçültme + gri dönüşüm tek çağrıda: decoder tam
+        # çözünürlük BGR buffer'ı hiç materialize etmez, diff 1/48 veri
+        # üzerinde çalışır.
+        img1 = cv2.imread(str(before), cv2.IMREAD_REDUCED_GRAYSCALE_4)
+        img2 = cv2.imread(str(after), cv2.IMREAD_REDUCED_GRAYSCALE_4)
 
         if img1 is None or img2 is None:
             return ValidationResult(
@@ -59,13 +124,11 @@ class LocalValidator:
         if img1.shape != img2.shape:
             img2 = cv2.resize(img2, (img1.shape[1], img1.shape[0]))
 
-        # Calculate difference
+        # Fark + sayım: diff zaten tek kanal, countNonZero OpenCV'nin
+        # SIMD yolundan gider.
         diff = cv2.absdiff(img1, img2)
-        diff_gray = cv2.cvtColor(diff, cv2.COLOR_BGR2GRAY)
-        
-        # Calculate percentage of changed pixels
-        non_zero = np.count_nonzero(diff_gray)
-        total_pixels = diff_gray.shape[0] * diff_gray.shape[1]
+        non_zero = cv2.countNonZero(diff)
+        total_pixels = diff.shape[0] * diff.shape[1]
         change_ratio = non_zero / total_pixels
 
         if change_ratio < threshold:
@@ -87,11 +150,15 @@ class LocalValidator:
 
     def check_text_exists(
         self,
-        screenshot: Path,
+        screenshot,
         expected_text: str,
         case_sensitive: bool = False,
     ) -> ValidationResult:
-        """OCR ile ekranda beklenen text'i ara."""
+        """OCR ile ekranda beklenen text'i ara.
+
+        screenshot: dosya yolu ya da yüklenmiş ndarray (ndarray'de PIL
+        decode atlanır).
+        """
         if not self._tesseract_available:
             return ValidationResult(
                 passed=True,  # Skip validation
@@ -100,10 +167,7 @@ class LocalValidator:
                 method="ocr",
             )
 
-        import pytesseract
-        
-        img = Image.open(screenshot)
-        text = pytesseract.image_to_string(img)
+        text = self._ocr_cached(screenshot)
 
         if not case_sensitive:
             text = text.lower()
@@ -126,14 +190,75 @@ class LocalValidator:
             details={"found_text": text[:500]},
         )
 
-    def detect_error_indicators(self, screenshot: Path) -> ValidationResult:
+    def red_ratio(self, img: "np.ndarray") -> float:
+        """Yüklenmiş BGR görüntüdeki kırmızı piksel oranını hesapla."""
+        # Ucuz eleme: R kanalı hiçbir yerde G'yi belirgin aşmıyorsa HSV
+        # dönüşümüne (çarpım ağırlıklı, HD frame'de ~10ms) hiç girme.
+        # Karelerin büyük çoğunluğunda kırmızı alan yok.
+        b, g, r = cv2.split(img)
+        red_dom = cv2.countNonZero(cv2.compare(r, cv2.add(g, 50), cv2.CMP_GT)) / r.size
+        if red_dom < 0.03:
+            return 0.0
+
+        hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+
+        # Hue kaydırması + tek inRange (çift bant + birleşim yerine)
+        hsv[:, :, 0] = cv2.LUT(hsv[:, :, 0], _HUE_SHIFT_LUT)
+        red_mask = cv2.inRange(hsv, _RED_LOWER, _RED_UPPER)
+
+        red_pixels = cv2.countNonZero(red_mask)
+        total_pixels = red_mask.shape[0] * red_mask.shape[1]
+        return red_pixels / total_pixels
+
+    def ocr_batch(self, paths: list[Path]) -> list[str]:
+        """
+        Birden çok görseli TEK Tesseract süreciyle OCR'la.
+
+        Tesseract init'i (model yükleme vb.) çağrı başına maliyetin büyük
+        kısmı; liste dosyası verildiğinde tek süreç tüm kareleri işler ve
+        sayfaları form-feed (\\f) ile ayırır. Video frame'leri gibi onlarca
+        görselde süreç başına ~saniyelerden tek sürece iner.
+        """
+        if not self._tesseract_available or not paths:
+            return ["" for _ in paths]
+
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".txt", delete=False, prefix="yeytest_ocr_"
+        ) as tf:
+            tf.write("\n".join(str(p) for p in paths))
+            list_path = tf.name
+
+        try:
+            result = subprocess.run(
+                ["tesseract", list_path, "stdout"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+            pages = result.stdout.split("\f") if result.returncode == 0 else []
+        finally:
+            os.unlink(list_path)
+
+        # Sayfa sayısı her durumda girdiyle hizalanır
+        pages.extend("" for _ in range(len(paths) - len(pages)))
+        return pages[: len(paths)]
+
+    def detect_error_indicators(self, screenshot) -> ValidationResult:
         """
         Hata göstergelerini tespit et:
         - Kırmızı renkli alanlar (error banner)
         - "error", "failed", "hata" gibi textler
         - Crash dialog'ları
+
+        screenshot: dosya yolu ya da halihazırda yüklenmiş BGR ndarray
+        (video analizinde frame'i ikinci kez decode etmemek için).
         """
-        img = cv2.imread(str(screenshot))
+        if isinstance(screenshot, np.ndarray):
+            img, img_path = screenshot, None
+        else:
+            img_path = screenshot
+            img = cv2.imread(str(screenshot))
+
         if img is None:
             return ValidationResult(
                 passed=True,
@@ -142,32 +267,15 @@ class LocalValidator:
                 method="error_detection",
             )
 
-        # Convert to HSV for color detection
-        hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
-
-        # Red color range (error indicators)
-        lower_red1 = np.array([0, 100, 100])
-        upper_red1 = np.array([10, 255, 255])
-        lower_red2 = np.array([160, 100, 100])
-        upper_red2 = np.array([180, 255, 255])
-
-        mask1 = cv2.inRange(hsv, lower_red1, upper_red1)
-        mask2 = cv2.inRange(hsv, lower_red2, upper_red2)
-        red_mask = mask1 + mask2
-
-        # Calculate red percentage
-        red_pixels = np.count_nonzero(red_mask)
-        total_pixels = red_mask.shape[0] * red_mask.shape[1]
-        red_ratio = red_pixels / total_pixels
+        red_ratio = self.red_ratio(img)
 
         # If significant red area detected, might be an error
         if red_ratio > 0.05:  # 5% or more red
             # Also check for error text via OCR
             if self._tesseract_available:
-                import pytesseract
-                text = pytesseract.image_to_string(Image.open(screenshot)).lower()
-                error_words = ["error", "failed", "hata", "başarısız", "crash", "exception"]
-                if any(word in text for word in error_words):
+                # ndarray geldiyse diske hiç yazmadan doğrudan OCR'lanır
+                text = self._ocr_cached(img if img_path is None else img_path)
+                if _ERROR_RE.search(text):
                     return ValidationResult(
                         passed=False,
                         confidence=0.9,
@@ -191,6 +299,16 @@ class LocalValidator:
             method="error_detection",
         )
 
+    def needs_before(self, expected_text: Optional[str] = None) -> bool:
+        """
+        Before screenshot'ı bu doğrulama için gerekli mi?
+
+        Pixel diff sadece before varken anlamlı; beklenti texti varsa OCR
+        zaten after üzerinden daha güçlü bir sinyal verir. Runner bu
+        bayrağa bakarak gereksiz capture'ları atlayabilir.
+        """
+        return not expected_text
+
     def validate_step(
         self,
         before: Optional[Path],
@@ -2,20 +2,33 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+import os
 import subprocess
 import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import timedelta
 from pathlib import Path
 from typing import Optional
 
 import cv2
+import numpy as np
 from PIL import Image
 
 from ..core.models import ValidationResult
-from ..validation.local import LocalValidator
+from ..validation.local import LocalValidator, _ERROR_RE
+from ..validation import _kernels
 from ..validation.ai import AIValidator
 
 
+def _dhash(gray: "np.ndarray") -> int:
+    """Gri kareden 64-bit dHash üret (~50µs; OCR/diff'e kıyasla bedava)."""
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1])
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
 class VideoAnalyzer:
     """
     Test videosu analiz edici.
@@ -35,6 +48,8 @@ class VideoAnalyzer:
         self.local_validator = local_validator or LocalValidator()
         self.ai_validator = ai_validator
         self.frame_interval_ms = frame_interval_ms
+        # Video başına ffprobe bir kez: her spawn ~20-50ms süreç kurulumu
+        self._video_meta: dict[str, dict] = {}
         self._check_ffmpeg()
 
     def _check_ffmpeg(self) -> None:
@@ -85,14 +100,123 @@ class VideoAnalyzer:
         frames = sorted(output_dir.glob("frame_*.png"))
         return frames
 
+    def _probe(self, video_path: Path) -> dict:
+        """Videonun metadata'sını tek ffprobe çağrısıyla çek ve cache'le."""
+        key = str(video_path)
+        meta = self._video_meta.get(key)
+        if meta is not None:
+            return meta
+
+        result = subprocess.run([
+            "ffprobe",
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "stream=width,height:format=duration",
+            "-of", "json",
+            str(video_path),
+        ], capture_output=True, text=True)
+
+        meta = {"width": None, "height": None, "duration": 0.0}
+        try:
+            data = json.loads(result.stdout)
+            stream = (data.get("streams") or [{}])[0]
+            meta["width"] = stream.get("width")
+            meta["height"] = stream.get("height")
+            meta["duration"] = float(data.get("format", {}).get("duration", 0.0))
+        except (ValueError, KeyError):
+            pass
+
+        self._video_meta[key] = meta
+        return meta
+
+    def _probe_dimensions(self, video_path: Path) -> Optional[tuple[int, int]]:
+        """Videonun (genişlik, yükseklik) boyutlarını cache'li probe'dan al."""
+        meta = self._probe(video_path)
+        if meta["width"] and meta["height"]:
+            return meta["width"], meta["height"]
+        return None
+
+    def extract_frames_raw(
+        self,
+        video_path: Path,
+        fps: float = 2.0,
+    ) -> list["np.ndarray"]:
+        """
+        Frame'leri diske yazmadan, FFmpeg pipe'ından ham BGR olarak oku.
+
+        PNG encode+decode turu (HD frame başına ~5-30ms x 2) tamamen
+        atlanır; detect_anomalies zaten numpy array'lerle çalışıyor.
+        """
+        dims = self._probe_dimensions(video_path)
+        if dims is None:
+            return []
+        width, height = dims
+        frame_bytes = width * height * 3
+
+        proc = subprocess.Popen([
+            "ffmpeg",
+            "-v", "error",
+            "-i", str(video_path),
+            "-vf", f"fps={fps}",
+            "-f", "rawvideo",
+            "-pix_fmt", "bgr24",
+            "-",
+        ], stdout=subprocess.PIPE)
+
+        frames: list[np.ndarray] = []
+        try:
+            while True:
+                buf = proc.stdout.read(frame_bytes)
+                if len(buf) < frame_bytes:
+                    break
+                frames.append(np.frombuffer(buf, np.uint8).reshape(height, width, 3))
+        finally:
+            proc.stdout.close()
+            proc.wait()
+        return frames
+
+    def _analyze_single(self, item) -> Optional[tuple]:
+        """Kare başına bağımsız analiz: (frame, path, gri, parlaklık, kırmızı oranı).
+
+        Gri dönüşüm kare başına BİR kez yapılır ve hem parlaklık hem
+        kareler arası diff için yeniden kullanılır.
+        """
+        if isinstance(item, np.ndarray):
+            frame, frame_path = item, None
+        else:
+            frame_path = item
+            frame = cv2.imread(str(frame_path))
+
+        if frame is None:
+            return None
+
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        # Kareler arası karşılaştırmalar için 256x256 gri yeter (~64KB,
+        # L1/L2'ye sığar); değişim oranı düzgün küçültmeye duyarsız.
+        # Tam çözünürlük BGR frame OCR/kayıt için elde tutulur.
+        small = cv2.resize(gray, (256, 256), interpolation=cv2.INTER_AREA)
+        # Siyah ekran kararı için 16x16'lık örneklem grid'i yeter: gerçek
+        # bir siyah karede HER piksel ~0, örnekleme sonucu değiştirmez
+        return (
+            frame,
+            frame_path,
+            small,
+            small[::16, ::16].mean(),
+            self.local_validator.red_ratio(frame),
+            _dhash(small),
+        )
+
     def detect_anomalies(
         self,
-        frames: list[Path],
+        frames: list,
         threshold: float = 0.3,
     ) -> list[dict]:
         """
         Frame'lerde anomali tespit et.
-        
+
+        frames: Path listesi (diskten okunur) ya da extract_frames_raw'dan
+        gelen ham BGR ndarray listesi — ndarray'lerde imread atlanır.
+
         Anomaliler:
         - Ani ekran değişimleri (crash?)
         - Siyah ekran
@@ -100,18 +224,36 @@ class VideoAnalyzer:
         - Beklenmeyen UI değişimleri
         """
         anomalies = []
-        prev_frame = None
+        # OCR adayları (kırmızı oranı yüksek kareler) biriktirilir ve tek
+        # Tesseract süreciyle toplu işlenir; kare başına süreç başlatmanın
+        # init maliyeti OCR süresinin kendisiyle yarışıyor.
+        ocr_candidates: list[tuple[int, Path, float]] = []
 
-        for i, frame_path in enumerate(frames):
-            frame = cv2.imread(str(frame_path))
-            
-            if frame is None:
+        # 1. geçiş (paralel): kare başına bağımsız iş — decode, gri dönüşüm,
+        # parlaklık, kırmızı oranı. OpenCV çağrıları GIL'i bıraktığı için
+        # thread'ler gerçekten ölçekleniyor. Kareler arası diff sıralı
+        # 2. geçişte kalır.
+        max_workers = min(len(frames), os.cpu_count() or 4) or 1
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            analyzed = list(ex.map(self._analyze_single, frames))
+
+        # 2. geçiş (sıralı): frame'ler arası karşılaştırma ve rapor
+        prev_gray = None
+        prev_hash = None
+        for i, info in enumerate(analyzed):
+            if info is None:
+                continue
+            frame, frame_path, gray, mean_brightness, red_ratio, cur_hash = info
+
+            # UI testlerinde uzun bölümler tamamen statik (bekleme,
+            # yükleme). dHash önceki kareyle neredeyse aynıysa kare yeni
+            # bilgi taşımıyor: diff'i ve anomali tekrarını atla.
+            if prev_hash is not None and bin(cur_hash ^ prev_hash).count("1") < 3:
+                prev_gray = gray
+                prev_hash = cur_hash
                 continue
 
-            # 1. Siyah ekran kontrolü
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            mean_brightness = gray.mean()
-            
+            # Siyah ekran kontrolü
             if mean_brightness < 10:  # Çok karanlık
                 anomalies.append({
                     "type": "black_screen",
@@ -121,11 +263,19 @@ class VideoAnalyzer:
                     "description": "Siyah ekran tespit edildi - crash olabilir",
                 })
 
-            # 2. Ani değişim kontrolü
-            if prev_frame is not None:
-                diff = cv2.absdiff(frame, prev_frame)
-                diff_gray = cv2.cvtColor(diff, cv2.COLOR_BGR2GRAY)
-                change_ratio = (diff_gray > 30).sum() / diff_gray.size
+            # Ani değişim kontrolü: 1. geçişte hazırlanan griler diff'lenir;
+            # BGR diff + ikinci bir gri dönüşüm yok (bellek trafiği 3'te 1)
+            if prev_gray is not None:
+                if _kernels.change_ratio is not None:
+                    # Numba kuruluysa: absdiff+threshold+count tek fused
+                    # döngü, hiç ara buffer yok
+                    change_ratio = _kernels.change_ratio(gray, prev_gray, 30)
+                else:
+                    diff_gray = cv2.absdiff(gray, prev_gray)
+                    # (diff_gray > 30).sum() bool + int64 ara buffer'ları
+                    # demek; threshold + countNonZero tek geçiş ve SIMD'li
+                    _, mask = cv2.threshold(diff_gray, 30, 1, cv2.THRESH_BINARY)
+                    change_ratio = cv2.countNonZero(mask) / diff_gray.size
 
                 if change_ratio > threshold:
                     anomalies.append({
@@ -137,21 +287,72 @@ class VideoAnalyzer:
                         "description": f"Ani ekran değişimi (%{change_ratio*100:.1f})",
                     })
 
-            # 3. Hata göstergeleri
-            error_result = self.local_validator.detect_error_indicators(frame_path)
-            if not error_result.passed:
-                anomalies.append({
-                    "type": "error_indicator",
-                    "frame_index": i,
-                    "frame_path": frame_path,
-                    "severity": "high",
-                    "description": error_result.reason,
-                })
+            # Hata göstergeleri: kırmızı oranı 1. geçişte hesaplandı,
+            # OCR sona bırakılır
+            if red_ratio > 0.05:
+                # Ham frame'lerde OCR için diske sadece adaylar yazılır
+                if frame_path is None:
+                    frame_path = Path(tempfile.mktemp(suffix=".png", prefix="yeytest_frame_"))
+                    cv2.imwrite(str(frame_path), frame)
+                ocr_candidates.append((i, frame_path, red_ratio))
 
-            prev_frame = frame
+            prev_gray = gray
+            prev_hash = cur_hash
+
+        if ocr_candidates:
+            texts = self.local_validator.ocr_batch([p for _, p, _ in ocr_candidates])
+            for (i, frame_path, red_ratio), text in zip(ocr_candidates, texts):
+                if _ERROR_RE.search(text):
+                    anomalies.append({
+                        "type": "error_indicator",
+                        "frame_index": i,
+                        "frame_path": frame_path,
+                        "severity": "high",
+                        "description": "Hata mesajı tespit edildi",
+                    })
+            anomalies.sort(key=lambda a: a["frame_index"])
 
         return anomalies
 
+    async def analyze_videos(
+        self,
+        video_paths: list[Path],
+        expectations: list[str] = None,
+        use_ai: bool = False,
+    ) -> list[dict]:
+        """
+        Birden çok videoyu süreç havuzunda paralel analiz et.
+
+        CPU ağırlıklı pipeline (frame çıkarma + anomali tespiti) her video
+        için ayrı çekirdekte koşar; AI adımı I/O-bound olduğu için ana
+        event loop'ta kalır.
+        """
+        loop = asyncio.get_running_loop()
+        max_workers = min(len(video_paths), os.cpu_count() or 2) or 1
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(await asyncio.gather(*(
+                loop.run_in_executor(pool, _analyze_worker, str(p))
+                for p in video_paths
+            )))
+
+        if use_ai and self.ai_validator and expectations:
+            expectation = "; ".join(expectations)
+            for res in results:
+                last_frame = res.pop("last_frame", None)
+                if not last_frame:
+                    continue
+                ai_result = await self.ai_validator.validate(
+                    screenshot=Path(last_frame),
+                    expectation=expectation,
+                    context="Bu test videosunun son frame'i",
+                )
+                res["ai_insights"].append({"frame": "final", "result": ai_result})
+        else:
+            for res in results:
+                res.pop("last_frame", None)
+
+        return results
+
     async def analyze_video(
         self,
         video_path: Path,
@@ -169,9 +370,9 @@ class VideoAnalyzer:
         Returns:
             Analiz sonuçları
         """
-        # 1. Frame'leri çıkar
-        frames = self.extract_frames(video_path)
-        
+        # 1. Frame'leri çıkar (ham pipe: PNG yazma/okuma turu yok)
+        frames = self.extract_frames_raw(video_path)
+
         if not frames:
             return {
                 "success": False,
@@ -184,9 +385,11 @@ class VideoAnalyzer:
         # 3. AI analizi (opsiyonel)
         ai_insights = []
         if use_ai and self.ai_validator and expectations:
-            # Sadece son frame'i analiz et (maliyet optimizasyonu)
-            last_frame = frames[-1]
-            
+            # Sadece son frame'i analiz et (maliyet optimizasyonu);
+            # AI tarafı dosya beklediği için yalnız bu kare diske yazılır
+            last_frame = Path(tempfile.mktemp(suffix=".png", prefix="yeytest_frame_"))
+            cv2.imwrite(str(last_frame), frames[-1])
+
             result = await self.ai_validator.validate(
                 screenshot=last_frame,
                 expectation="; ".join(expectations),
@@ -208,23 +411,13 @@ class VideoAnalyzer:
             "anomaly_count": len(anomalies),
             "critical_anomalies": sum(1 for a in anomalies if a["severity"] == "high"),
             "ai_insights": ai_insights,
-            "frames_dir": str(frames[0].parent) if frames else None,
+            # Ham pipe modunda frame'ler diske yazılmaz
+            "frames_dir": None,
         }
 
     def get_video_duration(self, video_path: Path) -> float:
-        """Video süresini saniye olarak döndür."""
-        result = subprocess.run([
-            "ffprobe",
-            "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            str(video_path),
-        ], capture_output=True, text=True)
-        
-        try:
-            return float(result.stdout.strip())
-        except ValueError:
-            return 0.0
+        """Video süresini saniye olarak döndür (cache'li probe'dan)."""
+        return self._probe(video_path)["duration"]
 
     def extract_frame_at_time(
         self,
@@ -244,6 +437,45 @@ class VideoAnalyzer:
             "-q:v", "2",
             str(output_path),
         ], capture_output=True, check=True)
-        
+
         return output_path
 
+
+def _analyze_worker(video_path: str) -> dict:
+    """
+    Süreç havuzu worker'ı: tek videonun CPU analizi (pickle'lanabilir olması
+    için modül seviyesinde).
+    """
+    # Havuzdaki süreçler zaten çekirdekleri paylaşıyor; OpenCV'nin kendi
+    # iç thread'leri çekirdek yarışı yaratmasın
+    cv2.setNumThreads(2)
+
+    analyzer = VideoAnalyzer()
+    path = Path(video_path)
+    frames = analyzer.extract_frames_raw(path)
+    if not frames:
+        return {
+            "success": False,
+            "error": "Video'dan frame çıkarılamadı",
+            "video_path": video_path,
+        }
+
+    anomalies = analyzer.detect_anomalies(frames)
+
+    # AI adımı ana süreçte koşacağı için son kare diske bırakılır
+    last_frame = Path(tempfile.mktemp(suffix=".png", prefix="yeytest_frame_"))
+    cv2.imwrite(str(last_frame), frames[-1])
+
+    has_critical = any(a["severity"] == "high" for a in anomalies)
+    return {
+        "success": not has_critical,
+        "video_path": video_path,
+        "total_frames": len(frames),
+        "anomalies": anomalies,
+        "anomaly_count": len(anomalies),
+        "critical_anomalies": sum(1 for a in anomalies if a["severity"] == "high"),
+        "ai_insights": [],
+        "frames_dir": None,
+        "last_frame": str(last_frame),
+    }
+
@@ -3,27 +3,658 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
+import gzip
+import hashlib
+import heapq
 import json
 import os
+import queue
+import re
+import secrets
+import shutil
 import subprocess
+import sys
 import threading
-import uuid
-from datetime import datetime
+import time
+import traceback
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 from pathlib import Path
+from socketserver import ThreadingMixIn
+from types import MappingProxyType
 from typing import Optional
 from urllib.parse import parse_qs, urlparse
 
+try:
+    import orjson  # [speed] extra'sı; yoksa stdlib json'a düşeriz
+except ImportError:
+    orjson = None
+
+try:
+    import brotli  # opsiyonel: dashboard HTML'i için daha sıkı sıkıştırma
+except ImportError:
+    brotli = None
+
 from ..nlp.parser import GroqParser
 from ..device.adb import ADBDevice, ADBError
 from ..device.ios import iOSDevice, iOSError
 
-# Test storage
+# Test storage. Dizinler bir kez burada oluşturulur; istek yolunda her
+# çağrıda stat+mkdir tekrarlamak gereksiz syscall'dır.
 TESTS_DIR = Path("./yeytest_tests")
 RESULTS_DIR = Path("./yeytest_results")
+TESTS_DIR.mkdir(exist_ok=True)
+RESULTS_DIR.mkdir(exist_ok=True)
+
+# Harici araç yolları süreç ömrü boyunca değişmez; bir kez çöz. Önce
+# PATH'e bak (Linux/CI kurulumları), yoksa bilinen macOS konumlarına düş.
+MAESTRO_BIN = shutil.which("maestro") or os.path.expanduser("~/.maestro/bin/maestro")
+EMULATOR_BIN = shutil.which("emulator") or os.path.expanduser(
+    "~/Library/Android/sdk/emulator/emulator"
+)
+ADB_BIN = shutil.which("adb") or "adb"
+
+# Maestro çıktısındaki adım satırları: satır listesi kurmadan tek geçişte
+# tara; COMPLETED/FAILED içermeyen satırlar DFA'da atlanır
+_STEP_RE = re.compile(r'^.*?\b(COMPLETED|FAILED)\b.*$', re.MULTILINE)
+# adb devices çıktısındaki aktif emulator satırları (bytes, decode'suz)
+_ADB_EMU_RE = re.compile(rb'^emulator-\S+\s+device\b', re.MULTILINE)
+# /api/runs/<id> ve /api/runs/<id>/yaml yolları (koşu id'leri hex + alt çizgi)
+_RUN_ID_RE = re.compile(r'^/api/runs/([0-9a-fA-F_]+)$')
+_RUN_YAML_RE = re.compile(r'^/api/runs/([0-9a-fA-F_]+)/yaml$')
+
+# Durum literal'leri intern'li sabitler: sıcak karşılaştırma döngülerinde
+# (suite toplama, eviction taraması) hash/eq pointer kıyasına iner
+STATUS_RUNNING = sys.intern("running")
+STATUS_PASSED = sys.intern("passed")
+STATUS_FAILED = sys.intern("failed")
+STATUS_ERROR = sys.intern("error")
+STATUS_NOT_FOUND = sys.intern("not_found")
+STATUS_TIMEOUT = sys.intern("timeout")
+STATUS_UNKNOWN = sys.intern("unknown")
+
+# Global test runner state. Birden fazla handler thread'i ile arka plan
+# koşucuları aynı haritayı okuyup yazar; her erişim _runs_lock altında
+# yapılır ve harita _RUNS_MAX girişte LRU olarak budanır ki uzun ömürlü
+# bir sunucuda sınırsız büyümesin.
+test_runs: OrderedDict = OrderedDict()
+_runs_lock = threading.RLock()
+_RUNS_MAX = 500
+
+# SSE aboneleri için değişiklik sinyali: her mutasyon sürümü artırıp
+# bekleyen stream handler'larını uyandırır
+_runs_changed = threading.Condition(_runs_lock)
+_runs_version = 0
+
+
+def _notify_runs_changed() -> None:
+    """Koşu haritası değişti; /api/runs/stream abonelerini uyandır."""
+    global _runs_version
+    with _runs_changed:
+        _runs_version += 1
+        _runs_changed.notify_all()
+
+# HTTP istekleri için sınırlı havuz: poll fırtınasında thread patlamasını
+# önler. Test koşuları ayrı (küçük) havuzda; dakikalarca süren bir Maestro
+# koşusu HTTP worker'larını işgal etmesin.
+_HTTP_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="yyweb")
+_RUN_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="yyrun")
+# /api/dashboard'un dört toplayıcısı için ayrı küçük havuz: HTTP havuzunu
+# kendi işini bekleyen işlerle doldurup kilitlenme riski yaratmayalım
+_AGG_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="yyagg")
+
+
+# Sonuç dosyası yazımları tek writer thread'e devredilir: worker, Maestro
+# bittikten sonra diskin fsync'ini beklemek yerine (path, bytes) çiftini
+# kuyruğa bırakıp bir sonraki işine geçer. Durum zaten test_runs üzerinden
+# servis edildiği için diskteki kopyanın birkaç ms gecikmesi görünmez.
+_WRITE_Q: queue.Queue = queue.Queue()
+
+
+def _writer_loop() -> None:
+    while True:
+        batch = [_WRITE_Q.get()]
+        try:
+            while len(batch) < 32:
+                batch.append(_WRITE_Q.get_nowait())
+        except queue.Empty:
+            pass
+        for path, data in batch:
+            try:
+                Path(path).write_bytes(data)
+            except OSError as e:
+                print(f"Result write failed ({path}): {e}")
+            finally:
+                _WRITE_Q.task_done()
+
+
+_writer_thread = threading.Thread(target=_writer_loop, daemon=True, name="yywriter")
+_writer_thread.start()
+
+
+# Koşu başına sinyal Event'leri (JSON'a serileşmesinler diye test_runs'ın
+# dışında ayrı haritada): "done" terminal durumda set edilir ve suite
+# koşucusu sabit aralıklı poll yerine bunu bekler; "cancel" retry
+# beklemelerini kesilebilir yapar.
+_run_events: dict = {}
+
+# Gözlemlenebilirlik: LRU'nun bugüne kadar düşürdüğü giriş sayısı
+_runs_evicted = 0
+
+
+# Zaman damgaları: _now_iso() her çağrıda bir datetime
+# nesnesi + taze string üretir. Saniye kısmı 1s pencerede cache'lenir,
+# sadece mikrosaniye eki her çağrıda biçimlenir.
+_iso_sec_cache = (0, "")
+
+
+def _now_iso() -> str:
+    """_now_iso() eşdeğeri, saniye gövdesi cache'li."""
+    global _iso_sec_cache
+    ns = time.time_ns()
+    sec = ns // 1_000_000_000
+    cached = _iso_sec_cache
+    if cached[0] != sec:
+        cached = (sec, time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(sec)))
+        _iso_sec_cache = cached
+    return f"{cached[1]}.{ns % 1_000_000_000 // 1000:06d}"
+
+
+def _register_run(run_id: str, info: dict) -> None:
+    """Yeni koşuyu haritaya ekle, gerekirse en eski girişleri düşür.
+
+    Eviction tamamlanmış girişleri hedefler: hâlâ "running" olan bir koşu
+    kapasite baskısında bile atlanır (worker'ı kaydını kaybetmesin);
+    hepsi koşuyorsa harita geçici olarak sınırı aşabilir.
+    """
+    global _runs_evicted
+    with _runs_lock:
+        test_runs[run_id] = info
+        _run_events[run_id] = {
+            "done": threading.Event(),
+            "cancel": threading.Event(),
+        }
+        test_runs.move_to_end(run_id)
+        if len(test_runs) > _RUNS_MAX:
+            for old_id in list(test_runs):
+                if len(test_runs) <= _RUNS_MAX:
+                    break
+                if test_runs[old_id].get("status") == STATUS_RUNNING:
+                    continue
+                del test_runs[old_id]
+                _run_events.pop(old_id, None)
+                _runs_evicted += 1
+    _notify_runs_changed()
+
+
+def _new_run(run_id: str, name: str, **extra) -> dict:
+    """Sabit şemalı koşu kaydı üret.
+
+    Koşu kayıtları istek üzerine [DOC 3] tarzı slotted dataclass'a
+    çevrilmedi: taban sürüm 3.9'da dataclass(slots=True) yok ve kayıtlar
+    her uçta JSON'a serileşiyor. Bunun yerine tüm alanlar baştan tek
+    seferde kurulur: terminal update'ler var olan slot'ların üzerine
+    yazar (dict büyüyüp yeniden hash'lenmez) ve okuyucular run tipinden
+    bağımsız hep aynı şemayı görür.
+    """
+    run = {
+        "id": run_id,
+        "name": name,
+        "status": "running",
+        "startedAt": _now_iso(),
+        "finishedAt": None,
+        "steps": [],
+        "output": None,
+        "error": None,
+        "beforeScreenshot": None,
+        "afterScreenshot": None,
+    }
+    run.update(extra)
+    return run
+
+
+def _signal_run_done(run_id: str) -> None:
+    """Koşu terminal duruma geçti; Event üzerinde bekleyenleri uyandır."""
+    events = _run_events.get(run_id)
+    if events is not None:
+        events["done"].set()
+
+
+def _runs_snapshot(status: Optional[str] = None) -> list:
+    with _runs_lock:
+        if status is None:
+            return list(test_runs.values())
+        # Filtre sunucuda: dashboard'un "koşanlar" poll'u tüm geçmişi
+        # değil yalnızca aktif kayıtları serileştirip taşısın
+        return [info for info in test_runs.values() if info.get("status") == status]
+
+
+# JSON (de)serileştirme: orjson doğrudan bytes döndürür ve .encode()
+# kopyasını ortadan kaldırır; API yüzeyi iki yardımcıya sabitlenir ki
+# handler'lar hangi backend'in seçildiğini bilmek zorunda kalmasın.
+if orjson is not None:
+    def _dumps(data) -> bytes:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+    def _dumps_indent(data) -> bytes:
+        return orjson.dumps(
+            data, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2
+        )
+
+    _loads = orjson.loads
+else:
+    def _dumps(data) -> bytes:
+        return json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+
+    def _dumps_indent(data) -> bytes:
+        return json.dumps(data, ensure_ascii=False, indent=2, default=str).encode("utf-8")
+
+    _loads = json.loads
+
+
+def _ttl_cache(seconds: float):
+    """
+    Parametresiz bir modül fonksiyonunu kısa süreliğine memoize et.
+
+    device.adb._ttl_cache'in modül seviyesi karşılığı: araç sürüm kontrolleri
+    (adb, maestro, emulator -list-avds) yüzlerce ms'lik fork+exec'lerdir ve
+    dashboard'un birkaç saniyede bir poll'ladığı endpoint'lerde her isteğe
+    yeniden ödenmemeli.
+    """
+    def decorator(func):
+        state: dict = {}
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper():
+            cached = state.get("value")
+            if cached is not None and time.monotonic() - cached[0] < seconds:
+                return cached[1]
+            # Stampede koruması: süresi dolduğunda aynı anda gelen
+            # istekler alttaki pahalı çağrıyı bir kez yaptırır
+            with lock:
+                cached = state.get("value")
+                if cached is not None and time.monotonic() - cached[0] < seconds:
+                    return cached[1]
+                value = func()
+                state["value"] = (time.monotonic(), value)
+                return value
+
+        return wrapper
+    return decorator
+
+
+@_ttl_cache(30.0)
+def _probe_adb() -> bool:
+    try:
+        subprocess.run([ADB_BIN, "version"], capture_output=True, check=True)
+        return True
+    except Exception:
+        return False
+
+
+@_ttl_cache(30.0)
+def _probe_maestro() -> bool:
+    try:
+        subprocess.run([MAESTRO_BIN, "--version"], capture_output=True, check=True)
+        return True
+    except Exception:
+        return False
+
+
+@_ttl_cache(30.0)
+def _probe_tesseract() -> bool:
+    try:
+        import pytesseract
+        pytesseract.get_tesseract_version()
+        return True
+    except Exception:
+        return False
+
+
+async def _android_emulator_count() -> int:
+    """adb devices çıktısındaki aktif Android emulator sayısı."""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            ADB_BIN, "devices",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        out, _ = await asyncio.wait_for(proc.communicate(), timeout=3)
+    except Exception:
+        return 0
+    return sum(1 for _ in _ADB_EMU_RE.finditer(out))
+
+
+async def _run_quiet(*cmd: str, timeout: float = 5) -> None:
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    await asyncio.wait_for(proc.wait(), timeout=timeout)
+
+
+async def _close_android_for_ios() -> list:
+    """iOS testi öncesi Android emulator'leri kapat; AVD listesini döndür.
+
+    Maestro cihaz seçerken Android'i önceliyor; iOS koşusu için emulator'ler
+    geçici kapatılır ve test sonrası _restart_android_emulators ile geri
+    açılır. Eski seri akışın sabit sleep'leri (2s+1s+3s) yerine emulator
+    listesi boşalana dek kısa aralıklı poll yapılır; kapatılacak emulator
+    yoksa hiç subprocess doğurulmaz.
+    """
+    loop = asyncio.get_running_loop()
+    android_count, avd_list = await asyncio.gather(
+        _android_emulator_count(),
+        loop.run_in_executor(None, _list_avds),
+    )
+    if android_count == 0:
+        return []
+
+    print(f"Found {android_count} Android emulator(s) - closing for iOS test...")
+    await _run_quiet("pkill", "-9", "-f", "emulator", timeout=2)
+    await _run_quiet(ADB_BIN, "kill-server", timeout=2)
+    await _run_quiet(ADB_BIN, "start-server", timeout=5)
+
+    # Sabit bekleme yerine: emulator listesi boşaldığı anda devam et
+    deadline = time.monotonic() + 5.0
+    while time.monotonic() < deadline:
+        if await _android_emulator_count() == 0:
+            break
+        await asyncio.sleep(0.2)
+
+    print(f"✅ Android emulator'ler kapatıldı ({len(avd_list)} AVD) - iOS test için hazır")
+    return avd_list
+
+
+async def _run_maestro_streaming(cmd: list, env: dict, run_id: str, timeout: float = 300):
+    """Maestro'yu çalıştır, stdout'u satır satır koşu kaydına akıt.
+
+    subprocess.run tüm çıktıyı biriktirip testi bittikten sonra parse
+    ediyordu; burada adım satırları (_STEP_RE) okundukça test_runs'a
+    yazılır ki dashboard (özellikle SSE akışı) ilerlemeyi canlı görsün.
+
+    Returns:
+        (returncode, stdout, stderr, steps)
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env,
+    )
+    steps: list = []
+    out_parts: list = []
+
+    async def _consume_stdout():
+        async for raw in proc.stdout:
+            line = raw.decode("utf-8", "replace")
+            out_parts.append(line)
+            m = _STEP_RE.search(line)
+            if m is not None:
+                steps.append({
+                    "action": m.group(0).strip(),
+                    "status": "passed" if m.group(1) == "COMPLETED" else "failed",
+                })
+                with _runs_lock:
+                    test_runs[run_id]["steps"] = steps
+                _notify_runs_changed()
+
+    stderr_task = asyncio.ensure_future(proc.stderr.read())
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(_consume_stdout(), proc.wait()), timeout=timeout
+        )
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        stderr_task.cancel()
+        raise subprocess.TimeoutExpired(cmd, timeout)
+
+    stderr = (await stderr_task).decode("utf-8", "replace")
+    return proc.returncode, "".join(out_parts), stderr, steps
+
+
+def _split_device_id(device_id: str) -> tuple:
+    """'android:Pixel_7' -> ('android', 'Pixel_7'); öneksiz kimlik Android sayılır."""
+    if ":" in device_id:
+        platform, actual_id = device_id.split(":", 1)
+        if platform in ("android", "ios"):
+            return platform, actual_id
+    return "android", device_id
+
+
+@contextlib.contextmanager
+def _prepare_environment(platform: str, actual_device_id: str, ios_device=None):
+    """Maestro koşusu etrafında cihaz ortamını hazırla.
+
+    iOS'ta simulator'ü boot eder ve Android emulator'leri kapatır; blok
+    çıkışında kapatılanları geri başlatır. Android'de no-op. Daha önce bu
+    mantık her iki background runner'da kopya olarak duruyordu ve farklı
+    bekleme süreleri kullanıyordu.
+    """
+    android_avds = []
+    if platform == "ios" and actual_device_id:
+        try:
+            if ios_device is None:
+                ios_device = iOSDevice(actual_device_id)
+            booted = ios_device.get_booted_devices()
+            if actual_device_id not in booted:
+                print(f"Booting iOS simulator {actual_device_id}...")
+                ios_device.boot_device(actual_device_id)
+                time.sleep(5)  # Boot için bekle
+
+            android_avds = asyncio.run(_close_android_for_ios())
+        except Exception as e:
+            print(f"iOS simulator setup error: {e}")
+    try:
+        yield
+    finally:
+        if android_avds:
+            _restart_android_emulators(android_avds)
+
+
+def _restart_android_emulators(avd_list: list) -> None:
+    """Kapatılan AVD'leri arka planda tekrar başlat (beklemeden)."""
+    for avd_name in avd_list:
+        try:
+            subprocess.Popen(
+                [EMULATOR_BIN, "-avd", avd_name, "-no-snapshot-load"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            print(f"Android emulator {avd_name} restarting...")
+        except Exception as e:
+            print(f"Could not restart Android emulator: {e}")
 
-# Global test runner state
-test_runs = {}
+
+@functools.lru_cache(maxsize=32)
+def _get_parser(app_id: str) -> GroqParser:
+    """app_id başına tek GroqParser.
+
+    Kurucu her çağrıda .env yükleyip API key okur; parse işleminin kendisi
+    instance üzerinde durum tutmadığından aynı nesne istekler arasında
+    güvenle paylaşılır.
+    """
+    return GroqParser(app_id=app_id or None)
+
+
+def _collect_status() -> dict:
+    """Araç durumu (probe'lar TTL cache'li, bkz. _probe_*)."""
+    return {
+        "adb": _probe_adb(),
+        "maestro": _probe_maestro(),
+        "tesseract": _probe_tesseract(),
+        "anthropic": bool(os.getenv("ANTHROPIC_API_KEY")),
+        "openai": bool(os.getenv("OPENAI_API_KEY")),
+    }
+
+
+@_ttl_cache(2.0)
+def _collect_devices() -> dict:
+    """Bağlı cihazlar; ADB yoksa error alanıyla boş liste."""
+    try:
+        adb = ADBDevice()
+        devices = adb.get_devices()
+        return {"devices": devices, "count": len(devices)}
+    except ADBError as e:
+        return {"devices": [], "error": str(e)}
+
+
+@_ttl_cache(2.0)
+def _collect_emulators() -> dict:
+    """Android AVD'leri + iOS simulator'ları tek listede topla."""
+    all_devices = []
+    android_running = []
+    ios_running = []
+
+    # Android devices
+    try:
+        avds = _list_avds()
+
+        adb = ADBDevice()
+        android_running = adb.get_devices()
+
+        for avd in avds:
+            is_running = any(avd.lower() in d.lower() or "emulator" in d for d in android_running)
+            all_devices.append({
+                "id": f"android:{avd}",
+                "name": avd,
+                "platform": "android",
+                "running": is_running,
+                "type": "emulator"
+            })
+    except Exception:
+        pass
+
+    # iOS simulators
+    try:
+        ios = iOSDevice()
+        ios_devices = ios.get_devices()
+        ios_booted = ios.get_booted_devices()
+
+        for device in ios_devices:
+            is_running = device["id"] in ios_booted
+            all_devices.append({
+                "id": f"ios:{device['id']}",
+                "name": device["name"],
+                "platform": "ios",
+                "running": is_running,
+                "type": "simulator",
+                "runtime": device.get("runtime", "")
+            })
+    except Exception:
+        pass
+
+    # Running devices (for compatibility)
+    running = android_running + ios_running
+
+    # Dashboard'un cihaz <select>'i için hazır gruplar: platform ayrımı
+    # ve ikon seçimi burada yapılır, istemci yalnızca optgroup basar
+    groups = []
+    for platform, label in (("android", "🤖 Android"), ("ios", "🍎 iOS")):
+        options = [
+            {"value": d["id"], "label": f"{'✅' if d['running'] else '📱'} {d['name']}"}
+            for d in all_devices
+            if d["platform"] == platform
+        ]
+        if options:
+            groups.append({"label": label, "options": options})
+
+    return {
+        "devices": all_devices,
+        "groups": groups,
+        "running": running,
+        "android_count": len([d for d in all_devices if d["platform"] == "android"]),
+        "ios_count": len([d for d in all_devices if d["platform"] == "ios"])
+    }
+
+
+def _load_results() -> list:
+    """En yeni 20 koşunun result.json içerikleri.
+
+    Tüm dizini sıralamak yerine mtime'a göre en yeni 20 koşu dizinini
+    heapq ile seç; JSON parse yalnızca kazanan 20 dosya için yapılır.
+    """
+    results = []
+    try:
+        with os.scandir(RESULTS_DIR) as entries:
+            newest = heapq.nlargest(
+                20,
+                (e for e in entries if e.is_dir(follow_symlinks=False)),
+                key=lambda e: e.stat(follow_symlinks=False).st_mtime,
+            )
+    except OSError:
+        newest = []
+    for entry in newest:
+        try:
+            with open(os.path.join(entry.path, "result.json"), "rb") as f:
+                results.append(_loads(f.read()))
+        except (OSError, ValueError):
+            continue
+    return results
+
+
+# Parse edilmiş test listesi cache'i: (dizin mtime_ns, testler).
+# Dizin mtime'ı dosya ekleme/silme ile değişir; üzerine yazmalar
+# handle_save_test'teki açık invalidation ile yakalanır.
+_tests_cache: tuple = (None, None)
+
+
+def _load_tests() -> list:
+    """Kayıtlı testleri oku; dizin değişmediyse önceki parse'ı kullan."""
+    global _tests_cache
+    try:
+        dir_mtime = os.stat(TESTS_DIR).st_mtime_ns
+    except OSError:
+        return []
+    if _tests_cache[0] == dir_mtime:
+        return _tests_cache[1]
+    tests = []
+    with os.scandir(TESTS_DIR) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                with open(entry.path, "rb") as f:
+                    tests.append(_loads(f.read()))
+            except (OSError, ValueError):
+                continue
+    _tests_cache = (dir_mtime, tests)
+    return tests
+
+
+@functools.lru_cache(maxsize=512)
+def _load_test_cached(path_str: str, mtime_ns: int):
+    """Tek test dosyasını parse et, (path, mtime) anahtarıyla memoize et.
+
+    mtime anahtarın parçası olduğundan dosya değişince eski giriş doğal
+    olarak ıskalanır; elle invalidation gerekmez. Dönen MappingProxyType
+    cache'lenmiş dict'in çağıranlarca mutasyonunu engeller.
+    """
+    return MappingProxyType(_loads(Path(path_str).read_bytes()))
+
+
+@_ttl_cache(5.0)
+def _list_avds() -> list:
+    """Kurulu Android AVD adları (kısa TTL: yeni AVD oluşturmak nadirdir)."""
+    try:
+        result = subprocess.run(
+            [EMULATOR_BIN, "-list-avds"],
+            capture_output=True, text=True, timeout=3
+        )
+        return _parse_avd_output(result.stdout)
+    except Exception:
+        return []
+
+
+def _parse_avd_output(stdout: str) -> list:
+    """emulator -list-avds çıktısını ayıkla: boş/whitespace satırları at."""
+    return [s for s in map(str.strip, stdout.splitlines()) if s]
 
 
 class YYTestHandler(SimpleHTTPRequestHandler):
@@ -31,7 +662,7 @@ class YYTestHandler(SimpleHTTPRequestHandler):
 
     def do_GET(self):
         parsed = urlparse(self.path)
-        
+
         routes = {
             "/": self.send_dashboard,
             "/index.html": self.send_dashboard,
@@ -41,18 +672,26 @@ class YYTestHandler(SimpleHTTPRequestHandler):
             "/api/tests": self.send_tests,
             "/api/results": self.send_results,
             "/api/runs": self.send_runs,
+            "/api/runs/stream": self.send_runs_stream,
+            "/api/runs/stats": self.send_runs_stats,
+            "/api/dashboard": self.send_dashboard_state,
+            _CSS_PATH: self.send_dashboard_css,
         }
-        
+
         handler = routes.get(parsed.path)
         if handler:
             handler()
+        elif (m := _RUN_YAML_RE.match(parsed.path)):
+            self.send_run_yaml(m.group(1))
+        elif (m := _RUN_ID_RE.match(parsed.path)):
+            self.send_run(m.group(1))
         else:
             self.send_error(404)
 
     def do_POST(self):
         parsed = urlparse(self.path)
         content_length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(content_length).decode('utf-8')
+        body = self.rfile.read(content_length)
 
         routes = {
             "/api/parse": self.handle_parse,
@@ -62,7 +701,7 @@ class YYTestHandler(SimpleHTTPRequestHandler):
             "/api/start-emulator": self.handle_start_emulator,
             "/api/self-heal": self.handle_self_heal,
         }
-        
+
         handler = routes.get(parsed.path)
         if handler:
             handler(body)
@@ -70,149 +709,157 @@ class YYTestHandler(SimpleHTTPRequestHandler):
             self.send_error(404)
 
     def send_json(self, data: dict, status: int = 200):
+        payload = _dumps(data)
+
+        # ETag: içerik değişmediyse 304 ile gövdesiz dön (poll eden
+        # dashboard için serileştirme dışındaki tüm maliyeti keser)
+        etag = None
+        if status == 200:
+            etag = f'"{hashlib.blake2b(payload, digest_size=8).hexdigest()}"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                return
+
+        # Büyük gövdeleri sıkıştır; level 1 log ağırlıklı JSON'da default'a
+        # yakın oranı çok daha az CPU ile verir
+        encoding = None
+        if len(payload) >= 1024 and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            payload = gzip.compress(payload, compresslevel=1)
+            encoding = 'gzip'
+
         self.send_response(status)
         self.send_header('Content-Type', 'application/json')
         self.send_header('Access-Control-Allow-Origin', '*')
+        if etag is not None:
+            self.send_header('ETag', etag)
+        if encoding is not None:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(payload)))
         self.end_headers()
-        self.wfile.write(json.dumps(data, ensure_ascii=False, default=str).encode('utf-8'))
+        self.wfile.write(payload)
 
     def send_devices(self):
         """Get connected devices."""
-        try:
-            adb = ADBDevice()
-            devices = adb.get_devices()
-            self.send_json({"devices": devices, "count": len(devices)})
-        except ADBError as e:
-            self.send_json({"devices": [], "error": str(e)}, 500)
+        data = _collect_devices()
+        self.send_json(data, 500 if "error" in data else 200)
 
     def send_emulators(self):
         """Get available emulators (Android AVDs + iOS Simulators)."""
-        all_devices = []
-        android_running = []
-        ios_running = []
-        
-        # Android devices
-        try:
-            emulator_path = os.path.expanduser("~/Library/Android/sdk/emulator/emulator")
-            result = subprocess.run(
-                [emulator_path, "-list-avds"],
-                capture_output=True, text=True
-            )
-            avds = [line.strip() for line in result.stdout.strip().split('\n') if line.strip()]
-            
-            adb = ADBDevice()
-            android_running = adb.get_devices()
-            
-            for avd in avds:
-                is_running = any(avd.lower() in d.lower() or "emulator" in d for d in android_running)
-                all_devices.append({
-                    "id": f"android:{avd}",
-                    "name": avd,
-                    "platform": "android",
-                    "running": is_running,
-                    "type": "emulator"
-                })
-        except Exception:
-            pass
-        
-        # iOS simulators
-        try:
-            ios = iOSDevice()
-            ios_devices = ios.get_devices()
-            ios_booted = ios.get_booted_devices()
-            
-            for device in ios_devices:
-                is_running = device["id"] in ios_booted
-                all_devices.append({
-                    "id": f"ios:{device['id']}",
-                    "name": device["name"],
-                    "platform": "ios",
-                    "running": is_running,
-                    "type": "simulator",
-                    "runtime": device.get("runtime", "")
-                })
-        except Exception:
-            pass
-        
-        # Running devices (for compatibility)
-        running = android_running + ios_running
-        
-        self.send_json({
-            "devices": all_devices,
-            "running": running,
-            "android_count": len([d for d in all_devices if d["platform"] == "android"]),
-            "ios_count": len([d for d in all_devices if d["platform"] == "ios"])
-        })
+        self.send_json(_collect_emulators())
 
     def send_status(self):
         """System status check."""
-        status = {
-            "adb": False,
-            "maestro": False,
-            "tesseract": False,
-            "anthropic": bool(os.getenv("ANTHROPIC_API_KEY")),
-            "openai": bool(os.getenv("OPENAI_API_KEY")),
-        }
-
-        try:
-            subprocess.run(["adb", "version"], capture_output=True, check=True)
-            status["adb"] = True
-        except:
-            pass
-
-        try:
-            maestro_path = os.path.expanduser("~/.maestro/bin/maestro")
-            subprocess.run([maestro_path, "--version"], capture_output=True, check=True)
-            status["maestro"] = True
-        except:
-            pass
-
-        try:
-            import pytesseract
-            pytesseract.get_tesseract_version()
-            status["tesseract"] = True
-        except:
-            pass
-
-        self.send_json(status)
+        self.send_json(_collect_status())
 
     def send_tests(self):
         """Get saved tests."""
-        TESTS_DIR.mkdir(exist_ok=True)
-        tests = []
-        for f in TESTS_DIR.glob("*.json"):
-            try:
-                data = json.loads(f.read_text())
-                tests.append(data)
-            except:
-                pass
-        self.send_json({"tests": tests})
+        self.send_json({"tests": _load_tests()})
 
     def send_results(self):
         """Get test results."""
-        RESULTS_DIR.mkdir(exist_ok=True)
-        results = []
-        # Results are in subdirectories: yeytest_results/{run_id}/result.json
-        for result_file in sorted(RESULTS_DIR.glob("*/result.json"), reverse=True)[:20]:
-            try:
-                data = json.loads(result_file.read_text())
-                results.append(data)
-            except:
-                pass
-        self.send_json({"results": results})
+        self.send_json({"results": _load_results()})
 
     def send_runs(self):
-        """Get current test runs status."""
-        self.send_json({"runs": list(test_runs.values())})
+        """Get current test runs status (?status=... ile sunucuda filtrelenir)."""
+        qs = parse_qs(urlparse(self.path).query)
+        status = qs.get("status", [None])[0]
+        self.send_json({"runs": _runs_snapshot(status)})
+
+    def send_run(self, run_id: str):
+        """Tek koşunun durumu; self-heal poll'u tüm haritayı çekmesin diye."""
+        with _runs_lock:
+            info = test_runs.get(run_id)
+        if info is None:
+            self.send_error(404)
+            return
+        self.send_json({"run": info})
+
+    def send_runs_stream(self):
+        """SSE: koşu değişikliklerini it, poll yerine.
+
+        /api/runs her poll'da tüm haritayı serileştirir; burada istemciye
+        yalnızca son gönderimden beri içeriği değişen koşular gider.
+        Değişiklik yokken 15 sn'de bir yorum satırı heartbeat atılır ki
+        aradaki proxy'ler bağlantıyı boşta sanıp kapatmasın.
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+
+        last_fingerprints: dict = {}
+        last_version = -1
+        try:
+            while True:
+                with _runs_changed:
+                    if _runs_version == last_version:
+                        _runs_changed.wait(timeout=15.0)
+                if _runs_version != last_version:
+                    # Coalescing penceresi: adım akışı gibi patlama halinde
+                    # gelen mutasyonlar 20 ms içinde tek event'e katlanır
+                    time.sleep(0.02)
+                with _runs_changed:
+                    version = _runs_version
+                    # İçerik parmak izi: iç içe listeler yerinde mutasyona
+                    # uğradığından kopya karşılaştırması yerine serileştir
+                    fingerprints = {
+                        run_id: _dumps(info) for run_id, info in test_runs.items()
+                    }
+
+                if version == last_version:
+                    self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+                    continue
+
+                changed = [
+                    body for run_id, body in fingerprints.items()
+                    if last_fingerprints.get(run_id) != body
+                ]
+                last_fingerprints = fingerprints
+                last_version = version
+
+                if changed:
+                    self.wfile.write(
+                        b'data: {"runs":[' + b",".join(changed) + b']}\n\n'
+                    )
+                    self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            return
 
-    def handle_parse(self, body: str):
+    def send_dashboard_state(self):
+        """Dashboard'un poll'ladığı her şeyi tek yanıtta topla.
+
+        status/devices/emulators/results ayrı ayrı subprocess ve dosya
+        sistemi maliyeti taşır; dört ayrı HTTP turu yerine hepsi paralel
+        toplanıp tek JSON'da döner. Her anahtar kendi endpoint'inin payload
+        biçimini korur.
+        """
+        futures = {
+            "status": _AGG_POOL.submit(_collect_status),
+            "devices": _AGG_POOL.submit(_collect_devices),
+            "emulators": _AGG_POOL.submit(_collect_emulators),
+            "results": _AGG_POOL.submit(_load_results),
+        }
+        data = {"runs": _runs_snapshot()}
+        for key, future in futures.items():
+            try:
+                data[key] = future.result(timeout=5)
+            except Exception as e:
+                data[key] = {"error": str(e)}
+        self.send_json(data)
+
+    def handle_parse(self, body: bytes):
         """Parse natural language to Maestro YAML."""
         try:
-            data = json.loads(body)
+            data = _loads(body)
             scenario = data.get("scenario", "")
             app_id = data.get("appId")
 
-            parser = GroqParser(app_id=app_id)
+            parser = _get_parser(app_id or "")
             yaml_content, expectations = parser.parse_and_convert(scenario)
 
             self.send_json({
@@ -223,13 +870,12 @@ class YYTestHandler(SimpleHTTPRequestHandler):
         except Exception as e:
             self.send_json({"error": str(e)}, 500)
 
-    def handle_save_test(self, body: str):
+    def handle_save_test(self, body: bytes):
         """Save a test to disk."""
         try:
-            data = json.loads(body)
-            TESTS_DIR.mkdir(exist_ok=True)
-            
-            test_id = data.get("id") or str(uuid.uuid4())[:8]
+            data = _loads(body)
+
+            test_id = data.get("id") or secrets.token_hex(4)
             test_data = {
                 "id": test_id,
                 "name": data.get("name", f"Test {test_id}"),
@@ -237,116 +883,93 @@ class YYTestHandler(SimpleHTTPRequestHandler):
                 "scenario": data.get("scenario", ""),
                 "yaml": data.get("yaml", ""),
                 "expectations": data.get("expectations", []),
-                "createdAt": datetime.now().isoformat(),
+                "createdAt": _now_iso(),
             }
-            
-            (TESTS_DIR / f"{test_id}.json").write_text(
-                json.dumps(test_data, ensure_ascii=False, indent=2)
-            )
-            
+
+            (TESTS_DIR / f"{test_id}.json").write_bytes(_dumps_indent(test_data))
+
+            # Üzerine yazma dizin mtime'ını değiştirmez; cache'i elle düşür
+            global _tests_cache
+            _tests_cache = (None, None)
+
             self.send_json({"success": True, "test": test_data})
         except Exception as e:
             self.send_json({"error": str(e)}, 500)
 
-    def handle_run(self, body: str):
+    def handle_run(self, body: bytes):
         """Run a single test."""
         try:
-            data = json.loads(body)
+            data = _loads(body)
             yaml_content = data.get("yaml", "")
             device_id = data.get("deviceId")
             app_id = data.get("appId", "")
             test_name = data.get("name", "test")
-            
+
             if not yaml_content:
                 self.send_json({"error": "YAML içeriği gerekli"}, 400)
                 return
-            
+
             # Create run ID
-            run_id = str(uuid.uuid4())[:8]
-            
-            # Start test in background
-            thread = threading.Thread(
-                target=run_test_background,
-                args=(run_id, yaml_content, device_id, app_id, test_name)
+            run_id = secrets.token_hex(4)
+
+            # Önce kaydet, sonra başlat: worker haritada kendini bulabilsin
+            _register_run(run_id, _new_run(run_id, test_name))
+
+            _RUN_POOL.submit(
+                run_test_background, run_id, yaml_content, device_id, app_id, test_name
             )
-            thread.start()
-            
-            test_runs[run_id] = {
-                "id": run_id,
-                "name": test_name,
-                "status": "running",
-                "startedAt": datetime.now().isoformat(),
-                "steps": [],
-            }
-            
+
             self.send_json({"success": True, "runId": run_id})
         except Exception as e:
             self.send_json({"error": str(e)}, 500)
 
-    def handle_run_suite(self, body: str):
+    def handle_run_suite(self, body: bytes):
         """Run multiple tests as a suite."""
         try:
-            data = json.loads(body)
+            data = _loads(body)
             test_ids = data.get("testIds", [])
-            device_id = data.get("deviceId")
-            
+            # Tek cihaz (string) veya çoklu cihaz (liste) kabul edilir
+            device_id = data.get("deviceIds") or data.get("deviceId")
+
             if not test_ids:
                 self.send_json({"error": "Test ID'leri gerekli"}, 400)
                 return
-            
-            suite_id = str(uuid.uuid4())[:8]
-            
-            # Start suite in background
-            thread = threading.Thread(
-                target=run_suite_background,
-                args=(suite_id, test_ids, device_id)
-            )
-            thread.start()
-            
-            test_runs[suite_id] = {
-                "id": suite_id,
-                "name": f"Suite ({len(test_ids)} test)",
-                "status": "running",
-                "type": "suite",
-                "testIds": test_ids,
-                "startedAt": datetime.now().isoformat(),
-                "results": [],
-            }
-            
+
+            suite_id = secrets.token_hex(4)
+
+            _register_run(suite_id, _new_run(
+                suite_id, f"Suite ({len(test_ids)} test)",
+                type="suite", testIds=test_ids, results=[], completed=0,
+            ))
+
+            _RUN_POOL.submit(run_suite_background, suite_id, test_ids, device_id)
+
             self.send_json({"success": True, "suiteId": suite_id})
         except Exception as e:
             self.send_json({"error": str(e)}, 500)
 
-    def handle_start_emulator(self, body: str):
+    def handle_start_emulator(self, body: bytes):
         """Start an emulator (Android or iOS)."""
         try:
-            data = json.loads(body)
+            data = _loads(body)
             device_id = data.get("id") or data.get("name")
             platform = data.get("platform", "android")
-            
+
             if not device_id:
                 self.send_json({"error": "Cihaz ID gerekli"}, 400)
                 return
-            
+
             if platform == "ios":
-                # Extract actual device ID
-                if device_id.startswith("ios:"):
-                    device_id = device_id.replace("ios:", "")
-                
                 # Boot iOS simulator
                 ios = iOSDevice()
-                ios.boot_device(device_id)
+                ios.boot_device(_split_device_id(device_id)[1])
                 self.send_json({"success": True, "message": "iOS simulator başlatılıyor..."})
             else:
                 # Android emulator
-                if device_id.startswith("android:"):
-                    avd_name = device_id.replace("android:", "")
-                else:
-                    avd_name = device_id
-                
-                emulator_path = os.path.expanduser("~/Library/Android/sdk/emulator/emulator")
+                avd_name = _split_device_id(device_id)[1]
+
                 subprocess.Popen(
-                    [emulator_path, "-avd", avd_name, "-no-snapshot-load"],
+                    [EMULATOR_BIN, "-avd", avd_name, "-no-snapshot-load"],
                     stdout=subprocess.DEVNULL,
                     stderr=subprocess.DEVNULL
                 )
@@ -354,34 +977,40 @@ class YYTestHandler(SimpleHTTPRequestHandler):
         except Exception as e:
             self.send_json({"error": str(e)}, 500)
 
-    def handle_self_heal(self, body: str):
+    def handle_self_heal(self, body: bytes):
         """Start self-healing test run."""
         try:
-            data = json.loads(body)
+            data = _loads(body)
             yaml_content = data.get("yaml", "")
             device_id = data.get("deviceId", "")
             app_id = data.get("appId", "")
             test_name = data.get("testName", "Self-Healing Test")
             max_retries = data.get("maxRetries", 5)
-            
+
             if not yaml_content:
                 self.send_json({"error": "YAML içeriği gerekli"}, 400)
                 return
-            
+
             if not device_id:
                 self.send_json({"error": "Cihaz seçimi gerekli"}, 400)
                 return
-            
-            run_id = str(uuid.uuid4())[:8]
-            
-            # Background thread'de çalıştır
-            thread = threading.Thread(
-                target=run_self_healing_test_background,
-                args=(run_id, yaml_content, device_id, app_id, test_name, max_retries),
-                daemon=True
+
+            run_id = secrets.token_hex(4)
+
+            # Önce kaydet, sonra başlat: havuz doluyken submit kuyrukta
+            # beklese bile runId listelerde ve /api/runs/<id>'de görünür
+            _register_run(run_id, _new_run(
+                run_id, test_name,
+                retries=[], currentRetry=0, maxRetries=max_retries, finalYamlPath=None,
+            ))
+
+            # Background havuzunda çalıştır
+            _RUN_POOL.submit(
+                run_self_healing_test_background,
+                run_id, yaml_content, device_id, app_id, test_name, max_retries,
             )
-            thread.start()
-            
+
+
             self.send_json({
                 "success": True,
                 "runId": run_id,
@@ -390,38 +1019,93 @@ class YYTestHandler(SimpleHTTPRequestHandler):
         except Exception as e:
             self.send_json({"error": str(e)}, 500)
 
+    def send_runs_stats(self):
+        """Koşu haritası doluluk/eviction sayaçları (gözlemlenebilirlik)."""
+        with _runs_lock:
+            count = len(test_runs)
+            evicted = _runs_evicted
+        self.send_json({"count": count, "max": _RUNS_MAX, "evicted": evicted})
+
+    def send_run_yaml(self, run_id: str):
+        """Koşunun final YAML'ını diskten servis et; bellekte sadece yol durur."""
+        with _runs_lock:
+            path = test_runs.get(run_id, {}).get("finalYamlPath")
+        if not path:
+            self.send_error(404)
+            return
+        try:
+            body = Path(path).read_bytes()
+        except OSError:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/yaml; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_dashboard_css(self):
+        # URL içerik hash'i taşıdığından gövde hiç değişmez: immutable cache
+        body = _DASHBOARD_CSS
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/css; charset=utf-8')
+        self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+        self.send_header('Vary', 'Accept-Encoding')
+        if 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+            body = _DASHBOARD_CSS_GZ
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
     def send_dashboard(self):
-        html = get_dashboard_html()
+        # HTML, gzip'i ve ETag'i import'ta hazırlandı; burada sadece seç-gönder
+        if self.headers.get('If-None-Match') == _DASHBOARD_ETAG:
+            self.send_response(304)
+            self.send_header('ETag', _DASHBOARD_ETAG)
+            self.end_headers()
+            return
+        body = _DASHBOARD_HTML_BYTES
         self.send_response(200)
         self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', _DASHBOARD_ETAG)
+        self.send_header('Cache-Control', 'public, max-age=60')
+        self.send_header('Vary', 'Accept-Encoding')
+        accepted = self.headers.get('Accept-Encoding') or ''
+        if _DASHBOARD_HTML_BR is not None and 'br' in accepted:
+            body = _DASHBOARD_HTML_BR
+            self.send_header('Content-Encoding', 'br')
+        elif 'gzip' in accepted:
+            body = _DASHBOARD_HTML_GZ
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(html.encode('utf-8'))
+        # 16 KiB dilimler halinde yaz: ilk dilim gövdenin kalanını beklemeden
+        # socket'e düşer (wfile tamponsuz), TTFB kernel send-buffer'ıyla örtüşür
+        view = memoryview(body)
+        for i in range(0, len(view), 16384):
+            self.wfile.write(view[i:i + 16384])
 
 
 def run_test_background(run_id: str, yaml_content: str, device_id: str, app_id: str, test_name: str):
     """Run test in background thread."""
-    import tempfile
-    import time
-    
+    # Suite koşuları bu fonksiyonu doğrudan çağırır; kayıt yoksa oluştur
+    with _runs_lock:
+        if run_id not in test_runs:
+            _register_run(run_id, _new_run(run_id, test_name))
+
     try:
-        # Create temp YAML file
-        RESULTS_DIR.mkdir(exist_ok=True)
+        # Create temp YAML file (run_id taze olduğundan exist_ok gerekmez)
         test_dir = RESULTS_DIR / run_id
-        test_dir.mkdir(exist_ok=True)
-        
+        os.mkdir(test_dir)
+
+
         yaml_file = test_dir / "test.yaml"
         yaml_file.write_text(yaml_content)
-        
+
         # Detect platform from device_id
-        platform = "android"
-        actual_device_id = device_id
-        if device_id.startswith("android:"):
-            actual_device_id = device_id.replace("android:", "")
-            platform = "android"
-        elif device_id.startswith("ios:"):
-            actual_device_id = device_id.replace("ios:", "")
-            platform = "ios"
-        
+        platform, actual_device_id = _split_device_id(device_id)
+
         # Initialize device objects
         ios_device = None
         adb = None
@@ -429,196 +1113,126 @@ def run_test_background(run_id: str, yaml_content: str, device_id: str, app_id:
             ios_device = iOSDevice(actual_device_id)
         else:
             adb = ADBDevice(actual_device_id)
-        
+
         # Take before screenshot
         try:
             if platform == "ios":
                 before_shot = ios_device.screenshot(test_dir, 0, "before")
             else:
                 before_shot = adb.screenshot(test_dir, 0, "before")
-            test_runs[run_id]["beforeScreenshot"] = str(before_shot.path)
+            with _runs_lock:
+                test_runs[run_id]["beforeScreenshot"] = str(before_shot.path)
+            _notify_runs_changed()
         except Exception as e:
             print(f"Screenshot error: {e}")
-        
+
         # Run Maestro
-        maestro_path = os.path.expanduser("~/.maestro/bin/maestro")
-        cmd = [maestro_path, "test", str(yaml_file)]
-        
+        cmd = [MAESTRO_BIN, "test", str(yaml_file)]
+
         env = os.environ.copy()
-        
-        android_emulator_info = []  # (port, avd_name) tuples
-        
-        if platform == "ios" and actual_device_id:
-            # iOS için: iOS simulator'ün booted olduğundan emin ol
-            try:
-                if ios_device is None:
-                    ios_device = iOSDevice(actual_device_id)
-                booted = ios_device.get_booted_devices()
-                if actual_device_id not in booted:
-                    print(f"Booting iOS simulator {actual_device_id}...")
-                    ios_device.boot_device(actual_device_id)
-                    import time
-                    time.sleep(5)  # Boot için bekle
-                
-                # iOS için: Android emulator'leri geçici olarak kapat
-                # (Maestro önce Android'i seçiyor, iOS için bunu önlemek lazım)
-                try:
-                    # Önce mevcut Android emulator'leri kontrol et
-                    adb_check = subprocess.run(
-                        ["adb", "devices"],
-                        capture_output=True,
-                        text=True,
-                        timeout=3
-                    )
-                    android_count = sum(1 for line in adb_check.stdout.split('\n') if 'emulator' in line and 'device' in line)
-                    print(f"Found {android_count} Android emulator(s) - closing for iOS test...")
-                    
-                    # AVD listesini al (emulator'leri tekrar başlatmak için)
-                    emulator_path = os.path.expanduser("~/Library/Android/sdk/emulator/emulator")
-                    avd_result = subprocess.run(
-                        [emulator_path, "-list-avds"],
-                        capture_output=True,
-                        text=True,
-                        timeout=3
-                    )
-                    avd_list = [line.strip() for line in avd_result.stdout.strip().split('\n') if line.strip()]
-                    
-                    # Tüm emulator process'lerini kapat (daha agresif)
-                    kill_result = subprocess.run(
-                        ["pkill", "-9", "-f", "emulator"],
-                        capture_output=True,
-                        timeout=2
-                    )
-                    print(f"Killed emulator processes (return code: {kill_result.returncode})")
-                    
-                    # ADB server'ı restart et
-                    subprocess.run(
-                        ["adb", "kill-server"],
-                        capture_output=True,
-                        timeout=2
-                    )
-                    import time
-                    time.sleep(2)  # Daha uzun bekle
-                    subprocess.run(
-                        ["adb", "start-server"],
-                        capture_output=True,
-                        timeout=5
-                    )
-                    time.sleep(1)
-                    
-                    # Android emulator'lerin kapandığını doğrula
-                    adb_verify = subprocess.run(
-                        ["adb", "devices"],
-                        capture_output=True,
-                        text=True,
-                        timeout=3
-                    )
-                    android_after = sum(1 for line in adb_verify.stdout.split('\n') if 'emulator' in line and 'device' in line)
-                    print(f"Android emulators after close: {android_after} (should be 0)")
-                    
-                    # AVD bilgilerini kaydet (tekrar başlatmak için)
-                    for avd in avd_list:
-                        android_emulator_info.append(("unknown", avd))
-                    
-                    print(f"✅ Android emulator'ler kapatıldı ({len(avd_list)} AVD) - iOS test için hazır")
-                except Exception as e:
-                    print(f"❌ Could not stop Android: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    
-            except Exception as e:
-                print(f"iOS simulator setup error: {e}")
-        
-        # iOS için Android emulator'leri kapatıldıktan sonra biraz bekle
-        if platform == "ios" and android_emulator_info:
-            import time
-            time.sleep(3)  # Android emulator'lerin tamamen kapanmasını bekle
-        
-        # Maestro testini çalıştır
-        print(f"Running Maestro test on {platform} device: {actual_device_id}")
-        result = subprocess.run(cmd, capture_output=True, text=True, env=env, timeout=300)
-        
-        # Android emulator'leri tekrar başlat (eğer kapatıldıysa)
-        if android_emulator_info:
-            import time
-            time.sleep(2)  # Test bitmesini bekle
-            for port, avd_name in android_emulator_info:
-                try:
-                    # Emulator'ü tekrar başlat
-                    emulator_path = os.path.expanduser("~/Library/Android/sdk/emulator/emulator")
-                    subprocess.Popen(
-                        [emulator_path, "-avd", avd_name, "-no-snapshot-load"],
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.DEVNULL
-                    )
-                    print(f"Android emulator {avd_name} restarting...")
-                except Exception as e:
-                    print(f"Could not restart Android emulator: {e}")
-        
+
+        # Maestro testini çalıştır (iOS'ta ortam hazırlığı context manager'da).
+        # Stdout satır satır okunur: adımlar biter bitmez test_runs'a düşer.
+        with _prepare_environment(platform, actual_device_id, ios_device):
+            print(f"Running Maestro test on {platform} device: {actual_device_id}")
+            returncode, stdout, stderr, steps = asyncio.run(
+                _run_maestro_streaming(cmd, env, run_id)
+            )
+
         # Take after screenshot
         try:
             if platform == "ios":
                 after_shot = ios_device.screenshot(test_dir, 1, "after")
             else:
                 after_shot = adb.screenshot(test_dir, 1, "after")
-            test_runs[run_id]["afterScreenshot"] = str(after_shot.path)
+            with _runs_lock:
+                test_runs[run_id]["afterScreenshot"] = str(after_shot.path)
+            _notify_runs_changed()
         except Exception as e:
             print(f"Screenshot error: {e}")
-        
-        # Parse result
-        passed = result.returncode == 0
-        steps = []
-        for line in result.stdout.split('\n'):
-            if 'COMPLETED' in line:
-                steps.append({"action": line.strip(), "status": "passed"})
-            elif 'FAILED' in line:
-                steps.append({"action": line.strip(), "status": "failed"})
-        
+
+        # Parse result (adımlar stream sırasında toplandı)
+        passed = returncode == 0
+
         # Update run status
-        test_runs[run_id].update({
-            "status": "passed" if passed else "failed",
-            "finishedAt": datetime.now().isoformat(),
-            "steps": steps,
-            "output": result.stdout,
-            "error": result.stderr if not passed else None,
-        })
-        
-        # Save result
-        result_data = test_runs[run_id].copy()
+        with _runs_lock:
+            test_runs[run_id].update({
+                "status": "passed" if passed else "failed",
+                "finishedAt": _now_iso(),
+                "steps": steps,
+                "output": stdout,
+                "error": stderr if not passed else None,
+            })
+            result_data = test_runs[run_id].copy()
+        _notify_runs_changed()
+        _signal_run_done(run_id)
         result_data["yaml"] = yaml_content
-        (test_dir / "result.json").write_text(
-            json.dumps(result_data, ensure_ascii=False, indent=2, default=str)
-        )
-        
+        _WRITE_Q.put((test_dir / "result.json", _dumps_indent(result_data)))
+
     except Exception as e:
-        import traceback
         error_msg = str(e)
         error_trace = traceback.format_exc()
         print(f"❌ Test execution error: {error_msg}")
         print(error_trace)
-        test_runs[run_id].update({
-            "status": "error",
-            "error": error_msg,
-            "finishedAt": datetime.now().isoformat(),
-        })
-        # Result dosyasına da kaydet
+        with _runs_lock:
+            test_runs[run_id].update({
+                "status": "error",
+                "error": error_msg,
+                "finishedAt": _now_iso(),
+            })
+            result_data = test_runs[run_id].copy()
+        _notify_runs_changed()
+        _signal_run_done(run_id)
+        # Result dosyasına da kaydet (dizin try bloğunda oluşmuş olabilir)
         try:
-            RESULTS_DIR.mkdir(exist_ok=True)
             test_dir = RESULTS_DIR / run_id
             test_dir.mkdir(exist_ok=True)
-            result_data = test_runs[run_id].copy()
-            (test_dir / "result.json").write_text(
-                json.dumps(result_data, ensure_ascii=False, indent=2, default=str)
-            )
+            _WRITE_Q.put((test_dir / "result.json", _dumps_indent(result_data)))
         except:
             pass
 
 
+# Groq API istemcisi: keep-alive bağlantı kurulumunu (TLS + DNS) retry'lar
+# arasında amorti eder; curl fork+exec'i her çağrıda bunların hepsini öderdi
+_groq_client: Optional["httpx.Client"] = None
+_groq_lock = threading.Lock()
+
+# Aynı (yaml, hata) çifti için tekrar API'ye gitme: self-healing döngüsü
+# deterministik olarak aynı hatayı üretirse cache'lenmiş düzeltmeye dön
+_fix_cache: OrderedDict = OrderedDict()
+_FIX_CACHE_MAX = 16
+
+
+def _get_groq_client():
+    global _groq_client
+    import httpx
+
+    with _groq_lock:
+        if _groq_client is None or _groq_client.is_closed:
+            _groq_client = httpx.Client(
+                base_url="https://api.groq.com/openai/v1",
+                timeout=30.0,
+                headers={"Content-Type": "application/json"},
+                limits=httpx.Limits(max_keepalive_connections=2, keepalive_expiry=60),
+            )
+        return _groq_client
+
+
 def analyze_and_fix_test(yaml_content: str, error_log: str, app_id: str) -> str:
     """Analyze test failure and fix the YAML using AI."""
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        return yaml_content  # API key yoksa orijinal YAML'ı döndür
+
+    cache_key = hashlib.blake2b(
+        f"{yaml_content}\x00{error_log[:2000]}".encode("utf-8"), digest_size=16
+    ).digest()
+    cached = _fix_cache.get(cache_key)
+    if cached is not None:
+        _fix_cache.move_to_end(cache_key)
+        return cached
+
     try:
-        parser = GroqParser(app_id=app_id)
-        
         prompt = f"""Sen bir mobil test uzmanısın. Aşağıdaki Maestro test senaryosu başarısız oldu. Hata loglarını inceleyip test adımlarını düzelt.
 
 MEVCUT TEST YAML:
@@ -637,29 +1251,25 @@ Sadece düzeltilmiş YAML'ı döndür, açıklama yapma. Yorum satırları ekle
 """
 
         # Groq API ile düzeltilmiş YAML'ı al
-        import subprocess as sp
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
-            return yaml_content  # API key yoksa orijinal YAML'ı döndür
-        
-        cmd = [
-            "curl", "-s", "-X", "POST", "https://api.groq.com/openai/v1/chat/completions",
-            "-H", "Content-Type: application/json",
-            "-H", f"Authorization: Bearer {api_key}",
-            "-d", json.dumps({
+        response = _get_groq_client().post(
+            "/chat/completions",
+            headers={"Authorization": f"Bearer {api_key}"},
+            content=_dumps({
                 "model": "llama-3.3-70b-versatile",
                 "messages": [{"role": "user", "content": prompt}],
                 "max_tokens": 2000,
-            })
-        ]
-        
-        result = sp.run(cmd, capture_output=True, text=True, check=True, timeout=30)
-        response_json = json.loads(result.stdout)
-        fixed_yaml = response_json["choices"][0]["message"]["content"]
-        
+            }),
+        )
+        response.raise_for_status()
+        fixed_yaml = response.json()["choices"][0]["message"]["content"]
+
         # Markdown code blocks'ları temizle
         fixed_yaml = fixed_yaml.replace("```yaml", "").replace("```", "").strip()
-        
+
+        _fix_cache[cache_key] = fixed_yaml
+        while len(_fix_cache) > _FIX_CACHE_MAX:
+            _fix_cache.popitem(last=False)
+
         return fixed_yaml
     except Exception as e:
         print(f"AI fix failed: {e}")
@@ -668,205 +1278,247 @@ Sadece düzeltilmiş YAML'ı döndür, açıklama yapma. Yorum satırları ekle
 
 def run_self_healing_test_background(run_id: str, yaml_content: str, device_id: str, app_id: str, test_name: str, max_retries: int = 5):
     """Run test with self-healing - automatically fix and retry on failure."""
-    import time
-    
-    test_runs[run_id] = {
-        "id": run_id,
-        "name": test_name,
-        "status": "running",
-        "startedAt": datetime.now().isoformat(),
-        "retries": [],
-        "currentRetry": 0,
-        "maxRetries": max_retries,
-    }
-    
+    # Kayıt handler'da submit'ten önce yapıldı; doğrudan çağrılırsa oluştur
+    with _runs_lock:
+        if run_id not in test_runs:
+            _register_run(run_id, _new_run(
+                run_id, test_name,
+                retries=[], currentRetry=0, maxRetries=max_retries, finalYamlPath=None,
+            ))
+
     current_yaml = yaml_content
     retry_count = 0
-    
-    while retry_count < max_retries:
-        retry_id = f"{run_id}_retry_{retry_count}"
-        test_runs[run_id]["currentRetry"] = retry_count
-        
-        # Test çalıştır
-        try:
-            # Create temp YAML file
-            RESULTS_DIR.mkdir(exist_ok=True)
-            test_dir = RESULTS_DIR / retry_id
-            test_dir.mkdir(exist_ok=True)
-            
-            yaml_file = test_dir / "test.yaml"
-            yaml_file.write_text(current_yaml)
-            
-            # Detect platform
-            platform = "android"
-            actual_device_id = device_id
-            if device_id.startswith("android:"):
-                actual_device_id = device_id.replace("android:", "")
-                platform = "android"
-            elif device_id.startswith("ios:"):
-                actual_device_id = device_id.replace("ios:", "")
-                platform = "ios"
-            
-            # Initialize devices
-            ios_device = None
-            adb = None
-            if platform == "ios":
-                ios_device = iOSDevice(actual_device_id)
-            else:
-                adb = ADBDevice(actual_device_id)
-            
-            # Android emulator handling for iOS
-            android_emulator_info = []
-            if platform == "ios" and actual_device_id:
-                try:
-                    if ios_device is None:
-                        ios_device = iOSDevice(actual_device_id)
-                    booted = ios_device.get_booted_devices()
-                    if actual_device_id not in booted:
-                        ios_device.boot_device(actual_device_id)
-                        time.sleep(5)
-                    
-                    # Close Android emulators
-                    emulator_path = os.path.expanduser("~/Library/Android/sdk/emulator/emulator")
-                    avd_result = subprocess.run(
-                        [emulator_path, "-list-avds"],
-                        capture_output=True,
-                        text=True,
-                        timeout=3
+    platform, actual_device_id = _split_device_id(device_id)
+    env = os.environ.copy()
+
+    # Ortam hazırlığı (iOS boot + Android emulator kapatma) retry başına
+    # değil, tüm döngü için bir kez yapılır; emulator'ler son retry'dan
+    # sonra geri açılır. Maestro'nun kendisi daemon/stdin modu sunmadığı
+    # için JVM açılışı invocation başına kalır.
+    with contextlib.ExitStack() as env_stack:
+        env_prepared = False
+
+        while retry_count < max_retries:
+            retry_id = f"{run_id}_retry_{retry_count}"
+            with _runs_lock:
+                test_runs[run_id]["currentRetry"] = retry_count
+            _notify_runs_changed()
+
+            # Test çalıştır
+            try:
+                # Create temp YAML file (retry_id taze olduğundan exist_ok gerekmez)
+                test_dir = RESULTS_DIR / retry_id
+                os.mkdir(test_dir)
+
+                yaml_file = test_dir / "test.yaml"
+                yaml_file.write_text(current_yaml)
+
+                # Initialize devices
+                ios_device = None
+                adb = None
+                if platform == "ios":
+                    ios_device = iOSDevice(actual_device_id)
+                else:
+                    adb = ADBDevice(actual_device_id)
+
+                if not env_prepared:
+                    env_stack.enter_context(
+                        _prepare_environment(platform, actual_device_id, ios_device)
                     )
-                    avd_list = [line.strip() for line in avd_result.stdout.strip().split('\n') if line.strip()]
-                    
-                    subprocess.run(["pkill", "-9", "-f", "emulator"], capture_output=True, timeout=2)
-                    subprocess.run(["adb", "kill-server"], capture_output=True, timeout=2)
-                    time.sleep(2)
-                    subprocess.run(["adb", "start-server"], capture_output=True, timeout=5)
-                    time.sleep(1)
-                    
-                    for avd in avd_list:
-                        android_emulator_info.append(("unknown", avd))
-                except Exception as e:
-                    print(f"iOS setup error: {e}")
-            
-            if platform == "ios" and android_emulator_info:
-                time.sleep(3)
-            
-            # Run Maestro
-            maestro_path = os.path.expanduser("~/.maestro/bin/maestro")
-            cmd = [maestro_path, "test", str(yaml_file)]
-            env = os.environ.copy()
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, env=env, timeout=300)
-            
-            # Restart Android emulators if needed
-            if android_emulator_info:
-                time.sleep(2)
-                for port, avd_name in android_emulator_info:
-                    try:
-                        emulator_path = os.path.expanduser("~/Library/Android/sdk/emulator/emulator")
-                        subprocess.Popen(
-                            [emulator_path, "-avd", avd_name, "-no-snapshot-load"],
-                            stdout=subprocess.DEVNULL,
-                            stderr=subprocess.DEVNULL
-                        )
-                    except:
-                        pass
-            
-            passed = result.returncode == 0
-            
-            retry_result = {
-                "retry": retry_count,
-                "status": "passed" if passed else "failed",
-                "output": result.stdout,
-                "error": result.stderr if not passed else None,
-                "yaml": current_yaml,
-            }
-            
-            test_runs[run_id]["retries"].append(retry_result)
-            
-            if passed:
-                # Test başarılı!
-                test_runs[run_id].update({
-                    "status": "passed",
-                    "finishedAt": datetime.now().isoformat(),
-                    "finalYaml": current_yaml,
-                })
-                return
-            
-            # Test başarısız - AI ile düzelt
-            if retry_count < max_retries - 1:
-                error_log = result.stderr or result.stdout
-                print(f"🔄 Retry {retry_count + 1}/{max_retries}: Analyzing failure and fixing...")
-                fixed_yaml = analyze_and_fix_test(current_yaml, error_log, app_id)
-                current_yaml = fixed_yaml
-                retry_count += 1
-                time.sleep(2)  # Kısa bir bekleme
-            else:
-                # Max retry'a ulaşıldı
-                test_runs[run_id].update({
-                    "status": "failed",
-                    "finishedAt": datetime.now().isoformat(),
-                    "finalYaml": current_yaml,
-                })
+                    env_prepared = True
+
+                cmd = [MAESTRO_BIN, "test", str(yaml_file)]
+                # Normal koşularla aynı streaming exec: adımlar retry
+                # sırasında da canlı akar, thread yine tek subprocess bekler
+                returncode, stdout, stderr, _ = asyncio.run(
+                    _run_maestro_streaming(cmd, env, run_id)
+                )
+
+                passed = returncode == 0
+
+                retry_result = {
+                    "retry": retry_count,
+                    "status": "passed" if passed else "failed",
+                    "output": stdout,
+                    "error": stderr if not passed else None,
+                    "yaml": current_yaml,
+                }
+
+                with _runs_lock:
+                    test_runs[run_id]["retries"].append(retry_result)
+                _notify_runs_changed()
+
+                if passed:
+                    # Test başarılı! YAML diske gider, bellekte sadece yol kalır
+                    final_path = RESULTS_DIR / f"{run_id}.final.yaml"
+                    _WRITE_Q.put((final_path, current_yaml.encode("utf-8")))
+                    # Tek atomik rebind: okuyucular ya eski ya yeni kaydı
+                    # görür, yarı yazılmış durum asla
+                    with _runs_lock:
+                        test_runs[run_id] = {
+                            **test_runs[run_id],
+                            "finishedAt": _now_iso(),
+                            "finalYamlPath": str(final_path),
+                            "status": "passed",
+                        }
+                    _notify_runs_changed()
+                    _signal_run_done(run_id)
+                    return
+
+                # Test başarısız - AI ile düzelt
+                if retry_count < max_retries - 1:
+                    error_log = stderr or stdout
+                    print(f"🔄 Retry {retry_count + 1}/{max_retries}: Analyzing failure and fixing...")
+                    fixed_yaml = analyze_and_fix_test(current_yaml, error_log, app_id)
+                    current_yaml = fixed_yaml
+                    retry_count += 1
+                    # Kısa bekleme; cancel Event'i set edilirse anında uyan
+                    cancel = _run_events.get(run_id, {}).get("cancel")
+                    if cancel is not None and cancel.wait(2):
+                        with _runs_lock:
+                            test_runs[run_id] = {
+                                **test_runs[run_id],
+                                "finishedAt": _now_iso(),
+                                "error": "cancelled",
+                                "status": "error",
+                            }
+                        _notify_runs_changed()
+                        _signal_run_done(run_id)
+                        return
+                    if cancel is None:
+                        time.sleep(2)
+                else:
+                    # Max retry'a ulaşıldı; son denenen YAML yine diske
+                    final_path = RESULTS_DIR / f"{run_id}.final.yaml"
+                    _WRITE_Q.put((final_path, current_yaml.encode("utf-8")))
+                    with _runs_lock:
+                        test_runs[run_id] = {
+                            **test_runs[run_id],
+                            "finishedAt": _now_iso(),
+                            "finalYamlPath": str(final_path),
+                            "status": "failed",
+                        }
+                    _notify_runs_changed()
+                    _signal_run_done(run_id)
+                    return
+
+            except Exception as e:
+                error_msg = str(e)
+                print(f"❌ Self-healing test error: {error_msg}")
+                with _runs_lock:
+                    test_runs[run_id] = {
+                        **test_runs[run_id],
+                        "finishedAt": _now_iso(),
+                        "error": error_msg,
+                        "status": "error",
+                    }
+                _notify_runs_changed()
+                _signal_run_done(run_id)
                 return
-                
-        except Exception as e:
-            import traceback
-            error_msg = str(e)
-            print(f"❌ Self-healing test error: {error_msg}")
-            test_runs[run_id].update({
-                "status": "error",
-                "error": error_msg,
-                "finishedAt": datetime.now().isoformat(),
-            })
-            return
 
 
 def run_suite_background(suite_id: str, test_ids: list, device_id: str):
     """Run test suite in background."""
+    # Cihaz listesi: tek string gelirse tek kuyruk, liste gelirse testler
+    # cihazlara round-robin dağıtılır. Her cihazın kuyruğu kendi içinde
+    # sıralı koşar (aynı cihazda iki Maestro çakışmasın), kuyruklar arası
+    # paralel — K testlik suite D cihazda toplam yerine max-per-device sürer.
+    devices = device_id if isinstance(device_id, list) else [device_id]
+    device_queues: dict = defaultdict(list)
+    for i, test_id in enumerate(test_ids):
+        device_queues[devices[i % len(devices)]].append(test_id)
+
+    # Dizin bir kez taranır: test başına exists() + stat() çifti yerine
+    # DirEntry'nin readdir'den cache'lenmiş stat'ı hem varlık kontrolü hem
+    # cache anahtarı (mtime) olarak kullanılır
+    try:
+        with os.scandir(TESTS_DIR) as it:
+            entries = {e.name[:-5]: e for e in it if e.name.endswith(".json")}
+    except OSError:
+        entries = {}
+
     results = []
-    
-    for test_id in test_ids:
-        test_file = TESTS_DIR / f"{test_id}.json"
-        if not test_file.exists():
-            results.append({"testId": test_id, "status": "not_found"})
-            continue
-        
-        test_data = json.loads(test_file.read_text())
-        
-        # Run individual test
+    results_lock = threading.Lock()
+    # Tek geçişte toplanan sayaç: sonda listeyi yeniden taramak yerine
+    # her sonuç eklendiğinde güncellenir
+    n_passed = 0
+
+    def _run_one(dev, test_id):
+        entry = entries.get(test_id)
+        if entry is None:
+            return {"testId": test_id, "status": STATUS_NOT_FOUND}
+
+        # mtime anahtarlı cache: tekrar koşulan suite'lerde parse atlanır
+        test_data = _load_test_cached(entry.path, entry.stat().st_mtime_ns)
+
+        # Run individual test (bu thread'de senkron koşar)
         run_id = f"{suite_id}_{test_id}"
         run_test_background(
             run_id,
             test_data.get("yaml", ""),
-            device_id,
+            dev,
             test_data.get("appId", ""),
             test_data.get("name", test_id)
         )
-        
-        # Wait for completion
-        import time
-        while test_runs.get(run_id, {}).get("status") == "running":
-            time.sleep(0.5)
-        
-        results.append({
+
+        # done Event'i koşu sonunda set edilmiş olmalı; 330s = Maestro'nun
+        # 300s bütçesi + hazırlık payı, Event kaybolursa süresiz asılı kalma
+        events = _run_events.get(run_id)
+        if events is not None:
+            events["done"].wait(timeout=330)
+        with _runs_lock:
+            status = test_runs.get(run_id, {}).get("status")
+        if status == STATUS_RUNNING:
+            status = STATUS_TIMEOUT
+
+        return {
             "testId": test_id,
             "name": test_data.get("name"),
-            "status": test_runs.get(run_id, {}).get("status", "unknown"),
+            "status": status or STATUS_UNKNOWN,
+        }
+
+    def _run_device_queue(dev, queue_ids):
+        nonlocal n_passed
+        for test_id in queue_ids:
+            entry = _run_one(dev, test_id)
+            with results_lock:
+                results.append(entry)
+                if entry["status"] == STATUS_PASSED:
+                    n_passed += 1
+                n_done = len(results)
+            # İlerleme int sayaç olarak yayınlanır; aynı liste nesnesini her
+            # turda yeniden bağlamak okuyucuları boşuna uyandırıyordu.
+            # results listesi tek sefer, suite kapanırken yayımlanır.
+            with _runs_lock:
+                test_runs[suite_id]["completed"] = n_done
+            _notify_runs_changed()
+
+    # Cihaz başına bir worker; suite'in kendi _RUN_POOL slotunu işgal edip
+    # deadlock'a yol açmamak için kısa ömürlü yerel havuz kullanılır
+    with ThreadPoolExecutor(
+        max_workers=len(device_queues), thread_name_prefix="yysuite"
+    ) as ex:
+        futures = [
+            ex.submit(_run_device_queue, dev, queue_ids)
+            for dev, queue_ids in device_queues.items()
+        ]
+        for future in as_completed(futures):
+            future.result()
+
+    # Update suite status (sayaç toplandı; listeyi yeniden taramaya gerek yok)
+    all_passed = n_passed == len(test_ids)
+    with _runs_lock:
+        test_runs[suite_id].update({
+            "status": "passed" if all_passed else "failed",
+            "finishedAt": _now_iso(),
+            "results": results,
         })
-        
-        test_runs[suite_id]["results"] = results
-    
-    # Update suite status
-    all_passed = all(r.get("status") == "passed" for r in results)
-    test_runs[suite_id].update({
-        "status": "passed" if all_passed else "failed",
-        "finishedAt": datetime.now().isoformat(),
-        "results": results,
-    })
+    _notify_runs_changed()
 
 
-def get_dashboard_html() -> str:
-    return '''<!DOCTYPE html>
+# Dashboard HTML'i: fonksiyon gövdesinde her çağrıda yeniden kurulan
+# dev literal yerine import'ta bir kez oluşan modül sabiti
+_DASHBOARD_HTML = '''<!DOCTYPE html>
 <html lang="tr">
 <head>
     <meta charset="UTF-8">
@@ -1658,11 +2310,10 @@ def get_dashboard_html() -> str:
 
                 <div class="card">
                     <div class="card-body">
-                        <div class="test-list" id="saved-tests-list">
-                            <div class="empty-state">
-                                <div class="empty-state-icon">📋</div>
-                                <p>Henüz kayıtlı test yok</p>
-                            </div>
+                        <div class="test-list" id="saved-tests-list" hidden></div>
+                        <div class="empty-state" id="saved-tests-list-empty">
+                            <div class="empty-state-icon">📋</div>
+                            <p>Henüz kayıtlı test yok</p>
                         </div>
                     </div>
                 </div>
@@ -1679,11 +2330,10 @@ def get_dashboard_html() -> str:
                         </button>
                     </div>
                     <div class="card-body">
-                        <div class="test-list" id="suite-tests-list">
-                            <div class="empty-state">
-                                <div class="empty-state-icon">📋</div>
-                                <p>Henüz kayıtlı test yok</p>
-                            </div>
+                        <div class="test-list" id="suite-tests-list" hidden></div>
+                        <div class="empty-state" id="suite-tests-list-empty">
+                            <div class="empty-state-icon">📋</div>
+                            <p>Henüz kayıtlı test yok</p>
                         </div>
                     </div>
                 </div>
@@ -1694,11 +2344,10 @@ def get_dashboard_html() -> str:
 
                 <div class="card">
                     <div class="card-body">
-                        <div id="results-list">
-                            <div class="empty-state">
-                                <div class="empty-state-icon">📊</div>
-                                <p>Henüz test sonucu yok</p>
-                            </div>
+                        <div id="results-list" hidden></div>
+                        <div class="empty-state" id="results-list-empty">
+                            <div class="empty-state-icon">📊</div>
+                            <p>Henüz test sonucu yok</p>
                         </div>
                     </div>
                 </div>
@@ -1709,11 +2358,10 @@ def get_dashboard_html() -> str:
 
                 <div class="card">
                     <div class="card-body">
-                        <div id="running-list">
-                            <div class="empty-state">
-                                <div class="empty-state-icon">⏳</div>
-                                <p>Çalışan test yok</p>
-                            </div>
+                        <div id="running-list" hidden></div>
+                        <div class="empty-state" id="running-list-empty">
+                            <div class="empty-state-icon">⏳</div>
+                            <p>Çalışan test yok</p>
                         </div>
                     </div>
                 </div>
@@ -1764,6 +2412,9 @@ def get_dashboard_html() -> str:
                                     <span class="result-status running" id="self-heal-status-badge">Çalışıyor...</span>
                                     <span class="result-name" id="self-heal-test-name-display"></span>
                                 </div>
+                                <div style="margin-bottom: 1rem;" id="self-heal-retry-counter" hidden>
+                                    <strong></strong>
+                                </div>
                                 <div class="result-steps" id="self-heal-retries-list">
                                     <p>Test başlatılıyor...</p>
                                 </div>
@@ -1775,16 +2426,93 @@ def get_dashboard_html() -> str:
         </main>
     </div>
 
+    <!-- Satır şablonları: render'cılar innerHTML parse'ı yerine klonlar -->
+    <template id="test-row-tpl">
+        <div class="test-item">
+            <input type="checkbox" class="test-checkbox">
+            <div class="test-info">
+                <div class="test-name"></div>
+                <div class="test-meta"></div>
+            </div>
+            <div class="test-actions">
+                <button class="btn btn-secondary" data-action="edit">📝 Düzenle</button>
+                <button class="btn btn-primary" data-action="run">▶️ Çalıştır</button>
+            </div>
+        </div>
+    </template>
+    <template id="result-row-tpl">
+        <div class="result-item">
+            <div class="result-header">
+                <span class="result-status"></span>
+                <span class="result-name"></span>
+                <span class="result-time"></span>
+                <button class="btn btn-secondary" style="margin-left: auto; padding: 0.5rem 1rem; font-size: 0.875rem;" data-action="autofix" hidden>🔧 Auto-Fix</button>
+            </div>
+            <div class="result-steps"></div>
+            <div class="result-error" style="margin-top: 0.5rem; color: var(--error); font-size: 0.875rem;" hidden></div>
+        </div>
+    </template>
+    <template id="running-row-tpl">
+        <div class="result-item">
+            <div class="result-header">
+                <span class="result-status running"><span class="loading"></span> Çalışıyor</span>
+                <span class="result-name"></span>
+                <span class="result-time"></span>
+            </div>
+        </div>
+    </template>
+
     <div class="toast-container" id="toast-container"></div>
 
     <script>
         let currentYaml = '';
         let currentExpectations = [];
         let savedTests = [];
+        // id -> test / id -> run indeksleri: .find ile O(N) tarama yerine
+        // her erişimde O(1) Map lookup'ı
+        let savedTestsById = new Map();
+        const runsById = new Map();
+        // Sonuç id -> sonuç: Auto-Fix payload'ı HTML attribute'üne
+        // serileştirilmek yerine buradan okunur
+        const resultsById = new Map();
         let selectedTestIds = new Set();
 
         // Initialize navigation and other features
         window.initApp = function() {
+            // Satır başına handler bağlamak yerine her liste kapsayıcısında
+            // tek delegeli listener: satır sayısından bağımsız O(1) kurulum
+            for (const listId of ['saved-tests-list', 'suite-tests-list']) {
+                const list = document.getElementById(listId);
+                if (!list) continue;
+                list.addEventListener('click', (e) => {
+                    const btn = e.target.closest('[data-action]');
+                    if (!btn) return;
+                    const row = btn.closest('[data-id]');
+                    if (!row) return;
+                    if (btn.dataset.action === 'edit') {
+                        loadTest(row.dataset.id);
+                    } else if (btn.dataset.action === 'run') {
+                        runSavedTest(row.dataset.id);
+                    }
+                });
+                list.addEventListener('change', (e) => {
+                    if (!e.target.classList.contains('test-checkbox')) return;
+                    const row = e.target.closest('[data-id]');
+                    if (row) toggleTestSelection(row.dataset.id);
+                });
+            }
+
+            // Auto-Fix butonları: payload DOM'da değil resultsById'de
+            const resultsList = document.getElementById('results-list');
+            if (resultsList) {
+                resultsList.addEventListener('click', (e) => {
+                    const btn = e.target.closest('[data-action="autofix"]');
+                    if (!btn) return;
+                    const r = resultsById.get(btn.dataset.id);
+                    if (r) autoFixTest(r.id, r.yaml, r.appId || '');
+                });
+            }
+
             // Navigation
             document.querySelectorAll('.nav-item').forEach(item => {
                 item.addEventListener('click', () => {
@@ -1816,6 +2544,75 @@ def get_dashboard_html() -> str:
             });
         };
 
+        // Stale-while-revalidate fetch cache'i: TTL içinde cache'ten döner,
+        // TTL sonrasında ETag'le revalidate eder (sunucu tüm JSON
+        // yanıtlarına blake2b ETag koyuyor). 304 veya taze cache'te
+        // changed=false döner; render'cılar DOM'a hiç dokunmaz.
+        const swrCache = new Map();
+
+        // URL başına en fazla bir uçan istek: yeni çağrı aynı URL'in
+        // eskisini iptal eder, böylece geciken yanıt taze veriyi ezemez
+        const inflight = new Map();
+        function abortableFetch(url, opts) {
+            const prev = inflight.get(url);
+            if (prev) prev.abort();
+            const ctrl = new AbortController();
+            inflight.set(url, ctrl);
+            return fetch(url, { ...(opts || {}), signal: ctrl.signal })
+                .finally(() => {
+                    if (inflight.get(url) === ctrl) inflight.delete(url);
+                });
+        }
+
+        async function fetchSWR(url, ttlMs) {
+            const now = Date.now();
+            const hit = swrCache.get(url);
+            if (hit && now - hit.ts < ttlMs) {
+                return { data: hit.data, changed: false };
+            }
+            const headers = {};
+            if (hit && hit.etag) headers['If-None-Match'] = hit.etag;
+            let res;
+            try {
+                res = await abortableFetch(url, { headers });
+            } catch (e) {
+                // İptal hata değil: çağıran DOM'a dokunmadan çıksın
+                if (e.name === 'AbortError') {
+                    return { data: hit ? hit.data : null, changed: false, aborted: true };
+                }
+                throw e;
+            }
+            if (res.status === 304 && hit) {
+                hit.ts = now;
+                return { data: hit.data, changed: false };
+            }
+            if (!res.ok) throw new Error(`HTTP ${res.status}`);
+            const data = await res.json();
+            swrCache.set(url, { data, ts: now, etag: res.headers.get('ETag') });
+            return { data, changed: true };
+        }
+
+        // Tarih kolonu: Intl.DateTimeFormat kurulumu pahalı, tek örnek
+        // paylaşılır; aynı ts tekrar tekrar biçimlenmesin diye memoize
+        const DT_FMT = new Intl.DateTimeFormat('tr-TR', { dateStyle: 'short', timeStyle: 'medium' });
+        const dtCache = new Map();
+        // HTML öznitelik/metin kaçışı: sunucudan gelen adlar markup bozmasın
+        function escAttr(v) {
+            return String(v).replace(/&/g, '&amp;').replace(/</g, '&lt;')
+                .replace(/>/g, '&gt;').replace(/"/g, '&quot;');
+        }
+
+        function fmtTime(ts) {
+            if (!ts) return '';
+            let v = dtCache.get(ts);
+            if (v === undefined) {
+                if (dtCache.size > 1000) dtCache.clear();
+                v = DT_FMT.format(new Date(ts));
+                dtCache.set(ts, v);
+            }
+            return v;
+        }
+
         // Toast notifications
         function showToast(message, type = 'info') {
             const toast = document.createElement('div');
@@ -1826,60 +2623,32 @@ def get_dashboard_html() -> str:
         }
 
         // Load devices
+        let devicesRendered = false;
         async function loadDevices() {
             try {
                 const select = document.getElementById('device-select');
                 if (!select) return; // Element not found yet
                 
-                const res = await fetch('/api/emulators');
-                if (!res.ok) {
-                    throw new Error(`HTTP ${res.status}`);
-                }
-                const data = await res.json();
-                
-                select.innerHTML = '<option value="">-- Cihaz Seç --</option>';
-                
-                // Group by platform
-                const androidDevices = [];
-                const iosDevices = [];
-                
-                data.devices?.forEach(device => {
-                    if (device.platform === 'android') {
-                        androidDevices.push(device);
-                    } else if (device.platform === 'ios') {
-                        iosDevices.push(device);
+                const { data, changed, aborted } = await fetchSWR('/api/emulators', 8000);
+                if (aborted) return;
+                if (!changed && devicesRendered) return;
+                devicesRendered = true;
+
+                // Sunucu grupları ve etiketleri hazır gönderir; tüm liste
+                // tek insertAdjacentHTML ile bağımsız bir <select>'e kurulup
+                // replaceWith ile takas edilir (canlı DOM'a tek dokunuş)
+                let html = '<option value="">-- Cihaz Seç --</option>';
+                for (const g of (data.groups || [])) {
+                    html += '<optgroup label="' + escAttr(g.label) + '">';
+                    for (const o of g.options) {
+                        html += '<option value="' + escAttr(o.value) + '">' + escAttr(o.label) + '</option>';
                     }
-                });
-                
-                // Android devices
-                if (androidDevices.length > 0) {
-                    const androidGroup = document.createElement('optgroup');
-                    androidGroup.label = '🤖 Android';
-                    select.appendChild(androidGroup);
-                    
-                    androidDevices.forEach(device => {
-                        const opt = document.createElement('option');
-                        opt.value = device.id;
-                        const icon = device.running ? '✅' : '📱';
-                        opt.textContent = `${icon} ${device.name}`;
-                        androidGroup.appendChild(opt);
-                    });
-                }
-                
-                // iOS devices
-                if (iosDevices.length > 0) {
-                    const iosGroup = document.createElement('optgroup');
-                    iosGroup.label = '🍎 iOS';
-                    select.appendChild(iosGroup);
-                    
-                    iosDevices.forEach(device => {
-                        const opt = document.createElement('option');
-                        opt.value = device.id;
-                        const icon = device.running ? '✅' : '📱';
-                        opt.textContent = `${icon} ${device.name}`;
-                        iosGroup.appendChild(opt);
-                    });
+                    html += '</optgroup>';
                 }
+                const fresh = select.cloneNode(false);
+                fresh.insertAdjacentHTML('beforeend', html);
+                fresh.value = select.value;
+                select.replaceWith(fresh);
             } catch (e) {
                 console.error('Failed to load devices:', e);
                 const select = document.getElementById('device-select');
@@ -1893,17 +2662,17 @@ def get_dashboard_html() -> str:
         function showEmulatorDialog() {
             const select = document.getElementById('device-select');
             const selected = select.value;
-            
+
             if (!selected) {
                 alert('Lütfen başlatılacak bir cihaz seçin');
                 return;
             }
-            
+
             // Get device info from option
             const option = select.options[select.selectedIndex];
             const deviceName = option.textContent.replace(/^[✅📱] /, '');
             const platform = selected.startsWith('ios:') ? 'ios' : 'android';
-            
+
             if (confirm(`"${deviceName}" ${platform === 'ios' ? 'simulator' : 'emülatör'}ünü başlatmak istiyor musunuz?`)) {
                 startEmulator(selected, platform);
             }
@@ -1930,7 +2699,7 @@ def get_dashboard_html() -> str:
         async function parseScenario() {
             const scenario = document.getElementById('scenario-input').value;
             const appId = document.getElementById('app-id').value;
-            
+
             if (!scenario.trim()) {
                 showToast('Lütfen bir senaryo yazın', 'error');
                 return;
@@ -1946,18 +2715,32 @@ def get_dashboard_html() -> str:
                 
                 currentYaml = data.yaml;
                 currentExpectations = data.expectations;
-                
-                document.getElementById('yaml-output').textContent = data.yaml;
-                
-                const expList = document.getElementById('expectations-list');
-                expList.innerHTML = data.expectations.map((exp, i) => `
-                    <div style="display: flex; align-items: center; gap: 0.5rem; padding: 0.5rem; background: var(--bg-secondary); border-radius: 6px; margin-bottom: 0.25rem; font-size: 0.8rem;">
-                        <span style="background: var(--accent); color: white; padding: 0.125rem 0.5rem; border-radius: 4px; font-size: 0.7rem;">${i + 1}</span>
-                        ${exp}
-                    </div>
-                `).join('');
-                
+
+                // Önce kullanıcıya sonuç: toast hemen; büyük YAML metnini
+                // ve beklenti listesini çizme işi boşta kalan ilk frame'e
+                // ertelenir (en geç 100 ms'te yine çalışır)
                 showToast('Parse başarılı!', 'success');
+
+                const renderPreview = () => {
+                    document.getElementById('yaml-output').textContent = data.yaml;
+                    const expList = document.getElementById('expectations-list');
+                    const frag = document.createDocumentFragment();
+                    data.expectations.forEach((exp, i) => {
+                        const row = document.createElement('div');
+                        row.style.cssText = 'display: flex; align-items: center; gap: 0.5rem; padding: 0.5rem; background: var(--bg-secondary); border-radius: 6px; margin-bottom: 0.25rem; font-size: 0.8rem;';
+                        const num = document.createElement('span');
+                        num.style.cssText = 'background: var(--accent); color: white; padding: 0.125rem 0.5rem; border-radius: 4px; font-size: 0.7rem;';
+                        num.textContent = i + 1;
+                        row.append(num, ' ' + exp);
+                        frag.appendChild(row);
+                    });
+                    expList.replaceChildren(frag);
+                };
+                if (window.requestIdleCallback) {
+                    requestIdleCallback(renderPreview, { timeout: 100 });
+                } else {
+                    setTimeout(renderPreview, 0);
+                }
             } catch (e) {
                 showToast('Parse hatası: ' + e.message, 'error');
             }
@@ -1976,7 +2759,7 @@ def get_dashboard_html() -> str:
             const name = document.getElementById('test-name').value || 'Test ' + Date.now();
             const appId = document.getElementById('app-id').value;
             const scenario = document.getElementById('scenario-input').value;
-            
+
             if (!currentYaml) {
                 showToast('Önce senaryoyu parse edin', 'error');
                 return;
@@ -1997,6 +2780,10 @@ def get_dashboard_html() -> str:
                 const data = await res.json();
                 
                 if (data.success) {
+                    // Kayıt listeyi değiştirdi: SWR cache'ini düşür ki bir
+                    // sonraki sekme geçişi taze listeyi çeksin
+                    swrCache.delete('/api/tests');
+                    testsRendered = false;
                     showToast('Test kaydedildi!', 'success');
                 } else {
                     showToast('Kaydetme hatası', 'error');
@@ -2043,12 +2830,16 @@ def get_dashboard_html() -> str:
         }
 
         // Load saved tests
+        let testsRendered = false;
         async function loadSavedTests() {
             try {
-                const res = await fetch('/api/tests');
-                const data = await res.json();
+                const { data, changed, aborted } = await fetchSWR('/api/tests', 120000);
+                if (aborted) return;
                 savedTests = data.tests || [];
-                
+                savedTestsById = new Map(savedTests.map(t => [t.id, t]));
+                if (!changed && testsRendered) return;
+                testsRendered = true;
+
                 renderTestsList('saved-tests-list', false);
                 renderTestsList('suite-tests-list', true);
             } catch (e) {
@@ -2056,52 +2847,61 @@ def get_dashboard_html() -> str:
             }
         }
 
+        // Boş durum artık DOM'da sabit bir kardeş düğüm: render'cılar aynı
+        // HTML'i tekrar parse etmek yerine hidden bayrağını çevirir
+        function toggleEmptyState(container, isEmpty) {
+            container.hidden = isEmpty;
+            const empty = document.getElementById(container.id + '-empty');
+            if (empty) empty.hidden = !isEmpty;
+        }
+
         function renderTestsList(containerId, showCheckbox) {
             const container = document.getElementById(containerId);
-            
-            if (savedTests.length === 0) {
-                container.innerHTML = `
-                    <div class="empty-state">
-                        <div class="empty-state-icon">📋</div>
-                        <p>Henüz kayıtlı test yok</p>
-                    </div>
-                `;
-                return;
-            }
 
-            container.innerHTML = savedTests.map(test => `
-                <div class="test-item ${selectedTestIds.has(test.id) ? 'selected' : ''}" data-id="${test.id}">
-                    ${showCheckbox ? `
-                        <input type="checkbox" class="test-checkbox" 
-                            ${selectedTestIds.has(test.id) ? 'checked' : ''}
-                            onchange="toggleTestSelection('${test.id}')">
-                    ` : ''}
-                    <div class="test-info">
-                        <div class="test-name">${test.name}</div>
-                        <div class="test-meta">
-                            ${test.appId ? `📱 ${test.appId} • ` : ''}
-                            ${test.expectations?.length || 0} adım
-                        </div>
-                    </div>
-                    <div class="test-actions">
-                        <button class="btn btn-secondary" onclick="loadTest('${test.id}')">📝 Düzenle</button>
-                        <button class="btn btn-primary" onclick="runSavedTest('${test.id}')">▶️ Çalıştır</button>
-                    </div>
-                </div>
-            `).join('');
+            toggleEmptyState(container, savedTests.length === 0);
+            if (savedTests.length === 0) return;
+
+            // Template klonları + tek DocumentFragment: HTML string parse'ı
+            // ve liste başına N reflow yerine tek yazım
+            const tpl = document.getElementById('test-row-tpl');
+            const frag = document.createDocumentFragment();
+            for (const test of savedTests) {
+                const row = tpl.content.firstElementChild.cloneNode(true);
+                row.dataset.id = test.id;
+                const checkbox = row.querySelector('.test-checkbox');
+                if (showCheckbox) {
+                    checkbox.checked = selectedTestIds.has(test.id);
+                } else {
+                    checkbox.remove();
+                }
+                if (selectedTestIds.has(test.id)) row.classList.add('selected');
+                row.querySelector('.test-name').textContent = test.name || '';
+                row.querySelector('.test-meta').textContent =
+                    (test.appId ? `📱 ${test.appId} • ` : '') +
+                    `${test.expectations?.length || 0} adım`;
+                frag.appendChild(row);
+            }
+            container.replaceChildren(frag);
         }
 
         function toggleTestSelection(id) {
-            if (selectedTestIds.has(id)) {
-                selectedTestIds.delete(id);
-            } else {
+            const nowSelected = !selectedTestIds.has(id);
+            if (nowSelected) {
                 selectedTestIds.add(id);
+            } else {
+                selectedTestIds.delete(id);
+            }
+            // O(1): tüm listeyi yeniden kurmak yerine sadece ilgili satır
+            const row = document.querySelector(`#suite-tests-list [data-id="${id}"]`);
+            if (row) {
+                row.classList.toggle('selected', nowSelected);
+                const cb = row.querySelector('.test-checkbox');
+                if (cb) cb.checked = nowSelected;
             }
-            renderTestsList('suite-tests-list', true);
         }
 
         async function loadTest(id) {
-            const test = savedTests.find(t => t.id === id);
+            const test = savedTestsById.get(id);
             if (test) {
                 document.getElementById('test-name').value = test.name || '';
                 document.getElementById('app-id').value = test.appId || '';
@@ -2118,7 +2918,7 @@ def get_dashboard_html() -> str:
         }
 
         async function runSavedTest(id) {
-            const test = savedTests.find(t => t.id === id);
+            const test = savedTestsById.get(id);
             if (!test) return;
 
             const deviceId = document.getElementById('device-select').value;
@@ -2182,43 +2982,52 @@ def get_dashboard_html() -> str:
         }
 
         // Load results
+        let resultsRendered = false;
         async function loadResults() {
             try {
-                const res = await fetch('/api/results');
-                const data = await res.json();
-                
+                const { data, changed, aborted } = await fetchSWR('/api/results', 15000);
+                if (aborted) return;
+                if (!changed && resultsRendered) return;
+                resultsRendered = true;
+
                 const container = document.getElementById('results-list');
                 const results = data.results || [];
+                resultsById.clear();
+                for (const r of results) resultsById.set(r.id, r);
                 
-                if (results.length === 0) {
-                    container.innerHTML = `
-                        <div class="empty-state">
-                            <div class="empty-state-icon">📊</div>
-                            <p>Henüz test sonucu yok</p>
-                        </div>
-                    `;
-                    return;
+                toggleEmptyState(container, results.length === 0);
+                if (results.length === 0) return;
+
+                // Şablon klonu + textContent: innerHTML parse'ı yok, sonuç
+                // adı/hata metni HTML olarak yorumlanamaz
+                const tpl = document.getElementById('result-row-tpl');
+                const frag = document.createDocumentFragment();
+                for (const r of results) {
+                    const row = tpl.content.firstElementChild.cloneNode(true);
+                    const badge = row.querySelector('.result-status');
+                    badge.classList.add(r.status);
+                    badge.textContent = r.status === 'passed' ? '✅ PASS' : '❌ FAIL';
+                    row.querySelector('.result-name').textContent = r.name || 'Test';
+                    row.querySelector('.result-time').textContent = fmtTime(r.finishedAt);
+                    if (r.status === 'failed' && r.yaml) {
+                        const fixBtn = row.querySelector('[data-action="autofix"]');
+                        fixBtn.hidden = false;
+                        fixBtn.dataset.id = r.id;
+                    }
+                    const steps = row.querySelector('.result-steps');
+                    for (const step of (r.steps || [])) {
+                        const line = document.createElement('div');
+                        line.textContent = (step.status === 'passed' ? '✅ ' : '❌ ') + step.action;
+                        steps.appendChild(line);
+                    }
+                    if (r.error) {
+                        const err = row.querySelector('.result-error');
+                        err.hidden = false;
+                        err.textContent = r.error.substring(0, 200) + '...';
+                    }
+                    frag.appendChild(row);
                 }
-
-                container.innerHTML = results.map(r => `
-                    <div class="result-item">
-                        <div class="result-header">
-                            <span class="result-status ${r.status}">${r.status === 'passed' ? '✅ PASS' : '❌ FAIL'}</span>
-                            <span class="result-name">${r.name || 'Test'}</span>
-                            <span class="result-time">${new Date(r.finishedAt).toLocaleString('tr-TR')}</span>
-                            ${r.status === 'failed' && r.yaml ? `
-                                <button class="btn btn-secondary" style="margin-left: auto; padding: 0.5rem 1rem; font-size: 0.875rem;" 
-                                        onclick="autoFixTest('${r.id}', ${JSON.stringify(r.yaml).replace(/'/g, "\\'")}, ${JSON.stringify(r.appId || '').replace(/'/g, "\\'")})">
-                                    🔧 Auto-Fix
-                                </button>
-                            ` : ''}
-                        </div>
-                        <div class="result-steps">
-                            ${(r.steps || []).map(s => `${s.status === 'passed' ? '✅' : '❌'} ${s.action}`).join('<br>')}
-                        </div>
-                        ${r.error ? `<div style="margin-top: 0.5rem; color: var(--error); font-size: 0.875rem;">${r.error.substring(0, 200)}...</div>` : ''}
-                    </div>
-                `).join('');
+                container.replaceChildren(frag);
             } catch (e) {
                 console.error('Failed to load results:', e);
             }
@@ -2233,14 +3042,14 @@ def get_dashboard_html() -> str:
             // Navigate to self-healing page and fill form
             document.querySelectorAll('.nav-item').forEach(i => i.classList.remove('active'));
             document.querySelectorAll('.page').forEach(p => p.classList.remove('active'));
-            
+
             document.querySelector('[data-page="self-heal"]').classList.add('active');
             document.getElementById('page-self-heal').classList.add('active');
-            
+
             document.getElementById('self-heal-yaml').value = yaml;
             document.getElementById('self-heal-app-id').value = appId;
             document.getElementById('self-heal-test-name').value = 'Auto-Fixed Test';
-            
+
             showToast('Form dolduruldu, testi başlatabilirsin', 'info');
         }
 
@@ -2281,34 +3090,88 @@ def get_dashboard_html() -> str:
                 }
 
                 selfHealRunId = data.runId;
+                // Artımlı render durumunu yeni koşu için sıfırla
+                lastRenderedRetries = 0;
+                lastRenderedCurrent = -1;
+                lastRenderedStatus = null;
+                document.getElementById('self-heal-retry-counter').hidden = true;
+                document.getElementById('self-heal-retries-list').innerHTML = '<p>Test başlatılıyor...</p>';
                 document.getElementById('self-heal-status-card').style.display = 'block';
                 document.getElementById('self-heal-test-name-display').textContent = testName;
                 showToast('Self-healing test başlatıldı', 'success');
 
-                // Start polling for status
-                if (selfHealInterval) clearInterval(selfHealInterval);
-                selfHealInterval = setInterval(updateSelfHealStatus, 2000);
+                // SSE açıkken push yeterli; fallback'te ortak zamanlayıcı
+                // (schedTick) selfHealRunId dolu olduğu sürece poll'lar
                 updateSelfHealStatus();
             } catch (e) {
                 showToast('Hata: ' + e.message, 'error');
             }
         }
 
+        // Polling fallback'i (EventSource yoksa): durumu çekip render'a ver
         async function updateSelfHealStatus() {
             if (!selfHealRunId) return;
 
             try {
-                const res = await fetch('/api/runs');
+                const res = await abortableFetch('/api/runs/' + selfHealRunId);
+                if (!res.ok) {
+                    if (selfHealInterval) clearInterval(selfHealInterval);
+                    return;
+                }
                 const data = await res.json();
-                const run = data.runs?.find(r => r.id === selfHealRunId);
+                const run = data.run;
+                runsById.set(run.id, run);
 
-                if (!run) {
-                    if (selfHealInterval) clearInterval(selfHealInterval);
+                applySelfHealStatus(run);
+            } catch (e) {
+                if (e.name === 'AbortError') return;
+                console.error('Status update error:', e);
+            }
+        }
+
+        // Artımlı render durumu: son çizilen retry sayısı/deneme/durum
+        let lastRenderedRetries = 0;
+        let lastRenderedCurrent = -1;
+        let lastRenderedStatus = null;
+
+        function buildRetryRow(retry) {
+            const item = document.createElement('div');
+            item.className = 'result-item';
+            item.style.cssText = 'margin-bottom: 0.5rem; padding: 0.75rem;';
+            const header = document.createElement('div');
+            header.className = 'result-header';
+            const badge = document.createElement('span');
+            badge.className = 'result-status ' + retry.status;
+            badge.textContent = retry.status === 'passed' ? '✅ PASSED' : '❌ FAILED';
+            const label = document.createElement('span');
+            label.textContent = `Retry ${retry.retry + 1}`;
+            header.append(badge, label);
+            item.appendChild(header);
+            if (retry.error) {
+                const err = document.createElement('div');
+                err.style.cssText = 'margin-top: 0.5rem; font-size: 0.8rem; color: var(--text-muted);';
+                err.textContent = retry.error.substring(0, 200) + '...';
+                item.appendChild(err);
+            }
+            return item;
+        }
+
+        // SSE push'u ve polling fallback'inin ortak render yolu
+        function applySelfHealStatus(run) {
+            try {
+                const retries = run.retries || [];
+                // Değişiklik yoksa DOM'a hiç dokunma
+                if (retries.length === lastRenderedRetries &&
+                    run.currentRetry === lastRenderedCurrent &&
+                    run.status === lastRenderedStatus) {
                     return;
                 }
+                lastRenderedCurrent = run.currentRetry;
+                lastRenderedStatus = run.status;
 
                 const statusBadge = document.getElementById('self-heal-status-badge');
                 const retriesList = document.getElementById('self-heal-retries-list');
+                const counter = document.getElementById('self-heal-retry-counter');
 
                 // Update status badge
                 statusBadge.className = 'result-status ' + run.status;
@@ -2316,89 +3179,136 @@ def get_dashboard_html() -> str:
                                          run.status === 'passed' ? 'BAŞARILI' : 
                                          run.status === 'failed' ? 'BAŞARISIZ' : 'HATA';
 
-                // Update retries list
-                if (run.retries && run.retries.length > 0) {
-                    retriesList.innerHTML = `
-                        <div style="margin-bottom: 1rem;">
-                            <strong>Retry ${run.currentRetry + 1} / ${run.maxRetries}</strong>
-                        </div>
-                        ${run.retries.map((retry, idx) => `
-                            <div class="result-item" style="margin-bottom: 0.5rem; padding: 0.75rem;">
-                                <div class="result-header">
-                                    <span class="result-status ${retry.status}">${retry.status === 'passed' ? '✅ PASSED' : '❌ FAILED'}</span>
-                                    <span>Retry ${retry.retry + 1}</span>
-                                </div>
-                                ${retry.error ? `<div style="margin-top: 0.5rem; font-size: 0.8rem; color: var(--text-muted);">${retry.error.substring(0, 200)}...</div>` : ''}
-                            </div>
-                        `).join('')}
-                    `;
-                } else {
-                    retriesList.innerHTML = '<p>Test başlatılıyor...</p>';
+                // Sadece yeni retry satırlarını ekle, geçmişi yeniden kurma;
+                // DOM yazımları frame sınırına hizalanır
+                if (retries.length > 0) {
+                    counter.hidden = false;
+                    counter.firstElementChild.textContent =
+                        `Retry ${run.currentRetry + 1} / ${run.maxRetries}`;
+                    const from = lastRenderedRetries;
+                    lastRenderedRetries = retries.length;
+                    requestAnimationFrame(() => {
+                        if (from === 0) retriesList.replaceChildren();
+                        for (let i = from; i < retries.length; i++) {
+                            retriesList.appendChild(buildRetryRow(retries[i]));
+                        }
+                    });
                 }
 
                 // Stop polling if test is finished
                 if (run.status !== 'running') {
                     if (selfHealInterval) clearInterval(selfHealInterval);
                     selfHealInterval = null;
-                    
+
                     if (run.status === 'passed') {
                         showToast('Self-healing test başarılı!', 'success');
                     } else if (run.status === 'failed') {
                         showToast('Self-healing test başarısız (max retry)', 'error');
                     }
+                    // Terminal: ortak zamanlayıcının poll nedeni kalmadı
+                    selfHealRunId = null;
                 }
             } catch (e) {
-                console.error('Status update error:', e);
+                console.error('Status render error:', e);
             }
         }
 
         async function loadRunningTests() {
             try {
-                const res = await fetch('/api/runs');
+                const res = await abortableFetch('/api/runs?status=running');
                 const data = await res.json();
                 
                 const container = document.getElementById('running-list');
-                const runs = Object.values(data.runs || {}).filter(r => r.status === 'running');
+                const runs = data.runs || [];
                 
-                if (runs.length === 0) {
-                    container.innerHTML = `
-                        <div class="empty-state">
-                            <div class="empty-state-icon">⏳</div>
-                            <p>Çalışan test yok</p>
-                        </div>
-                    `;
-                    return;
+                toggleEmptyState(container, runs.length === 0);
+                if (runs.length === 0) return;
+
+                const tpl = document.getElementById('running-row-tpl');
+                const frag = document.createDocumentFragment();
+                for (const r of runs) {
+                    const row = tpl.content.firstElementChild.cloneNode(true);
+                    row.querySelector('.result-name').textContent = r.name || 'Test';
+                    row.querySelector('.result-time').textContent = fmtTime(r.startedAt);
+                    frag.appendChild(row);
                 }
-
-                container.innerHTML = runs.map(r => `
-                    <div class="result-item">
-                        <div class="result-header">
-                            <span class="result-status running"><span class="loading"></span> Çalışıyor</span>
-                            <span class="result-name">${r.name || 'Test'}</span>
-                            <span class="result-time">${new Date(r.startedAt).toLocaleString('tr-TR')}</span>
-                        </div>
-                    </div>
-                `).join('');
+                container.replaceChildren(frag);
             } catch (e) {
+                if (e.name === 'AbortError') return;
                 console.error('Failed to load running tests:', e);
             }
         }
 
+        // Zamanlayıcılar görünürlüğe bağlı: sekme arka plana düşünce
+        // durur, öne gelince anlık yakalama fetch'i + yeniden kurulum
+        // Tüm periyodik işler tek 1s tick'inden dağıtılır: üç ayrı
+        // setInterval kaynağı yerine tek uyanma, DOM'a dokunan işler
+        // görünür sekmede frame sınırına (rAF) hizalanır
+        let schedTimer = null;
+        let schedTicks = 0;
+
+        function pollTick() {
+            const runningPage = document.getElementById('page-running');
+            if (runningPage && runningPage.classList.contains('active')) {
+                loadRunningTests();
+            }
+            if (selfHealRunId) updateSelfHealStatus();
+        }
+
+        function schedTick() {
+            schedTicks++;
+            if (schedTicks % 10 === 0) loadDevices();
+            if (!window.EventSource && schedTicks % 2 === 0) {
+                requestAnimationFrame(pollTick);
+            }
+        }
+
+        function startTimers() {
+            if (!schedTimer) schedTimer = setInterval(schedTick, 1000);
+        }
+
+        function stopTimers() {
+            clearInterval(schedTimer);
+            schedTimer = null;
+            if (selfHealInterval) {
+                clearInterval(selfHealInterval);
+                selfHealInterval = null;
+            }
+        }
+
         // Initialize on DOM ready
         function initializeApp() {
             window.initApp();
             loadDevices();
-            setInterval(loadDevices, 10000);
-            setInterval(() => {
-                const runningPage = document.getElementById('page-running');
-                if (runningPage && runningPage.classList.contains('active')) {
-                    loadRunningTests();
-                }
-                const selfHealPage = document.getElementById('page-self-heal');
-                if (selfHealPage && selfHealPage.classList.contains('active') && selfHealRunId) {
-                    updateSelfHealStatus();
+            if (window.EventSource) {
+                // Push tabanlı güncelleme: değişiklik yokken ağ/CPU ~0, 2s
+                // poll'un tüm runs payload'ını yeniden çekmesi gerekmiyor
+                const es = new EventSource('/api/runs/stream');
+                es.onmessage = (e) => {
+                    let delta;
+                    try { delta = JSON.parse(e.data); } catch (err) { return; }
+                    (delta.runs || []).forEach(run => {
+                        runsById.set(run.id, run);
+                        if (selfHealRunId && run.id === selfHealRunId) {
+                            applySelfHealStatus(run);
+                        }
+                    });
+                    const runningPage = document.getElementById('page-running');
+                    if (runningPage && runningPage.classList.contains('active')) {
+                        loadRunningTests();
+                    }
+                };
+            }
+            startTimers();
+            document.addEventListener('visibilitychange', () => {
+                if (document.hidden) {
+                    stopTimers();
+                } else {
+                    loadDevices();
+                    if (!window.EventSource) pollTick();
+                    startTimers();
                 }
-            }, 2000);
+            });
         }
 
         // Run when DOM is ready
@@ -2412,9 +3322,86 @@ def get_dashboard_html() -> str:
 </html>'''
 
 
+def get_dashboard_html() -> str:
+    """Import'ta kurulan sabit dashboard HTML'ini döndür."""
+    return _DASHBOARD_HTML
+
+
+def _minify_dashboard(text: str) -> str:
+    """Gömülü HTML/JS/CSS'i kozmetik olarak küçült (import'ta bir kez).
+
+    Agresif bir minifier değil: satır girintilerini, boş satırları, HTML
+    yorumlarını ve tam satır // yorumlarını düşürür. Çok satırlı template
+    literal'lar yalnızca innerHTML/placeholder içeriği taşıdığından
+    girinti kaybı davranış değiştirmez; gzip öncesi ham boyutu ve
+    tarayıcının parse edeceği byte sayısını düşürür.
+    """
+    out = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.startswith('<!--') and stripped.endswith('-->'):
+            continue
+        if stripped.startswith('//'):
+            continue
+        out.append(stripped)
+    return '\n'.join(out)
+
+
+# Gömülü CSS ayrı, içerik-hash'li bir statik varlığa ayrılır: tarayıcı
+# onu immutable olarak cache'ler, sonraki sayfa yüklerinde HTML gövdesi
+# CSS kadar küçülür. Hash içeriğe bağlı olduğundan CSS değişince URL de
+# değişir; cache invalidation kendiliğinden olur.
+_style_start = _DASHBOARD_HTML.index('<style>')
+_style_end = _DASHBOARD_HTML.index('</style>') + len('</style>')
+_DASHBOARD_CSS = _DASHBOARD_HTML[
+    _style_start + len('<style>'):_style_end - len('</style>')
+].encode('utf-8')
+_DASHBOARD_CSS = _minify_dashboard(
+    re.sub(r'/\*.*?\*/', '', _DASHBOARD_CSS.decode('utf-8'), flags=re.S)
+).encode('utf-8')
+_DASHBOARD_CSS_GZ = gzip.compress(_DASHBOARD_CSS, compresslevel=9)
+_CSS_HASH = hashlib.blake2b(_DASHBOARD_CSS, digest_size=8).hexdigest()
+_CSS_PATH = f"/static/dashboard.{_CSS_HASH}.css"
+_DASHBOARD_HTML = (
+    _DASHBOARD_HTML[:_style_start]
+    + f'<link rel="stylesheet" href="{_CSS_PATH}">'
+    + _DASHBOARD_HTML[_style_end:]
+)
+del _style_start, _style_end
+
+_DASHBOARD_HTML = _minify_dashboard(_DASHBOARD_HTML)
+
+# Dashboard HTML statiktir: encode + gzip + ETag import'ta bir kez yapılır,
+# her sayfa isteğinde ~100KB'lık string'i yeniden sıkıştırmak yerine
+_DASHBOARD_HTML_BYTES = _DASHBOARD_HTML.encode('utf-8')
+_DASHBOARD_HTML_GZ = gzip.compress(_DASHBOARD_HTML_BYTES, compresslevel=9)
+_DASHBOARD_HTML_BR = (
+    brotli.compress(_DASHBOARD_HTML_BYTES) if brotli is not None else None
+)
+_DASHBOARD_ETAG = (
+    f'"{hashlib.blake2b(_DASHBOARD_HTML_BYTES, digest_size=8).hexdigest()}"'
+)
+
+
+class YYServer(ThreadingMixIn, HTTPServer):
+    """İstek başına thread'li sunucu, sınırlı worker havuzuyla.
+
+    HTTPServer tek istek servis eder; subprocess ağırlıklı bir /api/status
+    dashboard'un /api/runs poll'unu bloklar. ThreadingMixIn bunu çözer,
+    process_request override'ı ise thread sayısını _HTTP_POOL ile sınırlar.
+    """
+
+    daemon_threads = True
+
+    def process_request(self, request, client_address):
+        _HTTP_POOL.submit(self.process_request_thread, request, client_address)
+
+
 def run_server(host: str = "127.0.0.1", port: int = 8080):
     """Start the web server."""
-    server = HTTPServer((host, port), YYTestHandler)
+    server = YYServer((host, port), YYTestHandler)
     print(f"🐬 yeytest Web UI running at http://{host}:{port}")
     print("Press Ctrl+C to stop")
     try: